@@ -12,11 +12,15 @@ Or interactive:
 import sys
 sys.path.insert(0, "C:/ecosystem")
 
+from clawbot.core import aws
 from clawbot.skills.job_search import JobSearchSkill, JobPosting
 from datetime import datetime
 
 
 def main():
+    # Connect to Bedrock while the description is being pasted
+    aws.warmup()
+    
     print("=" * 70)
     print("  JOB ANALYZER - Paste job description to get match score")
     print("=" * 70)
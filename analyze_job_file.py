@@ -12,6 +12,7 @@ from pathlib import Path
 
 sys.path.insert(0, "C:/ecosystem")
 
+from clawbot.core import aws
 from clawbot.skills.job_search import JobSearchSkill, JobPosting
 from datetime import datetime
 
@@ -67,6 +68,9 @@ def main():
             print(f"Error: File not found: {file_path}")
             sys.exit(1)
     
+    # Connect to Bedrock while the file is parsed
+    aws.warmup()
+    
     print("=" * 70)
     print("RE-ANALYZING JOB FILE")
     print("=" * 70)
@@ -1,9 +1,11 @@
 """ClawBot Core
 
-Bot framework and skill registry.
+Bot framework, skill registry, the LLM gateway (llm.complete) and the
+shared Bedrock client (aws).
 """
 
+from . import aws, llm
 from .bot import ClawBot
 from .skill_registry import SkillRegistry, get_registry
 
-__all__ = ["ClawBot", "SkillRegistry", "get_registry"]
+__all__ = ["ClawBot", "SkillRegistry", "get_registry", "aws", "llm"]
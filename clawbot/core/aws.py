@@ -0,0 +1,110 @@
+"""AWS Clients
+
+One bedrock-runtime client per process, shared by every skill and CLI.
+boto3 clients are thread-safe, so creating one per JobSearchSkill (or per
+call) only re-pays credential resolution, service model loading and TLS
+setup. The shared client is tuned for concurrent calls:
+
+    max_pool_connections    BEDROCK_MAX_POOL_CONNECTIONS keep-alive sockets
+    retries                 Adaptive mode (client-side rate limiting on
+                            throttling), BEDROCK_MAX_ATTEMPTS attempts
+    timeouts                BEDROCK_CONNECT_TIMEOUT / BEDROCK_READ_TIMEOUT
+
+warmup() resolves credentials and opens the first connection in a
+background thread, so it overlaps with whatever the caller does before
+its first model call. BEDROCK_ENDPOINT_URL points the client at another
+endpoint, e.g. clawbot.tests.bedrock_stub for tests.
+
+Usage:
+    >>> from clawbot.core import aws
+    >>> aws.warmup()
+    >>> client = aws.get_bedrock_client()
+"""
+
+import threading
+from typing import Optional
+
+from shared.config import get_config
+
+_client = None
+_client_lock = threading.Lock()
+_warmup: Optional[threading.Thread] = None
+
+
+def client_config():
+    """botocore Config for the shared client."""
+    from botocore.config import Config as BotoConfig
+
+    cfg = get_config()
+    return BotoConfig(
+        region_name=cfg.AWS_REGION,
+        max_pool_connections=cfg.BEDROCK_MAX_POOL_CONNECTIONS,
+        retries={"max_attempts": cfg.BEDROCK_MAX_ATTEMPTS, "mode": "adaptive"},
+        connect_timeout=cfg.BEDROCK_CONNECT_TIMEOUT,
+        read_timeout=cfg.BEDROCK_READ_TIMEOUT,
+        tcp_keepalive=True
+    )
+
+
+def get_bedrock_client():
+    """Process-wide bedrock-runtime client (created on first call)."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            import boto3
+            cfg = get_config()
+            session = boto3.Session(profile_name=cfg.AWS_PROFILE or None)
+            _client = session.client(
+                "bedrock-runtime",
+                config=client_config(),
+                endpoint_url=cfg.BEDROCK_ENDPOINT_URL or None
+            )
+        return _client
+
+
+def _warm() -> None:
+    from botocore.exceptions import ClientError
+
+    try:
+        # Cheapest signed request: resolves credentials and leaves a TLS
+        # connection in the pool. An error response (e.g. no permission
+        # to list async invokes) still does both.
+        get_bedrock_client().list_async_invokes(maxResults=1)
+    except ClientError:
+        pass
+    except Exception as e:
+        print(f"Bedrock warmup failed (non-critical): {e}")
+
+
+def warmup(wait: bool = False) -> Optional[threading.Thread]:
+    """Create the shared client and open a connection ahead of time.
+
+    Only the first call does anything; later calls return the same thread.
+
+    Args:
+        wait: Block until the warmup finishes
+
+    Returns:
+        The warmup thread, or None if BEDROCK_WARMUP is off
+    """
+    global _warmup
+    if not get_config().BEDROCK_WARMUP:
+        return None
+    with _client_lock:
+        if _warmup is None:
+            _warmup = threading.Thread(target=_warm, name="bedrock-warmup",
+                                       daemon=True)
+            _warmup.start()
+    if wait:
+        _warmup.join()
+    return _warmup
+
+
+def reset() -> None:
+    """Drop the shared client (picks up config changes on next use)."""
+    global _client, _warmup
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = None
+        _warmup = None
@@ -0,0 +1,277 @@
+"""LLM Gateway
+
+The one way skills and scripts call a model, so every call goes through
+SecondBrain:
+
+    1. Cache lookup (cache_get)         Hit: no call, no cost
+    2. Single-flight                    Identical prompts already in flight
+                                        on another thread wait for that
+                                        call instead of paying twice
+    3. Bedrock invoke_model             Shared, pooled client (core.aws)
+    4. cache_store + ChatLogger.log     With token counts and cost
+
+Templated prompts pass ``template``/``variables`` so they're cached by
+their variable part (see secondbrain.storage.cache_key); a ``system``
+prompt gets its own cache namespace. Both are looked up by exact key -
+only free-form prompts accept a similar cached prompt's answer, within
+``similarity_threshold``.
+
+Usage:
+    >>> from clawbot.core import llm
+    >>> result = llm.complete("What is Python? Answer in one sentence.")
+    >>> result.text, result.cached, result.cost
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, Optional, Tuple
+
+from shared.config import get_config
+
+from .aws import get_bedrock_client
+
+# USD per million (input, output) tokens
+PRICING: Dict[str, Tuple[float, float]] = {
+    "moonshot.kimi-k2-thinking": (0.60, 2.50),
+}
+DEFAULT_PRICE = (1.50, 1.50)
+
+
+@dataclass
+class Completion:
+    """Result of complete()."""
+    text: str
+    model: str
+    cached: bool = False     # Answered from the SecondBrain cache
+    shared: bool = False     # Joined an identical call already in flight
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost: float = 0.0        # USD actually spent on this call
+    latency_ms: float = 0.0
+    cache_key: str = ""
+
+
+class _Flight:
+    """One in-progress call that other threads can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[Completion] = None
+        self.error: Optional[BaseException] = None
+
+
+_flights: Dict[str, _Flight] = {}
+_flights_lock = threading.Lock()
+
+
+class RateLimiter:
+    """At most ``per_minute`` calls in any 60-second window (thread-safe)."""
+
+    def __init__(self, per_minute: int):
+        self.per_minute = per_minute
+        self._calls: deque = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a call is allowed, then record it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= 60:
+                    self._calls.popleft()
+                if len(self._calls) < self.per_minute:
+                    self._calls.append(now)
+                    return
+                wait = 60 - (now - self._calls[0])
+            time.sleep(wait)
+
+
+def estimate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
+    """USD cost of a call from PRICING."""
+    input_price, output_price = PRICING.get(model, DEFAULT_PRICE)
+    return (input_tokens * input_price + output_tokens * output_price) / 1e6
+
+
+def _estimate_tokens(text: str) -> int:
+    return int(len(text.split()) * 1.3)
+
+
+def _extract_text(result: dict) -> str:
+    """Response text across Bedrock body formats."""
+    if "choices" in result:
+        return result["choices"][0].get("message", {}).get("content") or ""
+    if "content" in result:
+        return "".join(part.get("text", "") for part in result["content"])
+    if "completion" in result:
+        return result["completion"]
+    if "output" in result:
+        message = result["output"].get("message", {})
+        return "".join(part.get("text", "") for part in message.get("content", []))
+    raise ValueError(f"Unrecognized response format: {str(result)[:200]}")
+
+
+def _token_counts(response: dict, result: dict, prompt: str,
+                  text: str) -> Tuple[int, int]:
+    """(input, output) tokens: Bedrock headers, then body usage, then a guess."""
+    headers = response.get("ResponseMetadata", {}).get("HTTPHeaders", {})
+    if "x-amzn-bedrock-input-token-count" in headers:
+        return (int(headers["x-amzn-bedrock-input-token-count"]),
+                int(headers.get("x-amzn-bedrock-output-token-count", 0)))
+    usage = result.get("usage") or {}
+    input_tokens = usage.get("prompt_tokens", usage.get("input_tokens"))
+    output_tokens = usage.get("completion_tokens", usage.get("output_tokens"))
+    if input_tokens is not None and output_tokens is not None:
+        return int(input_tokens), int(output_tokens)
+    return _estimate_tokens(prompt), _estimate_tokens(text)
+
+
+def _invoke(prompt: str, model: str, system: Optional[str],
+            max_tokens: int, temperature: float) -> Completion:
+    messages = [{"role": "user", "content": prompt}]
+    if system:
+        messages.insert(0, {"role": "system", "content": system})
+    body = {
+        "messages": messages,
+        "max_tokens": max_tokens,
+        "temperature": temperature
+    }
+
+    start = time.perf_counter()
+    response = get_bedrock_client().invoke_model(modelId=model, body=json.dumps(body))
+    result = json.loads(response["body"].read())
+    text = _extract_text(result)
+    input_tokens, output_tokens = _token_counts(response, result, prompt, text)
+    return Completion(
+        text=text,
+        model=model,
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        cost=estimate_cost(model, input_tokens, output_tokens),
+        latency_ms=(time.perf_counter() - start) * 1000
+    )
+
+
+def _key(prompt: str, model: str, system: Optional[str],
+         template: Optional[str], variables: Optional[dict]):
+    from secondbrain import cache_key
+    from secondbrain.storage.cache_key import digest
+
+    if system:
+        # A namespace per (template, system prompt)
+        template = f"{template or 'system'}:{digest(system)[:16]}"
+        if variables is None:
+            variables = {"prompt": prompt}
+    if template is None:
+        return cache_key(prompt, model)
+    return cache_key(template=template, model=model, variables=variables)
+
+
+def _log(prompt: str, result: Completion) -> None:
+    try:
+        from secondbrain.ingest import get_logger
+        get_logger().log(prompt, result.text, result.model,
+                         cost=result.cost, cached=result.cached or result.shared)
+    except Exception as e:
+        print(f"LLM call logging failed (non-critical): {e}")
+
+
+def complete(prompt: str, model: Optional[str] = None, *,
+             system: Optional[str] = None,
+             template: Optional[str] = None,
+             variables: Optional[dict] = None,
+             max_tokens: int = 1000,
+             temperature: float = 0.3,
+             ttl: Optional[int] = None,
+             similarity_threshold: Optional[float] = None,
+             use_cache: Optional[bool] = None,
+             fuzzy: Optional[bool] = None,
+             validate: Optional[Callable[[str], bool]] = None,
+             limiter: Optional[RateLimiter] = None,
+             log: bool = True) -> Completion:
+    """Complete a prompt through the cache, single-flight and cost log.
+
+    Args:
+        prompt: Full prompt text sent to the model
+        model: Bedrock model ID (default: BEDROCK_MODEL_ID)
+        system: Optional system prompt (part of the cache key)
+        template: Prompt template id - cache by ``variables`` instead of
+            the full prompt text
+        variables: Values filled into the template
+        max_tokens: Max output tokens
+        temperature: Sampling temperature
+        ttl: Seconds to cache the answer (default: LLM_CACHE_TTL)
+        similarity_threshold: Semantic cache threshold (default:
+            CACHE_SIMILARITY_THRESHOLD)
+        use_cache: Read and write the cache (default: ENABLE_CACHING)
+        fuzzy: Accept answers to similar prompts (default: free-form
+            prompts only - template and system-prompt keys are exact)
+        validate: Only cache answers for which this returns True
+        limiter: Rate limit on Bedrock calls (cache hits don't count)
+        log: Record the exchange with ChatLogger
+
+    Returns:
+        Completion with the text, cache-hit flags, tokens and cost
+
+    Raises:
+        Whatever the Bedrock call raised (failed answers aren't cached)
+    """
+    cfg = get_config()
+    model = model or cfg.BEDROCK_MODEL_ID
+    use_cache = cfg.ENABLE_CACHING if use_cache is None else use_cache
+    ttl = cfg.LLM_CACHE_TTL if ttl is None else ttl
+    if similarity_threshold is None:
+        similarity_threshold = cfg.CACHE_SIMILARITY_THRESHOLD
+
+    key = _key(prompt, model, system, template, variables)
+    flight_id = str(key)
+
+    with _flights_lock:
+        flight = _flights.get(flight_id)
+        leader = flight is None
+        if leader:
+            flight = _flights[flight_id] = _Flight()
+
+    if not leader:
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        result = replace(flight.result, shared=True, cost=0.0)
+        if log:
+            _log(prompt, result)
+        return result
+
+    try:
+        result = None
+        if use_cache:
+            from secondbrain import cache_get
+            start = time.perf_counter()
+            text = cache_get(key, similarity_threshold=similarity_threshold,
+                             fuzzy=fuzzy)
+            if text is not None:
+                result = Completion(
+                    text=text, model=model, cached=True,
+                    latency_ms=(time.perf_counter() - start) * 1000
+                )
+        if result is None:
+            if limiter is not None:
+                limiter.acquire()
+            result = _invoke(prompt, model, system, max_tokens, temperature)
+            if use_cache and (validate is None or validate(result.text)):
+                from secondbrain import cache_store
+                cache_store(key, result.text, ttl=ttl)
+        result.cache_key = flight_id
+        flight.result = result
+    except BaseException as e:
+        flight.error = e
+        raise
+    finally:
+        with _flights_lock:
+            del _flights[flight_id]
+        flight.done.set()
+
+    if log:
+        _log(prompt, result)
+    return result
@@ -12,7 +12,7 @@ import sys
 
 sys.path.insert(0, "C:/ecosystem")
 
-from secondbrain import remember, recall, search_knowledge
+from secondbrain import remember, recall, query, search_knowledge
 
 
 class ApplicationStatus(Enum):
@@ -60,6 +60,14 @@ class ApplicationTracker:
     # Follow-up schedule (days after application)
     FOLLOW_UP_SCHEDULE = [7, 14, 21, 30]
     
+    # Statuses still waiting on a response (follow-ups apply)
+    ACTIVE_STATUSES = [
+        ApplicationStatus.APPLIED.value,
+        ApplicationStatus.PHONE_SCREEN.value,
+        ApplicationStatus.TECHNICAL_INTERVIEW.value,
+        ApplicationStatus.ONSITE.value
+    ]
+    
     def __init__(self):
         self.applications = []
     
@@ -156,44 +164,57 @@ class ApplicationTracker:
         
         return True
     
+    def _query_applications(self, filter: Optional[Dict] = None,
+                            order_by: Optional[str] = None,
+                            limit: Optional[int] = None) -> List[Dict]:
+        """Query stored applications by metadata (type/status/company/date)."""
+        conditions = {"type": "job_application"}
+        conditions.update(filter or {})
+        return [r["value"] for r in query(conditions, order_by=order_by, limit=limit)]
+    
     def get_follow_ups_due(self) -> List[Dict]:
         """Get applications needing follow-up today."""
         today = datetime.now().strftime("%Y-%m-%d")
         
-        # Search for applications with follow-up dates
-        # This is a simplified version - in production would query more efficiently
-        results = []
-        
-        # Get all applications from memory (simplified)
-        # In practice, would search by metadata
-        for key in ["application_status", "follow_up"]:
-            try:
-                data = recall(key)
-                if data:
-                    results.append(data)
-            except:
-                pass
+        # The last follow-up falls max(FOLLOW_UP_SCHEDULE) days after
+        # applying, so older applications can't be due
+        earliest = (datetime.now() - timedelta(days=max(self.FOLLOW_UP_SCHEDULE))).strftime("%Y-%m-%d")
+        candidates = self._query_applications({
+            "status": {"in": self.ACTIVE_STATUSES},
+            "date_applied": {"gte": earliest}
+        })
         
-        return results
+        return [
+            app for app in candidates
+            if today in (app.get("follow_up_dates") or [])
+        ]
     
     def generate_pipeline_report(self) -> Dict:
         """Generate pipeline overview report."""
         
-        # Query all applications (simplified)
-        applications = []
-        
-        # In production, would search SecondBrain for all application_* keys
-        # For now, return template
+        applications = self._query_applications(order_by="-date_applied")
         
         status_counts = {status.value: 0 for status in ApplicationStatus}
+        for app in applications:
+            status = app.get("status")
+            status_counts[status] = status_counts.get(status, 0) + 1
+        
+        recent = sorted(
+            applications,
+            key=lambda app: app.get("last_updated") or "",
+            reverse=True
+        )
         
         report = {
             "generated_at": datetime.now().isoformat(),
-            "total_applications": 0,
+            "total_applications": len(applications),
             "by_status": status_counts,
-            "active_applications": [],
-            "follow_ups_today": [],
-            "recent_activity": []
+            "active_applications": [
+                app for app in applications
+                if app.get("status") in self.ACTIVE_STATUSES
+            ],
+            "follow_ups_today": self.get_follow_ups_due(),
+            "recent_activity": recent[:10]
         }
         
         return report
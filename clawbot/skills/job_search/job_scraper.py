@@ -7,16 +7,17 @@ import json
 import re
 import time
 import random
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple
 from dataclasses import dataclass
 from pathlib import Path
 import sys
 
 sys.path.insert(0, "C:/ecosystem")
 
-import boto3
-from secondbrain import remember, recall
+from clawbot.core import aws, llm
+from secondbrain import remember, remember_many, recall
 
 
 @dataclass
@@ -40,27 +41,46 @@ class JobSearchSkill:
     SKILL_NAME = "job_search"
     SKILL_VERSION = "1.0.0"
     
-    # AWS Bedrock config
-    AWS_PROFILE = "study"
-    AWS_REGION = "us-east-1"
+    # Bedrock model (called through clawbot.core.llm)
     MODEL_ID = "moonshot.kimi-k2-thinking"
     
+    # Response cache namespace for the analysis prompt - bump the version
+    # whenever the prompt text below changes
+    ANALYSIS_TEMPLATE = "job_analysis:v1"
+    # Template keys are looked up exactly: only a repost of the same
+    # title + description reuses an analysis, never a similar posting
+    ANALYSIS_CACHE_TTL = 30 * 86400
+    
+    # process_jobs() defaults - concurrency stays under the Bedrock
+    # client's connection pool (BEDROCK_MAX_POOL_CONNECTIONS)
+    BATCH_CONCURRENCY = 8
+    BATCH_REQUESTS_PER_MINUTE = 50
+    
     def __init__(self):
-        self.session = boto3.Session(profile_name=self.AWS_PROFILE)
-        self.bedrock = self.session.client('bedrock-runtime', region_name=self.AWS_REGION)
-        
         # Load skills for matching
         skills_data = recall("sean_girgis_skills_flat")
         self.skills = skills_data.get("value", []) if skills_data else []
+        # Shared Bedrock client - connect in the background, once per process
+        aws.warmup()
         
     def analyze_job_with_ai(self, job_description: str, job_title: str) -> dict:
-        """Use Bedrock to analyze job description."""
+        """Use Bedrock to analyze job description.
         
+        Cached by (model, template, title, description), so re-scraped
+        postings don't pay for a second analysis.
+        """
+        return self._analyze(job_description, job_title)[0]
+    
+    def _analyze(self, job_description: str, job_title: str,
+                 limiter: Optional[llm.RateLimiter] = None
+                 ) -> Tuple[dict, Optional[llm.Completion]]:
+        """Analysis dict plus the model call behind it (None if it failed)."""
+        description = job_description[:3000]
         prompt = f"""Analyze this job posting for a Data Engineer role.
 
 Job Title: {job_title}
 Job Description:
-{job_description[:3000]}  # Truncate to save tokens
+{description}  # Truncate to save tokens
 
 Your task:
 1. Extract required technical skills (Python, AWS, PySpark, SQL, etc.)
@@ -82,30 +102,38 @@ Respond in JSON format:
 }}"""
 
         try:
-            body = {
-                "messages": [{"role": "user", "content": prompt}],
-                "max_tokens": 1000,
-                "temperature": 0.3
-            }
-            
-            response = self.bedrock.invoke_model(
-                modelId=self.MODEL_ID,
-                body=json.dumps(body)
+            result = llm.complete(
+                prompt,
+                model=self.MODEL_ID,
+                template=self.ANALYSIS_TEMPLATE,
+                variables={"title": job_title, "description": description},
+                max_tokens=1000,
+                temperature=0.3,
+                ttl=self.ANALYSIS_CACHE_TTL,
+                validate=lambda text: self._parse_analysis(text) is not None,
+                limiter=limiter
             )
             
-            result = json.loads(response['body'].read())
-            content = result.get('choices', [{}])[0].get('message', {}).get('content', '{}')
-            
-            # Extract JSON from response
-            json_match = re.search(r'\{.*\}', content, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
+            analysis = self._parse_analysis(result.text)
+            if analysis is not None:
+                return analysis, result
             else:
-                return {"match_score": 50, "should_apply": False, "error": "Failed to parse"}
+                return {"match_score": 50, "should_apply": False, "error": "Failed to parse"}, result
                 
         except Exception as e:
             print(f"Bedrock analysis failed: {e}")
-            return {"match_score": 50, "should_apply": False, "error": str(e)}
+            return {"match_score": 50, "should_apply": False, "error": str(e)}, None
+    
+    @staticmethod
+    def _parse_analysis(content: str) -> Optional[dict]:
+        """Extract the JSON object from a model response."""
+        json_match = re.search(r'\{.*\}', content, re.DOTALL)
+        if not json_match:
+            return None
+        try:
+            return json.loads(json_match.group())
+        except ValueError:
+            return None
     
     def calculate_skill_match(self, required_skills: List[str]) -> float:
         """Calculate how many required skills Sean has."""
@@ -137,9 +165,84 @@ Respond in JSON format:
     
     def process_job(self, job: JobPosting) -> JobPosting:
         """Analyze job and calculate match score."""
+        self._score_job(job, self.analyze_job_with_ai(job.description, job.title))
+        
+        # Store in SecondBrain
+        remember(*self._job_memory(job))
+        
+        return job
+    
+    def process_jobs(self, jobs: Iterable[JobPosting],
+                     concurrency: Optional[int] = None,
+                     requests_per_minute: Optional[int] = None,
+                     token_budget: Optional[int] = None) -> Iterator[JobPosting]:
+        """Analyze many jobs concurrently, yielding each as it finishes.
         
-        # Get AI analysis
-        analysis = self.analyze_job_with_ai(job.description, job.title)
+        Analyses run on a bounded thread pool through the shared Bedrock
+        client; cache hits skip the rate limit and cost no tokens. Results
+        are stored with one remember_many() once the batch ends (or the
+        caller stops iterating).
+        
+        Args:
+            jobs: Postings to analyze
+            concurrency: Analyses in flight (default: BATCH_CONCURRENCY)
+            requests_per_minute: Bedrock call limit (default:
+                BATCH_REQUESTS_PER_MINUTE, 0 = unlimited)
+            token_budget: Stop starting analyses once this many input +
+                output tokens are spent (None = unlimited); calls already
+                in flight still finish
+        
+        Yields:
+            Scored JobPostings, in completion order
+        """
+        concurrency = concurrency or self.BATCH_CONCURRENCY
+        if requests_per_minute is None:
+            requests_per_minute = self.BATCH_REQUESTS_PER_MINUTE
+        limiter = llm.RateLimiter(requests_per_minute) if requests_per_minute else None
+        
+        pending = iter(jobs)
+        running: Dict = {}
+        done: List[JobPosting] = []
+        tokens = 0
+        skipped = 0
+        executor = ThreadPoolExecutor(max_workers=concurrency,
+                                      thread_name_prefix="job-analysis")
+        
+        def submit() -> None:
+            for job in pending:
+                future = executor.submit(self._analyze, job.description,
+                                         job.title, limiter)
+                running[future] = job
+                if len(running) >= concurrency:
+                    break
+        
+        try:
+            submit()
+            while running:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    job = running.pop(future)
+                    analysis, result = future.result()
+                    if result is not None and not (result.cached or result.shared):
+                        tokens += result.input_tokens + result.output_tokens
+                    self._score_job(job, analysis)
+                    done.append(job)
+                    yield job
+                
+                if token_budget is not None and tokens >= token_budget:
+                    skipped += sum(1 for _ in pending)
+                else:
+                    submit()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            if skipped:
+                print(f"Token budget reached ({tokens}/{token_budget}): "
+                      f"{skipped} jobs not analyzed")
+            if done:
+                remember_many(self._job_memory(job) for job in done)
+    
+    def _score_job(self, job: JobPosting, analysis: dict) -> JobPosting:
+        """Attach the analysis and combined match score."""
         job.analysis = analysis
         
         # Calculate match score
@@ -148,27 +251,28 @@ Respond in JSON format:
         
         # Combined score (AI reasoning + skill overlap)
         job.match_score = (ai_score * 0.6) + (skill_score * 0.4)
-        
-        # Store in SecondBrain
-        remember(
-            key=f"job_{job.id}",
-            value={
+        return job
+    
+    @staticmethod
+    def _job_memory(job: JobPosting) -> tuple:
+        """(key, value, metadata) for storing a scored job."""
+        return (
+            f"job_{job.id}",
+            {
                 "title": job.title,
                 "company": job.company,
                 "location": job.location,
                 "match_score": job.match_score,
-                "analysis": analysis,
+                "analysis": job.analysis,
                 "url": job.url,
                 "date_found": datetime.now().isoformat()
             },
-            metadata={
+            {
                 "type": "job_posting",
                 "source": job.source,
                 "match_tier": "high" if job.match_score >= 75 else "medium" if job.match_score >= 60 else "low"
             }
         )
-        
-        return job
     
     def get_daily_recommendations(self, min_score: float = 75.0) -> List[dict]:
         """Get jobs to apply to today."""
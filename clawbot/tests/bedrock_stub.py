@@ -0,0 +1,158 @@
+"""Local Bedrock Stub
+
+A bedrock-runtime endpoint on localhost for tests: answers invoke_model
+with a canned OpenAI-style body (and Bedrock's token-count headers) and
+list_async_invokes with an empty list, so the gateway, the shared client
+and warmup run end to end without AWS. Requests aren't authenticated,
+but botocore still signs them, so ``env`` points AWS_PROFILE at a
+throwaway credentials file.
+
+Usage:
+    >>> with BedrockStub(reply="stub answer") as stub:
+    ...     os.environ.update(stub.env)   # then reset config and aws
+    ...     llm.complete("hello").text
+    ...     stub.calls
+
+Or standalone:
+    python -m clawbot.tests.bedrock_stub --port 8911
+"""
+
+import argparse
+import json
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROFILE = "bedrock-stub"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # Keep-alive, like the real endpoint
+
+    def _send(self, status: int, body: dict,
+              headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.startswith("/async-invoke"):
+            self._send(200, {"asyncInvokeSummaries": []})
+        else:
+            self._send(404, {"message": f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        parts = self.path.strip("/").split("/")
+        if len(parts) != 3 or parts[0] != "model" or parts[2] != "invoke":
+            self._send(404, {"message": f"Unknown path {self.path}"})
+            return
+
+        stub: "BedrockStub" = self.server.stub
+        with stub.lock:
+            stub.requests.append({"model": parts[1], "body": body})
+        prompt = " ".join(
+            str(m.get("content", "")) for m in body.get("messages", [])
+        )
+        text = stub.reply(prompt) if callable(stub.reply) else stub.reply
+        self._send(200, {
+            "choices": [{"message": {"role": "assistant", "content": text}}]
+        }, {
+            "x-amzn-bedrock-input-token-count": str(len(prompt.split())),
+            "x-amzn-bedrock-output-token-count": str(len(text.split()))
+        })
+
+    def log_message(self, format, *args):
+        pass
+
+
+class BedrockStub:
+    """bedrock-runtime stub server on a background thread."""
+
+    def __init__(self, reply="stub response", host: str = "127.0.0.1",
+                 port: int = 0):
+        """
+        Args:
+            reply: Response text, or a function of the prompt returning it
+            host: Interface to bind
+            port: Port to bind (0 = any free port)
+        """
+        self.reply = reply
+        self.requests: List[dict] = []
+        self.lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self._thread: Optional[threading.Thread] = None
+        self._dir = tempfile.mkdtemp(prefix="bedrock-stub-")
+        self.credentials_file = Path(self._dir) / "credentials"
+        self.credentials_file.write_text(
+            f"[{PROFILE}]\naws_access_key_id = stub\naws_secret_access_key = stub\n"
+        )
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def calls(self) -> int:
+        """invoke_model requests served so far."""
+        with self.lock:
+            return len(self.requests)
+
+    @property
+    def env(self) -> Dict[str, str]:
+        """Environment that points the shared client at this stub."""
+        return {
+            "BEDROCK_ENDPOINT_URL": self.url,
+            "AWS_PROFILE": PROFILE,
+            "AWS_SHARED_CREDENTIALS_FILE": str(self.credentials_file)
+        }
+
+    def start(self) -> "BedrockStub":
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name="bedrock-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+    def __enter__(self) -> "BedrockStub":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local bedrock-runtime stub")
+    parser.add_argument("--port", type=int, default=8911)
+    parser.add_argument("--reply", default="stub response")
+    args = parser.parse_args()
+
+    stub = BedrockStub(reply=args.reply, port=args.port)
+    print(f"Bedrock stub on {stub.url} - set:")
+    for name, value in stub.env.items():
+        print(f"  {name}={value}")
+    try:
+        stub._server.serve_forever()
+    except KeyboardInterrupt:
+        stub._server.server_close()
+        shutil.rmtree(stub._dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+"""Fixtures: SecondBrain under tmp_path and a local Bedrock stub."""
+
+import pytest
+
+from secondbrain.tests.conftest import chat_logger, env, memory  # noqa: F401
+from .bedrock_stub import BedrockStub
+
+
+@pytest.fixture
+def bedrock(env, chat_logger):
+    """BedrockStub the shared client points at; set ``stub.reply``."""
+    from clawbot.core import aws
+
+    with BedrockStub() as stub:
+        env(BEDROCK_WARMUP="false", **stub.env)
+        aws.reset()
+        yield stub
+        aws.reset()
@@ -0,0 +1,71 @@
+"""JobSearchSkill analyses through the LLM gateway and Bedrock stub."""
+
+import json
+import re
+
+import numpy as np
+
+from clawbot.skills.job_search import JobPosting, JobSearchSkill
+
+DESCRIPTION = (
+    "{company} is hiring a Senior Data Engineer to build PySpark pipelines "
+    "on AWS, own our Python ETL framework and mentor two engineers. "
+    "Remote within the US, 8+ years of experience."
+)
+COMPANIES = ["Acme", "Umbrella", "Initech", "Globex"]
+
+
+def _reply(prompt: str) -> str:
+    company = re.search(r"(\w+) is hiring", prompt).group(1)
+    return json.dumps({"required_skills": ["Python", "AWS"],
+                       "match_score": 80, "match_reasoning": company})
+
+
+def _bag_of_words(text: str):
+    # Near-identical postings embed almost identically (cosine > 0.98)
+    vector = np.zeros(256, dtype="float32")
+    for word in re.findall(r"\w+", text.lower()):
+        vector[hash(word) % 256] += 1
+    return vector / np.linalg.norm(vector)
+
+
+def _posting(company: str) -> JobPosting:
+    return JobPosting(
+        id=company.lower(), title="Senior Data Engineer", company=company,
+        location="Remote", description=DESCRIPTION.format(company=company),
+        url="", source="test", posted_date=""
+    )
+
+
+def test_similar_postings_get_their_own_analysis(bedrock, memory, env,
+                                                 monkeypatch):
+    env(CACHE_NEAR_DUPLICATE_DISTANCE=6)
+    monkeypatch.setattr(memory, "get_embedding", _bag_of_words)
+    monkeypatch.setattr(memory, "get_embeddings",
+                        lambda texts: [_bag_of_words(t) for t in texts])
+    bedrock.reply = _reply
+    skill = JobSearchSkill()
+
+    for company in COMPANIES:
+        job = skill.process_job(_posting(company))
+        assert job.analysis["match_reasoning"] == company
+    assert bedrock.calls == len(COMPANIES)
+
+    # A repost of the same job is answered from the cache
+    job = skill.process_job(_posting("Acme"))
+    assert job.analysis["match_reasoning"] == "Acme"
+    assert bedrock.calls == len(COMPANIES)
+
+
+def test_process_jobs_stores_every_job(bedrock, memory):
+    bedrock.reply = _reply
+    skill = JobSearchSkill()
+    companies = [f"Company{i}" for i in range(12)]
+
+    jobs = list(skill.process_jobs([_posting(c) for c in companies],
+                                   concurrency=4, requests_per_minute=0))
+
+    assert sorted(job.company for job in jobs) == sorted(companies)
+    assert all(job.analysis["match_reasoning"] == job.company for job in jobs)
+    assert bedrock.calls == len(companies)
+    assert all(memory.recall(f"job_{c.lower()}") for c in companies)
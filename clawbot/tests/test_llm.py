@@ -0,0 +1,96 @@
+"""LLM gateway: cache, single-flight and cost logging over the Bedrock stub."""
+
+import threading
+import time
+
+import pytest
+
+from clawbot.core import llm
+
+
+def test_identical_prompts_in_flight_share_one_call(bedrock):
+    def slow_reply(prompt):
+        time.sleep(0.3)
+        return "Python is a programming language."
+
+    bedrock.reply = slow_reply
+    barrier = threading.Barrier(8)
+    results = []
+
+    def ask():
+        barrier.wait()
+        results.append(llm.complete("What is Python?"))
+
+    threads = [threading.Thread(target=ask) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert bedrock.calls == 1
+    assert {r.text for r in results} == {"Python is a programming language."}
+    assert sum(not r.shared for r in results) == 1
+    assert sum(r.cost for r in results) == pytest.approx(
+        max(r.cost for r in results)
+    )
+
+
+def test_second_call_is_a_cache_hit(bedrock):
+    bedrock.reply = "An answer."
+
+    first = llm.complete("Explain PySpark briefly")
+    second = llm.complete("Explain PySpark briefly")
+
+    assert bedrock.calls == 1
+    assert not first.cached and first.cost > 0
+    assert first.input_tokens and first.output_tokens
+    assert second.cached and second.cost == 0
+    assert second.text == "An answer."
+
+
+def test_near_miss_prompts_are_separate_calls(bedrock, env):
+    env(CACHE_NEAR_DUPLICATE_DISTANCE=6)
+    bedrock.reply = lambda prompt: prompt.split()[-1]
+
+    for country in ("France", "Germany", "Spain"):
+        result = llm.complete(f"What is the capital of {country}",
+                              similarity_threshold=0.99)
+        assert result.text == country
+    assert bedrock.calls == 3
+
+
+def test_models_and_system_prompts_are_keyed_separately(bedrock):
+    bedrock.reply = lambda prompt: prompt
+
+    llm.complete("Summarize this", model="model-a")
+    llm.complete("Summarize this", model="model-b")
+    llm.complete("Summarize this", model="model-a", system="Be terse")
+    llm.complete("Summarize this", model="model-a")
+
+    assert bedrock.calls == 3
+    assert [r["model"] for r in bedrock.requests] == [
+        "model-a", "model-b", "model-a"
+    ]
+
+
+def test_failed_validation_is_not_cached(bedrock):
+    bedrock.reply = "not json"
+
+    llm.complete("Return JSON", validate=lambda text: text.startswith("{"))
+    llm.complete("Return JSON", validate=lambda text: text.startswith("{"))
+
+    assert bedrock.calls == 2
+
+
+def test_calls_are_logged_with_cost(bedrock, chat_logger):
+    bedrock.reply = "Logged."
+
+    first = llm.complete("Log this call")
+    second = llm.complete("Log this call")
+
+    assert first.cost > 0 and first.input_tokens == 3
+    assert second.cached and second.cost == 0
+    stats = chat_logger.get_logger().get_recent_stats(60)
+    assert stats["total_conversations"] == 2
+    assert stats["cached_responses"] == 1
+    assert stats["api_calls"] == 1
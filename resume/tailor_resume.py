@@ -19,6 +19,7 @@ from datetime import datetime
 sys.path.insert(0, "C:/ecosystem")
 
 from secondbrain import recall
+from clawbot.core import aws
 from clawbot.skills.job_search import JobSearchSkill
 
 
@@ -175,6 +176,8 @@ def main():
     parser.add_argument('--output', default='tailored', help='Output filename')
     parser.add_argument('--use-bedrock', action='store_true', help='Use AWS Bedrock for analysis')
     args = parser.parse_args()
+    if args.use_bedrock:
+        aws.warmup()
     
     print("=" * 70)
     print("RESUME TAILOR")
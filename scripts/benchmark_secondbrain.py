@@ -0,0 +1,427 @@
+"""SecondBrain storage benchmarks.
+
+Runs against a throwaway data directory - never touches C:/ecosystem/data.
+
+Usage:
+    python scripts/benchmark_secondbrain.py recall
+    python scripts/benchmark_secondbrain.py recall --sizes 1000 10000 100000
+    python scripts/benchmark_secondbrain.py query --engine sqlite --size 100000
+    python scripts/benchmark_secondbrain.py remember --sizes 1000 10000
+    python scripts/benchmark_secondbrain.py cache --sizes 1000 10000 50000
+    python scripts/benchmark_secondbrain.py serialize --sizes 10000 100000
+    python scripts/benchmark_secondbrain.py semantic --expired 0.3
+"""
+
+import argparse
+import pickle
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import secondbrain.api.memory as memory
+from secondbrain.storage import codec
+from secondbrain.storage.engine import open_engine
+from secondbrain.storage.local_index import LocalVectorStore
+from secondbrain.storage.response_cache import ResponseCache
+from shared.config import get_config
+from shared.models.schemas import MemoryRecord
+
+
+def _use_temp_data_root() -> Path:
+    """Point SecondBrain at a fresh temp directory."""
+    memory.close_storage()
+    root = Path(tempfile.mkdtemp(prefix="secondbrain_bench_"))
+    memory.DATA_ROOT = root
+    return root
+
+
+def _make_record(i: int) -> MemoryRecord:
+    now = datetime.now()
+    return MemoryRecord(
+        key=f"job_{i}",
+        value={
+            "title": f"Senior Data Engineer {i}",
+            "company": f"Company {i % 500}",
+            "description": f"Posting {i}: " + "Python, PySpark, AWS, SQL. " * 20,
+            "match_score": i % 100
+        },
+        metadata={"type": "job_posting", "source": "benchmark"},
+        created_at=now,
+        updated_at=now
+    )
+
+
+def _timeit(fn, repeat: int) -> float:
+    """Median wall time of fn() in microseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(samples)
+
+
+def bench_recall(sizes, repeat: int) -> None:
+    """recall() latency vs store size, against the old reload-per-call path."""
+    print("=" * 60)
+    print("recall() latency vs store size")
+    print("=" * 60)
+    print(f"{'records':>10} {'store MB':>10} {'recall us':>12} {'legacy us':>12}")
+
+    for size in sizes:
+        root = _use_temp_data_root()
+        memory._ensure_storage()
+        for i in range(size):
+            memory._memory_store.put(f"job_{i}", _make_record(i))
+
+        # Legacy path: unpickle the whole store on every call
+        legacy_file = root / "legacy.pkl"
+        with open(legacy_file, "wb") as f:
+            pickle.dump(dict(memory._memory_store.items()), f)
+        store_mb = legacy_file.stat().st_size / 1e6
+
+        def legacy_recall():
+            with open(legacy_file, "rb") as f:
+                pickle.load(f).get(f"job_{size // 2}")
+
+        recall_us = _timeit(lambda: memory.recall(f"job_{size // 2}"), repeat)
+        legacy_us = _timeit(legacy_recall, min(repeat, 5))
+
+        print(f"{size:>10} {store_mb:>10.1f} {recall_us:>12.1f} {legacy_us:>12.1f}")
+
+    memory.close_storage()
+
+
+def _make_application(i: int) -> MemoryRecord:
+    statuses = ["applied", "phone_screen", "technical_interview",
+                "onsite", "offer", "rejected", "ghosted"]
+    date_applied = f"2026-{1 + i % 12:02d}-{1 + i % 28:02d}T09:00:00"
+    metadata = {
+        "type": "job_application" if i % 4 == 0 else "job_posting",
+        "company": f"Company {i % 500}",
+        "status": statuses[i % len(statuses)],
+        "date_applied": date_applied
+    }
+    now = datetime.now()
+    return MemoryRecord(
+        key=f"application_{i}",
+        value={"company": metadata["company"], "role": "Data Engineer",
+               "status": metadata["status"], "date_applied": date_applied},
+        metadata=metadata,
+        created_at=now,
+        updated_at=now
+    )
+
+
+def bench_query(engine_name: str, size: int, repeat: int) -> None:
+    """Metadata query latency over a populated store."""
+    print("=" * 60)
+    print(f"query() over {size} records ({engine_name} engine)")
+    print("=" * 60)
+
+    root = _use_temp_data_root()
+    engine = open_engine(engine_name, root / "memory")
+    start = time.perf_counter()
+    engine.put_many((f"application_{i}", _make_application(i))
+                    for i in range(size))
+    print(f"  load: {time.perf_counter() - start:.2f}s")
+
+    cases = [
+        ("type + status",
+         {"type": "job_application", "status": "applied"}, None, None),
+        ("company",
+         {"company": "Company 42"}, None, None),
+        ("date range, newest 20",
+         {"type": "job_application",
+          "date_applied": {"gte": "2026-05-01", "lt": "2026-06-01"}},
+         "-date_applied", 20),
+    ]
+    for label, filter, order_by, limit in cases:
+        count = len(engine.query(filter, order_by, limit))
+        ms = _timeit(lambda: engine.query(filter, order_by, limit), repeat) / 1000
+        print(f"  {label:<24} {count:>7} rows {ms:>9.2f} ms")
+
+    engine.close()
+
+
+def bench_remember(engines, sizes, with_vectors: bool) -> None:
+    """remember() loop vs remember_many() throughput."""
+    print("=" * 60)
+    print("remember() vs remember_many() throughput"
+          + ("" if with_vectors else " (vector indexing off)"))
+    print("=" * 60)
+    print(f"{'engine':>8} {'items':>8} {'loop/s':>12} {'batch/s':>12}")
+
+    cfg = get_config()
+    index_knowledge = memory._index_knowledge
+    if not with_vectors:
+        memory._index_knowledge = lambda records: None
+
+    try:
+        for engine_name in engines:
+            cfg.STORAGE_ENGINE = engine_name
+            for size in sizes:
+                items = [(r.key, r.value, r.metadata)
+                         for r in map(_make_record, range(size))]
+
+                loop_rate = None
+                # The legacy engine rewrites the store per call - O(n^2)
+                if engine_name != "pickle" or size <= 2000:
+                    _use_temp_data_root()
+                    start = time.perf_counter()
+                    for key, value, metadata in items:
+                        memory.remember(key, value, metadata)
+                    loop_rate = size / (time.perf_counter() - start)
+
+                _use_temp_data_root()
+                start = time.perf_counter()
+                memory.remember_many(items)
+                batch_rate = size / (time.perf_counter() - start)
+
+                loop = f"{loop_rate:>12.0f}" if loop_rate else f"{'skipped':>12}"
+                print(f"{engine_name:>8} {size:>8} {loop} {batch_rate:>12.0f}")
+    finally:
+        memory._index_knowledge = index_knowledge
+        memory.close_storage()
+
+
+def bench_cache(sizes, repeat: int) -> None:
+    """cache_get() hit latency vs cache size, against persist-per-hit."""
+    print("=" * 60)
+    print("cache_get() hit latency vs cache size")
+    print("=" * 60)
+    print(f"{'entries':>10} {'exact us':>10} {'normalized us':>14} "
+          f"{'legacy us':>12}")
+
+    for size in sizes:
+        root = _use_temp_data_root()
+        memory._ensure_storage()
+        entries = []
+        for i in range(size):
+            cached = memory._make_cached(
+                memory.cache_key(
+                    f"Question {i}: how should I approach role {i % 500}?",
+                    "benchmark"
+                ),
+                "Answer " * 50, 86400
+            )
+            ResponseCache._fingerprints(cached)
+            entries.append((cached.query_hash, cached))
+        memory._cache_store.put_many(entries)
+        # Reopen so the lookup indexes are built from the engine
+        memory.close_storage()
+        memory._ensure_storage()
+
+        query = f"Question {size // 2}: how should I approach role {size // 2 % 500}?"
+        exact_us = _timeit(lambda: memory.cache_get(query), repeat)
+        normalized_us = _timeit(lambda: memory.cache_get(query.upper()), repeat)
+
+        # Legacy path: bump hit_count, then re-pickle the whole cache
+        legacy_file = root / "legacy_cache.pkl"
+        legacy = dict(entries)
+
+        def legacy_hit():
+            legacy[entries[size // 2][0]].hit_count += 1
+            with open(legacy_file, "wb") as f:
+                pickle.dump(legacy, f)
+
+        legacy_us = _timeit(legacy_hit, min(repeat, 5))
+        print(f"{size:>10} {exact_us:>10.1f} {normalized_us:>14.1f} "
+              f"{legacy_us:>12.1f}")
+
+    memory.close_storage()
+
+
+def _make_store(size: int) -> dict:
+    """Half memory records, half cached responses."""
+    store = {}
+    for i in range(size):
+        if i % 2:
+            store[f"job_{i}"] = _make_record(i)
+        else:
+            cached = memory._make_cached(
+                memory.cache_key(
+                    f"Question {i}: how should I approach role {i % 500}?",
+                    "benchmark"
+                ),
+                "Answer " * 50, 86400
+            )
+            store[cached.query_hash] = cached
+    return store
+
+
+def bench_serialize(sizes) -> None:
+    """Snapshot save/load time and size: pickle vs the versioned codec."""
+    print("=" * 60)
+    print("store snapshot: pickle vs versioned codec")
+    print("=" * 60)
+    print(f"{'records':>10} {'format':>10} {'save s':>8} {'load s':>8} "
+          f"{'MB':>8}")
+
+    formats = [("pickle", None), ("json", codec.FORMAT_JSON)]
+    if codec._msgpack() is not None:
+        formats.append(("msgpack", codec.FORMAT_MSGPACK))
+    else:
+        print("  (msgpack not installed - pip install msgpack to compare)")
+
+    root = Path(tempfile.mkdtemp(prefix="secondbrain_bench_"))
+    for size in sizes:
+        store = _make_store(size)
+        for name, format in formats:
+            path = root / f"{name}_{size}.snapshot"
+            start = time.perf_counter()
+            if format is None:
+                blob = pickle.dumps(store, protocol=pickle.HIGHEST_PROTOCOL)
+            else:
+                blob = codec.dumps(store, format=format)
+            path.write_bytes(blob)
+            save_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            blob = path.read_bytes()
+            loaded = (pickle.loads(blob) if format is None
+                      else codec.loads(blob))
+            load_s = time.perf_counter() - start
+            assert len(loaded) == size
+
+            print(f"{size:>10} {name:>10} {save_s:>8.2f} {load_s:>8.2f} "
+                  f"{path.stat().st_size / 1e6:>8.1f}")
+
+
+def bench_semantic(topics: int, paraphrases: int, expired: float,
+                   top_k: int, queries: int, threshold: float) -> None:
+    """Semantic-tier hit rate: top-1 + Python expiry check vs filtered top-k.
+
+    Each topic has a few cached paraphrases (random unit vectors around a
+    topic centre); ``expired`` of them are past their expires_at. A query
+    is another paraphrase, so it should hit whenever any paraphrase of its
+    topic is still live.
+    """
+    import numpy as np
+
+    print("=" * 60)
+    print(f"semantic cache hit rate ({topics} topics x {paraphrases} "
+          f"paraphrases, {expired:.0%} expired)")
+    print("=" * 60)
+
+    rng = np.random.default_rng(0)
+    dim = 768
+    centres = rng.standard_normal((topics, dim)).astype(np.float32)
+    centres /= np.linalg.norm(centres, axis=1, keepdims=True)
+
+    def paraphrase(topic):
+        noise = rng.standard_normal(dim).astype(np.float32) * 0.01
+        return centres[topic] + noise
+
+    now = time.time()
+    points = []
+    for topic in range(topics):
+        for p in range(paraphrases):
+            stale = rng.random() < expired
+            points.append({
+                "id": f"q{topic}_{p}",
+                "vector": paraphrase(topic),
+                "payload": {"model": "benchmark",
+                            "expires_at": now + (-60 if stale else 3600)}
+            })
+    live_topics = {
+        int(p["id"][1:].split("_")[0]) for p in points
+        if p["payload"]["expires_at"] > now
+    }
+
+    store = LocalVectorStore(Path(tempfile.mkdtemp(prefix="secondbrain_bench_")))
+    store.connect()
+    collection = store.COLLECTION_QUERIES
+    store.upsert_many(collection, points)
+
+    asked = rng.integers(0, topics, size=queries)
+    vectors = [paraphrase(int(t)) for t in asked]
+    reachable = sum(int(t) in live_topics for t in asked)
+
+    def top1():
+        hits = 0
+        for vector in vectors:
+            results = store.search(collection, vector, limit=1,
+                                   threshold=threshold)
+            hits += bool(results) and results[0]["payload"]["expires_at"] > now
+        return hits
+
+    def filtered():
+        hits = 0
+        live = {"expires_at": {"gt": time.time()}, "model": "benchmark"}
+        for vector in vectors:
+            hits += bool(store.search(collection, vector, limit=top_k,
+                                      threshold=threshold, filter=live))
+        return hits
+
+    print(f"{'strategy':>22} {'hit rate':>9} {'of reachable':>13} "
+          f"{'us/query':>9}")
+    for name, run in (("top-1, check in Python", top1),
+                      (f"filtered top-{top_k}", filtered)):
+        start = time.perf_counter()
+        hits = run()
+        us = (time.perf_counter() - start) * 1e6 / queries
+        print(f"{name:>22} {hits / queries:>9.1%} "
+              f"{hits / max(reachable, 1):>13.1%} {us:>9.1f}")
+    store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("recall", help="recall() latency vs store size")
+    p.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    p.add_argument("--repeat", type=int, default=200)
+
+    p = sub.add_parser("query", help="metadata query latency")
+    p.add_argument("--engine", default="sqlite")
+    p.add_argument("--size", type=int, default=100000)
+    p.add_argument("--repeat", type=int, default=20)
+
+    p = sub.add_parser("remember", help="remember() vs remember_many()")
+    p.add_argument("--engines", nargs="+", default=["log", "sqlite", "pickle"])
+    p.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    p.add_argument("--with-vectors", action="store_true",
+                   help="Include Ollama embedding + Qdrant upsert")
+
+    p = sub.add_parser("cache", help="cache_get() hit latency vs cache size")
+    p.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    p.add_argument("--repeat", type=int, default=200)
+
+    p = sub.add_parser("serialize", help="snapshot format save/load/size")
+    p.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+
+    p = sub.add_parser("semantic", help="semantic cache hit rate with expiry")
+    p.add_argument("--topics", type=int, default=2000)
+    p.add_argument("--paraphrases", type=int, default=4)
+    p.add_argument("--expired", type=float, default=0.3)
+    p.add_argument("--top-k", type=int, default=get_config().CACHE_SEMANTIC_TOP_K)
+    p.add_argument("--queries", type=int, default=1000)
+    p.add_argument("--threshold", type=float,
+                   default=get_config().CACHE_SIMILARITY_THRESHOLD)
+
+    args = parser.parse_args()
+
+    if args.command == "recall":
+        bench_recall(args.sizes, args.repeat)
+    elif args.command == "query":
+        bench_query(args.engine, args.size, args.repeat)
+    elif args.command == "remember":
+        bench_remember(args.engines, args.sizes, args.with_vectors)
+    elif args.command == "cache":
+        bench_cache(args.sizes, args.repeat)
+    elif args.command == "serialize":
+        bench_serialize(args.sizes)
+    elif args.command == "semantic":
+        bench_semantic(args.topics, args.paraphrases, args.expired,
+                       args.top_k, args.queries, args.threshold)
+
+
+if __name__ == "__main__":
+    main()
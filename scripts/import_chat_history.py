@@ -0,0 +1,60 @@
+"""Import ChatGPT / Claude / Kimi chat exports into SecondBrain.
+
+Seeds the response cache and knowledge store from past conversations.
+Safe to interrupt: rerunning the same file resumes from its checkpoint.
+
+Usage:
+    python scripts/import_chat_history.py C:/Downloads/chatgpt/conversations.json
+    python scripts/import_chat_history.py claude.json --source claude --workers 8
+    python scripts/import_chat_history.py kimi.jsonl --ttl-days 30 --restart
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from secondbrain.ingest.importer import SOURCES, import_chat_export
+
+
+def _print_progress(report: dict) -> None:
+    pct = 100 * report["bytes_read"] / max(report["bytes_total"], 1)
+    print(f"  {pct:5.1f}%  {report['conversations']:>8} conversations  "
+          f"{report['turns']:>9} turns  {report['duplicates']:>8} duplicates  "
+          f"{report['written']:>9} written  ({report['elapsed_s']}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="+", type=Path, help="Export files")
+    parser.add_argument("--source", choices=SOURCES, default="auto")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--ttl-days", type=float, default=90,
+                        help="Cache lifetime of imported responses")
+    parser.add_argument("--restart", action="store_true",
+                        help="Ignore saved checkpoints")
+    args = parser.parse_args()
+
+    for path in args.paths:
+        print(f"Importing {path}")
+        report = import_chat_export(
+            path,
+            source=args.source,
+            workers=args.workers,
+            batch_size=args.batch_size,
+            ttl=int(args.ttl_days * 86400),
+            resume=not args.restart,
+            progress=_print_progress
+        )
+        if report["resumed"]:
+            print("  (resumed from checkpoint)")
+        print(f"  done: {report['conversations']} conversations, "
+              f"{report['turns']} turns, {report['duplicates']} duplicates, "
+              f"{report['written']} written, {report['failed']} failed "
+              f"in {report['elapsed_s']}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,28 +3,59 @@
 Store knowledge, cache API responses, remember everything.
 
 Public API:
-    from secondbrain import remember, recall, cache_store, cache_get
+    from secondbrain import remember, recall, query, cache_store, cache_get
+    from secondbrain import remember_many, recall_many, cache_store_many
+    from secondbrain import cache_key, cache_clear, cache_contains_many
     from secondbrain import search_knowledge, get_cache_stats
     from secondbrain import log_interaction
+    from secondbrain import aremember, arecall, acache_get  # asyncio
 """
 
 from .api import (
     remember, 
+    remember_many,
     recall, 
+    recall_many,
+    query,
+    cache_key,
     cache_store, 
+    cache_store_many,
     cache_get,
+    cache_contains_many,
+    cache_clear,
     search_knowledge,
-    get_cache_stats
+    get_cache_stats,
+    aremember,
+    aremember_many,
+    arecall,
+    arecall_many,
+    acache_store,
+    acache_get,
+    asearch_knowledge
 )
 from .ingest import log_interaction
 
 __version__ = "1.0.0"
 __all__ = [
     "remember", 
+    "remember_many",
     "recall", 
+    "recall_many",
+    "query",
+    "cache_key",
     "cache_store", 
+    "cache_store_many",
     "cache_get",
+    "cache_contains_many",
+    "cache_clear",
     "search_knowledge",
     "get_cache_stats",
+    "aremember",
+    "aremember_many",
+    "arecall",
+    "arecall_many",
+    "acache_store",
+    "acache_get",
+    "asearch_knowledge",
     "log_interaction"
 ]
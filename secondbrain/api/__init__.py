@@ -1,23 +1,57 @@
 """SecondBrain API
 
-Public interface: remember(), recall(), cache_store(), cache_get(),
-search_knowledge(), get_cache_stats()
+Public interface: remember(), remember_many(), recall(), recall_many(),
+query(), cache_key(), cache_store(), cache_store_many(), cache_get(),
+cache_contains_many(), cache_clear(), search_knowledge(), get_cache_stats()
+
+Async (asyncio) variants: aremember(), aremember_many(), arecall(),
+arecall_many(), acache_store(), acache_get(), asearch_knowledge()
 """
 
 from .memory import (
     remember, 
+    remember_many,
     recall, 
+    recall_many,
+    query,
+    cache_key,
     cache_store, 
+    cache_store_many,
     cache_get,
+    cache_contains_many,
+    cache_clear,
     search_knowledge,
     get_cache_stats
 )
+from .async_memory import (
+    aremember,
+    aremember_many,
+    arecall,
+    arecall_many,
+    acache_store,
+    acache_get,
+    asearch_knowledge
+)
 
 __all__ = [
     "remember", 
+    "remember_many",
     "recall", 
+    "recall_many",
+    "query",
+    "cache_key",
     "cache_store", 
+    "cache_store_many",
     "cache_get",
+    "cache_contains_many",
+    "cache_clear",
     "search_knowledge",
-    "get_cache_stats"
+    "get_cache_stats",
+    "aremember",
+    "aremember_many",
+    "arecall",
+    "arecall_many",
+    "acache_store",
+    "acache_get",
+    "asearch_knowledge"
 ]
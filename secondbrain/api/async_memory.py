@@ -0,0 +1,160 @@
+"""Async Memory API
+
+asyncio variants of the memory API for event-loop callers (the Telegram
+bot). Ollama and Qdrant calls are native async (httpx and
+AsyncQdrantClient), so many lookups can be in flight at once without a
+thread each. Records live in the same storage engines as the sync API;
+engine reads/writes are local and fast, so they run inline - except
+cache writes, which can evict entries and delete their vectors with
+the sync store, so they run on the default thread pool.
+
+Interface:
+    aremember(key: str, value: Any, metadata: dict = None) -> bool
+    aremember_many(items: Iterable[tuple]) -> int
+    arecall(key: str) -> Optional[dict]
+    arecall_many(keys: Iterable[str]) -> Dict[str, dict]
+    acache_store(query: str | CacheKey, response: str, model: str, ttl: int) -> bool
+    acache_get(query: str | CacheKey, similarity_threshold: float = 0.90, model: str = None, fuzzy: bool = None) -> Optional[str]
+    asearch_knowledge(query: str, limit: int = 5) -> list
+
+Usage:
+    >>> response = await acache_get(user_message)
+    >>> results = await asyncio.gather(*(arecall(k) for k in keys))
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, Iterable, Optional, Union
+
+from shared.config import get_config
+from shared.utils.embeddings import aget_embedding, aget_embeddings
+from secondbrain.api import memory
+from secondbrain.api.memory import (
+    _cached_payload, _fresh_response, _knowledge_hits,
+    _knowledge_points, _knowledge_text, _live_filter, _make_cached,
+    _make_records, _record_dict, _store_key
+)
+from secondbrain.storage.cache_key import CacheKey, cache_key
+
+
+async def aremember(key: str, value: Any, metadata: dict = None) -> bool:
+    """Async remember()."""
+    return await aremember_many([(key, value, metadata)]) == 1
+
+
+async def aremember_many(items: Iterable[tuple]) -> int:
+    """Async remember_many(): one persist, embedding pass and upsert."""
+    memory._ensure_storage()
+
+    records = _make_records(items)
+    if not records:
+        return 0
+
+    memory._memory_store.put_many((record.key, record) for record in records)
+
+    try:
+        from secondbrain.storage.async_vector_store import get_async_store
+        store = await get_async_store()
+
+        vectors = await aget_embeddings([_knowledge_text(r) for r in records])
+        await store.upsert_many(
+            store.COLLECTION_KNOWLEDGE, _knowledge_points(records, vectors)
+        )
+    except Exception as e:
+        print(f"Vector storage failed (non-critical): {e}")
+
+    return len(records)
+
+
+async def arecall(key: str) -> Optional[dict]:
+    """Async recall()."""
+    memory._ensure_storage()
+
+    record = memory._memory_store.get(key)
+    return _record_dict(record) if record is not None else None
+
+
+async def arecall_many(keys: Iterable[str]) -> Dict[str, dict]:
+    """Async recall_many()."""
+    memory._ensure_storage()
+
+    found = memory._memory_store.get_many(keys)
+    return {key: _record_dict(record) for key, record in found.items()}
+
+
+async def acache_store(query: Union[str, CacheKey], response: str,
+                       model: str = "unknown", ttl: int = 86400) -> bool:
+    """Async cache_store()."""
+    memory._ensure_storage()
+
+    key = _store_key(query, model)
+    cached = _make_cached(key, response, ttl)
+    # Evictions call _drop_query_vectors, a blocking Qdrant request
+    await asyncio.to_thread(memory._response_cache.put, cached)
+
+    try:
+        from secondbrain.storage.async_vector_store import get_async_store
+        store = await get_async_store()
+
+        await store.upsert(
+            store.COLLECTION_QUERIES, cached.query_hash,
+            await aget_embedding(key.text), _cached_payload(cached)
+        )
+    except Exception as e:
+        print(f"Vector cache storage failed (non-critical): {e}")
+
+    return True
+
+
+async def acache_get(query: Union[str, CacheKey],
+                     similarity_threshold: float = 0.90,
+                     model: Optional[str] = None,
+                     fuzzy: Optional[bool] = None) -> Optional[str]:
+    """Async cache_get(): local tiers, then vector similarity."""
+    memory._ensure_storage()
+    cache = memory._response_cache
+
+    key = query if isinstance(query, CacheKey) else cache_key(query, model)
+    if fuzzy is None:
+        fuzzy = not key.templated
+    cached = cache.lookup(key, similarity_threshold, fuzzy)
+    if cached is not None:
+        return cached.response
+
+    if not fuzzy or len(cache) == 0:
+        cache.skip("semantic")
+        return None
+
+    start = time.perf_counter()
+    response = None
+    try:
+        from secondbrain.storage.async_vector_store import get_async_store
+        store = await get_async_store()
+
+        results = await store.search(
+            store.COLLECTION_QUERIES, await aget_embedding(key.text),
+            limit=get_config().CACHE_SEMANTIC_TOP_K,
+            threshold=similarity_threshold, filter=_live_filter(key)
+        )
+        response = _fresh_response(results)
+    except Exception as e:
+        print(f"Vector cache lookup failed (non-critical): {e}")
+
+    cache.record("semantic", response is not None, time.perf_counter() - start)
+    return response
+
+
+async def asearch_knowledge(query: str, limit: int = 5) -> list:
+    """Async search_knowledge()."""
+    try:
+        from secondbrain.storage.async_vector_store import get_async_store
+        store = await get_async_store()
+
+        results = await store.search(
+            store.COLLECTION_KNOWLEDGE, await aget_embedding(query),
+            limit=limit, threshold=0.7
+        )
+        return _knowledge_hits(results)
+    except Exception as e:
+        print(f"Knowledge search failed: {e}")
+        return []
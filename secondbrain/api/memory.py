@@ -5,65 +5,132 @@ flows through these four functions.
 
 Interface:
     remember(key: str, value: Any, metadata: dict = None) -> bool
+    remember_many(items: Iterable[tuple]) -> int
     recall(key: str) -> Optional[MemoryRecord]
-    cache_store(query_hash: str, response: str, ttl: int = 86400) -> bool
-    cache_get(query_hash: str, similarity_threshold: float = 0.90) -> Optional[str]
+    recall_many(keys: Iterable[str]) -> Dict[str, dict]
+    reindex_knowledge() -> dict
+    cache_key(query: str = None, model: str = None, template: str = None, variables: dict = None) -> CacheKey
+    cache_store(query: str | CacheKey, response: str, model: str = "unknown", ttl: int = 86400) -> bool
+    cache_store_many(items: Iterable[tuple], ttl: int = 86400) -> int
+    cache_get(query: str | CacheKey, similarity_threshold: float = 0.90, model: str = None, fuzzy: bool = None) -> Optional[str]
+    cache_contains_many(queries: Iterable[str | CacheKey], model: str = "unknown") -> Set[str]
+    cache_clear(template: str) -> int
+    query(filter: dict = None, order_by: str = None, limit: int = None) -> list
 """
 
+import atexit
 import json
-import pickle
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Any, Optional
+from typing import Any, Dict, Iterable, List, Optional, Set, Union
 from pathlib import Path
 
-from shared.utils.embeddings import get_embedding, hash_text
+from shared.config import get_config
+from shared.utils.embeddings import get_embedding, get_embeddings
 from shared.models.schemas import MemoryRecord, CachedResponse
+from secondbrain.storage.cache_key import CacheKey, cache_key
+from secondbrain.storage.engine import StorageEngine, open_engine
+from secondbrain.storage.near_duplicate import simhash
+from secondbrain.storage.response_cache import ResponseCache
 
 # Storage paths - SEPARATE FROM CODE (gitignored)
 DATA_ROOT = Path("C:/ecosystem/data")
 STORAGE_ROOT = Path("C:/ecosystem/secondbrain/storage")
-MEMORY_FILE = DATA_ROOT / "memory" / "memory.pkl"
-CACHE_FILE = DATA_ROOT / "cache" / "cache.pkl"
+MEMORY_BASE = "memory/memory"  # -> memory.snapshot + memory.log
+CACHE_BASE = "cache/cache"
 
-# In-memory stores (persisted to disk)
-_memory_store: dict = {}
-_cache_store: dict = {}
+# Storage engines (opened once, see secondbrain.storage.engine)
+_memory_store: Optional[StorageEngine] = None
+_cache_store: Optional[StorageEngine] = None
+_response_cache: Optional[ResponseCache] = None  # tiered lookup over _cache_store
+# Serializes first open - worker threads (chat ingest, batch jobs) race here
+_storage_lock = threading.Lock()
 
 
 def _ensure_storage():
-    """Ensure storage directory exists and load persisted data."""
-    global _memory_store, _cache_store
+    """Open the storage engines once; afterwards only pick up changes.
     
-    # Create data directories (gitignored, separate from code)
-    DATA_ROOT.mkdir(parents=True, exist_ok=True)
-    (DATA_ROOT / "memory").mkdir(exist_ok=True)
-    (DATA_ROOT / "cache").mkdir(exist_ok=True)
+    Stores are loaded into memory on first use. Later calls cost a
+    stat() per store and only re-read data another process (e.g. a CLI
+    run while the bot is up) actually wrote.
+    """
+    global _memory_store, _cache_store, _response_cache
     
-    if MEMORY_FILE.exists():
-        try:
-            with open(MEMORY_FILE, "rb") as f:
-                _memory_store = pickle.load(f)
-        except Exception:
-            _memory_store = {}
+    # _response_cache is assigned last, so once it's set the stores are too
+    if _response_cache is not None:
+        _memory_store.refresh()
+        _cache_store.refresh()
+        return
     
-    if CACHE_FILE.exists():
-        try:
-            with open(CACHE_FILE, "rb") as f:
-                _cache_store = pickle.load(f)
-        except Exception:
-            _cache_store = {}
+    with _storage_lock:
+        if _response_cache is not None:
+            return
+        
+        # Create data directories (gitignored, separate from code)
+        DATA_ROOT.mkdir(parents=True, exist_ok=True)
+        (DATA_ROOT / "memory").mkdir(exist_ok=True)
+        (DATA_ROOT / "cache").mkdir(exist_ok=True)
+        
+        cfg = get_config()
+        options = {
+            "fsync": cfg.STORAGE_FSYNC,
+            "compact_threshold": cfg.STORAGE_COMPACT_THRESHOLD
+        }
+        
+        _memory_store = open_engine(
+            cfg.STORAGE_ENGINE, DATA_ROOT / MEMORY_BASE,
+            legacy_file=DATA_ROOT / "memory" / "memory.pkl", **options
+        )
+        _cache_store = open_engine(
+            cfg.STORAGE_ENGINE, DATA_ROOT / CACHE_BASE,
+            legacy_file=DATA_ROOT / "cache" / "cache.pkl", **options
+        )
+        _response_cache = ResponseCache(
+            _cache_store,
+            near_duplicate_distance=cfg.CACHE_NEAR_DUPLICATE_DISTANCE,
+            flush_interval=cfg.CACHE_FLUSH_INTERVAL,
+            sweep_interval=cfg.CACHE_SWEEP_INTERVAL,
+            max_entries=cfg.CACHE_MAX_ENTRIES,
+            max_bytes=int(cfg.CACHE_MAX_MB * 1024 * 1024),
+            eviction=cfg.CACHE_EVICTION,
+            on_remove=_drop_query_vectors
+        )
+
+
+def _drop_query_vectors(query_hashes: List[str]) -> None:
+    """Delete expired/evicted cache entries from the queries collection."""
+    try:
+        from secondbrain.storage.vector_store import get_store
+        store = get_store()
+        report = store.delete_batch(store.COLLECTION_QUERIES, query_hashes)
+        if report["failed_points"]:
+            # Lookups stay correct (semantic hits are checked against the
+            # cache), but the points stay in the collection
+            print(f"Vector cache cleanup failed (non-critical): "
+                  f"{report['failed_points']} of {report['points']} "
+                  f"points not deleted")
+    except Exception as e:
+        print(f"Vector cache cleanup failed (non-critical): {e}")
 
 
-def _persist_memory():
-    """Persist memory to disk."""
-    with open(MEMORY_FILE, "wb") as f:
-        pickle.dump(_memory_store, f)
+def close_storage():
+    """Flush and close the storage engines."""
+    global _memory_store, _cache_store, _response_cache
+    
+    with _storage_lock:
+        if _response_cache is not None:
+            # Writes buffered hit counts, so before the engines close
+            _response_cache.close()
+        for engine in (_memory_store, _cache_store):
+            if engine is not None:
+                engine.close()
+        _response_cache = None
+        _memory_store = None
+        _cache_store = None
 
 
-def _persist_cache():
-    """Persist cache to disk."""
-    with open(CACHE_FILE, "wb") as f:
-        pickle.dump(_cache_store, f)
+atexit.register(close_storage)
 
 
 def remember(key: str, value: Any, metadata: dict = None) -> bool:
@@ -77,44 +144,130 @@ def remember(key: str, value: Any, metadata: dict = None) -> bool:
     Returns:
         True if stored successfully
     """
+    return remember_many([(key, value, metadata)]) == 1
+
+
+def remember_many(items: Iterable[tuple]) -> int:
+    """Store many memories with one persist, embedding pass and upsert.
+    
+    Args:
+        items: (key, value) or (key, value, metadata) tuples
+    
+    Returns:
+        Number of memories stored
+    """
     _ensure_storage()
     
-    record = MemoryRecord(
-        key=key,
-        value=value,
-        metadata=metadata or {},
-        created_at=datetime.now(),
-        updated_at=datetime.now()
-    )
+    records = _make_records(items)
+    if not records:
+        return 0
     
-    _memory_store[key] = record
-    _persist_memory()
+    _memory_store.put_many((record.key, record) for record in records)
     
     # Also store in vector DB for semantic search
+    _index_knowledge(records)
+    
+    return len(records)
+
+
+def _make_records(items: Iterable[tuple]) -> List[MemoryRecord]:
+    """Build MemoryRecords from (key, value[, metadata]) tuples."""
+    now = datetime.now()
+    records = []
+    for item in items:
+        key, value = item[0], item[1]
+        metadata = item[2] if len(item) > 2 else None
+        records.append(MemoryRecord(
+            key=key,
+            value=value,
+            metadata=metadata or {},
+            created_at=now,
+            updated_at=now
+        ))
+    return records
+
+
+def _knowledge_text(record: MemoryRecord) -> str:
+    """Searchable text representation of a record."""
+    return f"{record.key}: {json.dumps(record.value, default=str)}"
+
+
+def _knowledge_points(records: List[MemoryRecord], vectors) -> List[dict]:
+    return [
+        {
+            "id": record.key,
+            "vector": vector,
+            "payload": {
+                "key": record.key,
+                "value": record.value,
+                "metadata": record.metadata,
+                "updated_at": record.updated_at.isoformat()
+            }
+        }
+        for record, vector in zip(records, vectors)
+    ]
+
+
+def _index_knowledge(records: List[MemoryRecord]) -> Optional[dict]:
+    """Embed records and upsert them into the knowledge collection.
+    
+    Returns:
+        The upsert_batch report, or None if vector storage failed
+    """
     try:
         from secondbrain.storage.vector_store import get_store
         store = get_store()
+        cfg = get_config()
         
-        # Create searchable text representation
-        text_repr = f"{key}: {json.dumps(value, default=str)}"
-        vector = get_embedding(text_repr)
+        vectors = get_embeddings([_knowledge_text(r) for r in records])
         
-        store.upsert(
+        return store.upsert_batch(
             collection=store.COLLECTION_KNOWLEDGE,
-            id=key,
-            vector=vector,
-            payload={
-                "key": key,
-                "value": value,
-                "metadata": record.metadata,
-                "updated_at": record.updated_at.isoformat()
-            }
+            points=_knowledge_points(records, vectors),
+            batch_size=cfg.VECTOR_BATCH_SIZE,
+            parallel=cfg.VECTOR_UPSERT_PARALLEL
         )
     except Exception as e:
         # Vector storage is optional - don't fail if Qdrant unavailable
         print(f"Vector storage failed (non-critical): {e}")
+        return None
+
+
+def reindex_knowledge(chunk_size: int = 2048) -> dict:
+    """Re-embed every memory into the knowledge collection.
     
-    return True
+    Use after changing the embedding model or restoring a wiped vector
+    store. Only the keys are listed up front; records are loaded,
+    embedded and upserted chunk by chunk, so the SQLite engine never
+    holds more than ``chunk_size`` decoded records at once.
+    
+    Args:
+        chunk_size: Records embedded per pass
+    
+    Returns:
+        Totals: records, points upserted, failed points, elapsed seconds
+    """
+    _ensure_storage()
+    
+    start = time.perf_counter()
+    keys = _memory_store.keys()
+    records = upserted = failed = 0
+    for i in range(0, len(keys), chunk_size):
+        chunk = list(_memory_store.get_many(keys[i:i + chunk_size]).values())
+        records += len(chunk)
+        report = _index_knowledge(chunk)
+        if report is None:
+            failed += len(chunk)
+        else:
+            upserted += report["points"] - report["failed_points"]
+            failed += report["failed_points"]
+    
+    return {
+        "records": records,
+        "upserted": upserted,
+        "failed": failed,
+        "elapsed_s": round(time.perf_counter() - start, 2)
+    }
 
 
 def recall(key: str) -> Optional[dict]:
@@ -132,6 +285,54 @@ def recall(key: str) -> Optional[dict]:
     if record is None:
         return None
     
+    return _record_dict(record)
+
+
+def recall_many(keys: Iterable[str]) -> Dict[str, dict]:
+    """Retrieve many memories by exact key.
+    
+    Args:
+        keys: Memory identifiers
+    
+    Returns:
+        {key: memory} for each key found (same shape as recall())
+    """
+    _ensure_storage()
+    
+    found = _memory_store.get_many(keys)
+    return {key: _record_dict(record) for key, record in found.items()}
+
+
+def query(filter: dict = None, order_by: str = None,
+          limit: int = None) -> list:
+    """Find memories by metadata.
+    
+    Indexed with STORAGE_ENGINE=sqlite (type, status, company and
+    date_applied); other engines scan the store.
+    
+    Args:
+        filter: {field: value} for equality, or {field: {op: value}} with
+            op in eq, ne, lt, lte, gt, gte, in. Fields are metadata keys,
+            or key / created_at / updated_at.
+        order_by: Field to sort by, "-field" for descending
+        limit: Max results
+    
+    Returns:
+        Matching memories in the same shape as recall()
+    
+    Example:
+        >>> query({"type": "job_application", "status": "applied"},
+        ...       order_by="-date_applied", limit=10)
+    """
+    _ensure_storage()
+    
+    return [
+        _record_dict(record)
+        for record in _memory_store.query(filter, order_by, limit)
+    ]
+
+
+def _record_dict(record: MemoryRecord) -> dict:
     return {
         "key": record.key,
         "value": record.value,
@@ -141,12 +342,13 @@ def recall(key: str) -> Optional[dict]:
     }
 
 
-def cache_store(query: str, response: str, model: str = "unknown",
-                ttl: int = 86400) -> bool:
+def cache_store(query: Union[str, CacheKey], response: str,
+                model: str = "unknown", ttl: int = 86400) -> bool:
     """Cache an AI response for cost reduction.
     
     Args:
-        query: The original query text
+        query: The original query text, or a cache_key() (e.g. for a
+            prompt template - the key carries its own model)
         response: The AI response to cache
         model: Which model generated the response
         ttl: Time-to-live in seconds (default: 24 hours)
@@ -156,37 +358,22 @@ def cache_store(query: str, response: str, model: str = "unknown",
     """
     _ensure_storage()
     
-    query_hash = hash_text(query)
-    expires_at = datetime.now() + timedelta(seconds=ttl)
-    
-    cached = CachedResponse(
-        query_hash=query_hash,
-        query_text=query[:1000],  # Truncate for storage
-        response=response,
-        model=model,
-        expires_at=expires_at
-    )
-    
-    _cache_store[query_hash] = cached
-    _persist_cache()
+    key = _store_key(query, model)
+    cached = _make_cached(key, response, ttl)
+    _response_cache.put(cached)
     
     # Also store in vector DB for similarity search
     try:
         from secondbrain.storage.vector_store import get_store
         store = get_store()
         
-        vector = get_embedding(query)
+        vector = get_embedding(key.text)
         
         store.upsert(
             collection=store.COLLECTION_QUERIES,
-            id=query_hash,
+            id=cached.query_hash,
             vector=vector,
-            payload={
-                "query_text": cached.query_text,
-                "response": cached.response,
-                "model": cached.model,
-                "expires_at": expires_at.isoformat()
-            }
+            payload=_cached_payload(cached)
         )
     except Exception as e:
         print(f"Vector cache storage failed (non-critical): {e}")
@@ -194,56 +381,203 @@ def cache_store(query: str, response: str, model: str = "unknown",
     return True
 
 
-def cache_get(query: str, similarity_threshold: float = 0.90) -> Optional[str]:
+def cache_store_many(items: Iterable[tuple], ttl: int = 86400) -> int:
+    """Cache many responses with one persist, embedding pass and upsert.
+    
+    Args:
+        items: (query, response) or (query, response, model) tuples;
+            query may be a cache_key()
+        ttl: Time-to-live in seconds for every entry
+    
+    Returns:
+        Number of responses cached
+    """
+    _ensure_storage()
+    
+    keys, entries = [], []
+    for item in items:
+        key = _store_key(item[0], item[2] if len(item) > 2 else "unknown")
+        keys.append(key)
+        entries.append(_make_cached(key, item[1], ttl))
+    if not entries:
+        return 0
+    _response_cache.put_many(entries)
+    
+    try:
+        from secondbrain.storage.vector_store import get_store
+        store = get_store()
+        cfg = get_config()
+        
+        # Full text, as cache_store()/cache_get() embed (query_text is cut)
+        vectors = get_embeddings([key.text for key in keys])
+        store.upsert_batch(
+            collection=store.COLLECTION_QUERIES,
+            points=[
+                {"id": cached.query_hash, "vector": vector,
+                 "payload": _cached_payload(cached)}
+                for cached, vector in zip(entries, vectors)
+            ],
+            batch_size=cfg.VECTOR_BATCH_SIZE,
+            parallel=cfg.VECTOR_UPSERT_PARALLEL
+        )
+    except Exception as e:
+        print(f"Vector cache storage failed (non-critical): {e}")
+    
+    return len(entries)
+
+
+def cache_get(query: Union[str, CacheKey], similarity_threshold: float = 0.90,
+              model: Optional[str] = None,
+              fuzzy: Optional[bool] = None) -> Optional[str]:
     """Retrieve a cached response if similar enough.
     
+    Tries exact, normalized-text and near-duplicate (SimHash) matches
+    first; only if all miss does it embed the query and search Qdrant.
+    The vector search skips expired points server-side and fetches the
+    top CACHE_SEMANTIC_TOP_K matches, so one stale neighbour can't hide
+    a live one. Every tier stays within the key's template namespace.
+    
     Args:
-        query: The current query text
-        similarity_threshold: Minimum similarity score (0-1)
+        query: The current query text, or a cache_key()
+        similarity_threshold: Minimum similarity score (0-1); also caps
+            the near-duplicate tier's SimHash distance
+        model: Only accept answers generated by this model (None = any;
+            ignored for a cache_key(), which carries its own)
+        fuzzy: Also accept similar queries (normalized, near-duplicate
+            and semantic tiers); False = exact key only. Default: fuzzy
+            for free-form queries, exact for template keys
     
     Returns:
         Cached response if found and valid, else None
     """
     _ensure_storage()
     
-    query_hash = hash_text(query)
+    key = query if isinstance(query, CacheKey) else cache_key(query, model)
+    if fuzzy is None:
+        fuzzy = not key.templated
     
-    # First: Check exact match in local cache
-    cached = _cache_store.get(query_hash)
-    if cached:
-        if cached.expires_at and datetime.now() < cached.expires_at:
-            cached.hit_count += 1
-            _persist_cache()
-            return cached.response
-        else:
-            # Expired - remove it
-            del _cache_store[query_hash]
-            _persist_cache()
+    # First: Cheap local tiers
+    cached = _response_cache.lookup(key, similarity_threshold, fuzzy)
+    if cached is not None:
+        return cached.response
+    
+    # Exact-only lookup, or nothing cached at all - no point embedding
+    if not fuzzy or len(_response_cache) == 0:
+        _response_cache.skip("semantic")
+        return None
     
     # Second: Check vector similarity in Qdrant
+    start = time.perf_counter()
+    response = None
     try:
         from secondbrain.storage.vector_store import get_store
         store = get_store()
         
-        query_vector = get_embedding(query)
+        query_vector = get_embedding(key.text)
         results = store.search(
             collection=store.COLLECTION_QUERIES,
             vector=query_vector,
-            limit=1,
-            threshold=similarity_threshold
+            limit=get_config().CACHE_SEMANTIC_TOP_K,
+            threshold=similarity_threshold,
+            filter=_live_filter(key)
         )
-        
-        if results:
-            payload = results[0]["payload"]
-            expires_str = payload.get("expires_at")
-            
-            if expires_str:
-                expires = datetime.fromisoformat(expires_str)
-                if datetime.now() < expires:
-                    return payload.get("response")
+        response = _fresh_response(results)
     except Exception as e:
         print(f"Vector cache lookup failed (non-critical): {e}")
     
+    _response_cache.record(
+        "semantic", response is not None, time.perf_counter() - start
+    )
+    return response
+
+
+def cache_contains_many(queries: Iterable[Union[str, CacheKey]],
+                        model: str = "unknown") -> Set[str]:
+    """Which queries already have an entry under exactly their key.
+    
+    A membership check for bulk writers deciding what to skip: no lookup
+    tiers and no hit counting. Expired entries count until swept.
+    
+    Args:
+        queries: Queries or cache_key()s (with a model)
+        model: Model for plain-string queries
+    
+    Returns:
+        str() of the cache keys that are stored
+    """
+    _ensure_storage()
+    
+    keys = {str(_store_key(query, model)) for query in queries}
+    return {key for key in keys if key in _cache_store}
+
+
+def cache_clear(template: str) -> int:
+    """Drop every cached response for one prompt template.
+    
+    Args:
+        template: Template id (the key namespace)
+    
+    Returns:
+        Number of entries removed
+    """
+    _ensure_storage()
+    return _response_cache.clear_namespace(template)
+
+
+def _store_key(query: Union[str, CacheKey], model: str) -> CacheKey:
+    """Key to store under - always for a specific model."""
+    if not isinstance(query, CacheKey):
+        return cache_key(query, model)
+    if query.model is None:
+        raise ValueError("Cache keys need a model to store a response under")
+    return query
+
+
+def _make_cached(key: CacheKey, response: str, ttl: int) -> CachedResponse:
+    return CachedResponse(
+        query_hash=str(key),
+        query_text=key.text[:1000],  # Truncate for storage
+        response=response,
+        model=key.model,
+        # Fingerprints of the full text, not the truncated copy
+        similarity_hash=f"{simhash(key.text):016x}",
+        normalized_hash=key.normalized_hash,
+        namespace=key.namespace,
+        text_hash=key.text_hash,
+        expires_at=datetime.now() + timedelta(seconds=ttl)
+    )
+
+
+def _cached_payload(cached: CachedResponse) -> dict:
+    """Payload stored with a query vector."""
+    return {
+        "query_text": cached.query_text,
+        "response": cached.response,
+        "model": cached.model,
+        "namespace": cached.namespace,
+        # Epoch seconds, so Qdrant can range-filter on it
+        "expires_at": cached.expires_at.timestamp()
+    }
+
+
+def _live_filter(key: CacheKey) -> dict:
+    """Payload filter for unexpired query points in the key's scope."""
+    filter = {"expires_at": {"gt": time.time()}, "namespace": key.namespace}
+    if key.model is not None:
+        filter["model"] = key.model
+    return filter
+
+
+def _fresh_response(results: List[dict]) -> Optional[str]:
+    """Response for the best similarity match whose entry is still live.
+    
+    Checked against the cache store rather than the point's payload, so a
+    point left behind by an expired or evicted entry never answers.
+    """
+    for result in results:
+        cached = _response_cache.resolve(result["id"])
+        if cached is not None:
+            return cached.response
     return None
 
 
@@ -255,19 +589,17 @@ def get_cache_stats() -> dict:
     """
     _ensure_storage()
     
-    total = len(_cache_store)
-    hits = sum(c.hit_count for c in _cache_store.values())
-    expired = sum(
-        1 for c in _cache_store.values()
-        if c.expires_at and datetime.now() > c.expires_at
-    )
-    
-    return {
-        "total_cached": total,
-        "total_hits": hits,
-        "expired_entries": expired,
-        "active_entries": total - expired
+    # Running counters - cheap enough to poll every second
+    stats = _response_cache.totals()
+    # Capacity vs CACHE_MAX_ENTRIES / CACHE_MAX_MB, evictions
+    stats["usage"] = _response_cache.usage()
+    # This process's lookups, per tier (exact -> semantic)
+    stats["lookups"] = _response_cache.stats()
+    stats["recent"] = {
+        "1m": _response_cache.window(60),
+        "1h": _response_cache.window(3600)
     }
+    return stats
 
 
 def search_knowledge(query: str, limit: int = 5) -> list:
@@ -292,14 +624,18 @@ def search_knowledge(query: str, limit: int = 5) -> list:
             threshold=0.7
         )
         
-        return [
-            {
-                "key": r["payload"].get("key"),
-                "value": r["payload"].get("value"),
-                "score": r["score"]
-            }
-            for r in results
-        ]
+        return _knowledge_hits(results)
     except Exception as e:
         print(f"Knowledge search failed: {e}")
         return []
+
+
+def _knowledge_hits(results: List[dict]) -> list:
+    return [
+        {
+            "key": r["payload"].get("key"),
+            "value": r["payload"].get("value"),
+            "score": r["score"]
+        }
+        for r in results
+    ]
@@ -3,6 +3,11 @@
 Chat loggers and document processors.
 """
 
-from .chat_logger import ChatLogger, get_logger, log_interaction
+from .chat_logger import (
+    ChatLogger, close_logger, get_logger, iter_conversations, log_interaction
+)
+from .importer import import_chat_export
+from .ingest_queue import IngestQueue
 
-__all__ = ["ChatLogger", "get_logger", "log_interaction"]
+__all__ = ["ChatLogger", "IngestQueue", "close_logger", "get_logger",
+           "import_chat_export", "iter_conversations", "log_interaction"]
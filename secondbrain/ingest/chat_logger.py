@@ -1,46 +1,169 @@
 """Chat Logger
 
 Captures Kimi/Claude/ChatGPT interactions for caching and analysis.
+
+Conversations go to a segmented JSON Lines log (one file per day, split
+at CHAT_LOG_SEGMENT_MB), so logging appends one line. Stats never
+rescan it: per-day/per-hour rollups (saved beside the segments) answer
+get_stats(days), and the last 24h are also kept as running counters in
+one-minute buckets.
+
+Copying each exchange into the SecondBrain knowledge store (persist +
+embedding + Qdrant upsert) happens on a background ingest queue in
+batches of remember_many(), so log() doesn't wait on it. The queue is
+drained at exit; see close_logger().
 """
 
-import json
+import atexit
 import pickle
-from datetime import datetime
+import threading
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional
 
-from shared.utils.embeddings import hash_text, get_embedding
-from secondbrain.api.memory import cache_store, cache_get, remember
+from shared.config import get_config
+from shared.utils.embeddings import hash_text
+from secondbrain.api.memory import cache_get, remember_many
+from secondbrain.ingest.ingest_queue import IngestQueue
+from secondbrain.storage.segmented_log import SegmentedLog
+from secondbrain.storage.stats import DailyRollups, WindowedCounters
 
 # Storage - SEPARATE FROM CODE (gitignored)
 DATA_ROOT = Path("C:/ecosystem/data")
 STORAGE_ROOT = Path("C:/ecosystem/secondbrain/storage")
+CONVERSATIONS_DIR = DATA_ROOT / "memory" / "conversations"
+# Legacy single-pickle history, migrated into CONVERSATIONS_DIR
 CONVERSATIONS_FILE = DATA_ROOT / "memory" / "conversations.pkl"
 
-# In-memory conversations
-_conversations: List[dict] = []
+_log: Optional[SegmentedLog] = None
+_rollups: Optional[DailyRollups] = None
+_ingest: Optional[IngestQueue] = None
+# Serializes open/close - log() is called from many threads at once
+_storage_lock = threading.RLock()
+
+# Last 24h: "count", "cached", "cost" and per-model "count:<model>",
+# "cost:<model>"
+_recent = WindowedCounters(bucket_seconds=60, buckets=24 * 60)
 
 
 def _ensure_storage():
-    """Ensure storage directory exists and load persisted data."""
-    global _conversations
+    """Open the conversation log (migrating the legacy pickle once)."""
+    global _log, _rollups, _ingest
+    # _log is assigned last, so once it's set the rest is too
+    if _log is not None:
+        return
     
-    # Create data directories (gitignored, separate from code)
-    DATA_ROOT.mkdir(parents=True, exist_ok=True)
-    (DATA_ROOT / "memory").mkdir(exist_ok=True)
+    with _storage_lock:
+        if _log is not None:
+            return
+        
+        config = get_config()
+        
+        # Create data directories (gitignored, separate from code)
+        DATA_ROOT.mkdir(parents=True, exist_ok=True)
+        (DATA_ROOT / "memory").mkdir(exist_ok=True)
+        
+        log = SegmentedLog(
+            CONVERSATIONS_DIR,
+            max_bytes=int(config.CHAT_LOG_SEGMENT_MB * 1024 * 1024)
+        )
+        if CONVERSATIONS_FILE.exists() and not log.segments():
+            _migrate_pickle(log)
+        
+        _rollups = DailyRollups(log, _record_counts)
+        _recent.clear()
+        for record in log.read(since=datetime.now() - timedelta(days=1)):
+            _count(record)
+        
+        _ingest = IngestQueue(
+            remember_many,
+            max_size=config.CHAT_INGEST_QUEUE_SIZE,
+            batch_size=config.CHAT_INGEST_BATCH_SIZE,
+            flush_interval=config.CHAT_INGEST_FLUSH_INTERVAL,
+            name="chat-ingest"
+        )
+        _log = log
+        # Registered after memory's close_storage, so it runs first (LIFO)
+        atexit.register(close_logger)
+
+
+def close_logger():
+    """Drain the ingest queue into memory and close the log."""
+    global _log, _rollups, _ingest
+    
+    with _storage_lock:
+        if _ingest is not None:
+            _ingest.close()
+            _ingest = None
+        if _log is not None:
+            _log.close()
+            _log = None
+            _rollups = None
+
+
+def _migrate_pickle(log: SegmentedLog) -> None:
+    """Copy conversations.pkl into the segmented log, then retire it."""
+    try:
+        with open(CONVERSATIONS_FILE, "rb") as f:
+            conversations = pickle.load(f)
+    except Exception as e:
+        print(f"Conversation history migration failed (non-critical): {e}")
+        return
     
-    if CONVERSATIONS_FILE.exists():
-        try:
-            with open(CONVERSATIONS_FILE, "rb") as f:
-                _conversations = pickle.load(f)
-        except Exception:
-            _conversations = []
+    conversations.sort(key=lambda c: c["timestamp"])
+    log.append_many(conversations)
+    CONVERSATIONS_FILE.rename(
+        CONVERSATIONS_FILE.with_name(CONVERSATIONS_FILE.name + ".migrated")
+    )
+
+
+def _record_counts(record: dict) -> dict:
+    """Counter increments for one exchange."""
+    return {
+        "count": 1,
+        "cached": int(record["cached"]),
+        "cost": record["cost"],
+        f"count:{record['model']}": 1,
+        f"cost:{record['model']}": record["cost"]
+    }
+
+
+def _count(record: dict) -> None:
+    """Add one exchange to the running stats."""
+    counts = _record_counts(record)
+    at = record["timestamp"].timestamp()
+    for name, value in counts.items():
+        _recent.add(name, value, at=at)
 
 
-def _persist_conversations():
-    """Persist conversations to disk."""
-    with open(CONVERSATIONS_FILE, "wb") as f:
-        pickle.dump(_conversations, f)
+def _summarize(counts: dict) -> dict:
+    """Stats dict from counters (see _count)."""
+    total_count = int(counts.get("count", 0))
+    cached_count = int(counts.get("cached", 0))
+    total_cost = counts.get("cost", 0.0)
+    
+    # Cost savings from caching
+    avg_cost_per_call = total_cost / max(total_count - cached_count, 1)
+    savings = cached_count * avg_cost_per_call
+    
+    by_model = {}
+    for name, value in counts.items():
+        if name.startswith("count:"):
+            model = name[len("count:"):]
+            by_model[model] = {
+                "count": int(value),
+                "cost": counts.get(f"cost:{model}", 0.0)
+            }
+    
+    return {
+        "total_conversations": total_count,
+        "cached_responses": cached_count,
+        "api_calls": total_count - cached_count,
+        "total_cost_usd": round(total_cost, 4),
+        "estimated_savings_usd": round(savings, 4),
+        "cache_hit_rate": round(cached_count / max(total_count, 1), 2),
+        "by_model": by_model
+    }
 
 
 class ChatLogger:
@@ -64,6 +187,7 @@ class ChatLogger:
         Returns:
             Record ID of the logged entry
         """
+        _ensure_storage()
         record_id = hash_text(f"{datetime.now().isoformat()}:{query[:50]}")
         
         record = {
@@ -77,23 +201,25 @@ class ChatLogger:
             "cached": cached
         }
         
-        _conversations.append(record)
-        _persist_conversations()
+        _log.append(record)
+        _rollups.add(record)
+        _count(record)
         
-        # Store in SecondBrain memory for long-term reference
-        remember(
-            key=f"conversation:{record_id}",
-            value={
+        # Store in SecondBrain memory for long-term reference (queued;
+        # blocks only if the ingest queue is full)
+        _ingest.submit((
+            f"conversation:{record_id}",
+            {
                 "query": query[:500],
                 "response": response[:1000],
                 "model": model
             },
-            metadata={
+            {
                 "type": "conversation",
                 "model": model,
                 "has_cost": cost > 0
             }
-        )
+        ))
         
         return record_id
     
@@ -119,46 +245,48 @@ class ChatLogger:
         Returns:
             Stats dict
         """
-        from datetime import timedelta
-        
-        cutoff = datetime.now() - timedelta(days=days)
-        recent = [c for c in _conversations if c["timestamp"] > cutoff]
-        
-        total_cost = sum(c["cost"] for c in recent)
-        cached_count = sum(1 for c in recent if c["cached"])
-        total_count = len(recent)
-        
-        # Cost savings from caching
-        avg_cost_per_call = total_cost / max(total_count - cached_count, 1)
-        savings = cached_count * avg_cost_per_call
-        
-        return {
-            "period_days": days,
-            "total_conversations": total_count,
-            "cached_responses": cached_count,
-            "api_calls": total_count - cached_count,
-            "total_cost_usd": round(total_cost, 4),
-            "estimated_savings_usd": round(savings, 4),
-            "cache_hit_rate": round(cached_count / max(total_count, 1), 2),
-            "by_model": self._breakdown_by_model(recent)
-        }
+        _ensure_storage()
+        if days <= 1:
+            # Inside the running window (one-minute resolution)
+            counts = _recent.window(days * 86400)
+        else:
+            # Daily rollups (one-hour resolution at the window start)
+            counts = _rollups.window(datetime.now() - timedelta(days=days))
+        
+        return {"period_days": days, **_summarize(counts)}
     
-    def _breakdown_by_model(self, conversations: List[dict]) -> dict:
-        """Breakdown stats by model."""
-        breakdown = {}
-        for c in conversations:
-            model = c["model"]
-            if model not in breakdown:
-                breakdown[model] = {"count": 0, "cost": 0.0}
-            breakdown[model]["count"] += 1
-            breakdown[model]["cost"] += c["cost"]
-        return breakdown
+    def get_recent_stats(self, minutes: int = 60) -> dict:
+        """Stats for the last few minutes/hours, from running counters.
+        
+        Args:
+            minutes: Lookback period (up to 24h, one-minute resolution)
+        
+        Returns:
+            Stats dict
+        """
+        return {"period_minutes": minutes,
+                **_summarize(_recent.window(minutes * 60))}
 
 
 # Global instance
 _logger: Optional[ChatLogger] = None
 
 
+def iter_conversations(since: Optional[datetime] = None,
+                       until: Optional[datetime] = None):
+    """Stream logged conversations in time order.
+    
+    Args:
+        since: Only records after this time
+        until: Only records up to this time
+    
+    Yields:
+        Conversation record dicts
+    """
+    _ensure_storage()
+    return _log.read(since, until)
+
+
 def get_logger() -> ChatLogger:
     """Get or create the global chat logger."""
     global _logger
@@ -0,0 +1,405 @@
+"""Chat History Importer
+
+Seeds the response cache and the knowledge store from ChatGPT, Claude
+and Kimi data exports, so questions already answered elsewhere become
+cache hits instead of paid calls.
+
+    - Streaming: the export is parsed one conversation at a time with
+      JSONDecoder.raw_decode over a growing read buffer, so a
+      multi-hundred-MB conversations.json never has to fit in memory
+    - Deduped: a turn is skipped when its cache key (query + model) was
+      already seen in this run or is already in the cache
+      (cache_contains_many, one call per conversation)
+    - Parallel: batches go to worker threads that call remember_many()
+      and cache_store_many() (embedding + Qdrant upsert per batch)
+    - Resumable: the byte offset after the last fully written batch is
+      checkpointed under DATA_ROOT/imports; rerunning continues from it
+
+Formats (detected per conversation):
+    chatgpt  {"mapping": {...}, "current_node": ...}   conversations.json
+    claude   {"chat_messages": [{"sender", "text"}]}   conversations.json
+    kimi     {"messages": [{"role", "content"}]}       also any chat-style
+                                                       JSON/JSONL export
+
+Usage:
+    >>> from secondbrain.ingest.importer import import_chat_export
+    >>> import_chat_export("Downloads/conversations.json", workers=4)
+"""
+
+import codecs
+import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from shared.utils.embeddings import hash_text
+from secondbrain.api import memory
+from secondbrain.storage.cache_key import cache_key
+
+SOURCES = ("auto", "chatgpt", "claude", "kimi")
+
+# (query, response, model, timestamp)
+Turn = Tuple[str, str, str, Optional[datetime]]
+
+_SEPARATORS = " \t\r\n,[]\ufeff"
+
+
+# ---- streaming JSON -------------------------------------------------------
+
+def iter_json_items(path: Path, start: int = 0,
+                    chunk_size: int = 1 << 20) -> Iterator[Tuple[object, int]]:
+    """Stream the items of a JSON array (or JSON Lines) file.
+
+    Args:
+        path: Export file
+        start: Byte offset to resume from (an offset this function yielded)
+        chunk_size: Bytes read at a time
+
+    Yields:
+        (item, byte offset just past the item)
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    with open(path, "rb") as f:
+        f.seek(start)
+        buf, pos, offset, eof = "", 0, start, False
+        while True:
+            while pos < len(buf) and buf[pos] in _SEPARATORS:
+                pos += 1
+            if pos < len(buf):
+                try:
+                    item, end = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                    item = None
+                else:
+                    offset += len(buf[:end].encode())
+                    buf, pos = buf[end:], 0
+                    yield item, offset
+                    continue
+            elif eof:
+                return
+            # Need more text; read at least as much as is buffered so a
+            # huge item is re-parsed O(log n) times, not once per chunk
+            data = f.read(max(chunk_size, len(buf)))
+            eof = not data
+            buf += utf8.decode(data, final=eof)
+
+
+# ---- export formats -------------------------------------------------------
+
+def _text(content) -> str:
+    """Flatten string / parts / content-block message bodies."""
+    if content is None:
+        return ""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, dict):
+        if "parts" in content:
+            return _text(content["parts"])
+        return content.get("text") or ""
+    if isinstance(content, list):
+        return "\n".join(filter(None, (_text(part) for part in content)))
+    return ""
+
+
+def _timestamp(value) -> Optional[datetime]:
+    if value is None:
+        return None
+    try:
+        if isinstance(value, (int, float)):
+            return datetime.fromtimestamp(value)
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except (ValueError, OverflowError, OSError):
+        return None
+
+
+def _chatgpt_messages(conversation: dict) -> List[Tuple[str, str, str, object]]:
+    """Messages on the conversation's current branch, oldest first."""
+    mapping = conversation.get("mapping") or {}
+    node_id = conversation.get("current_node")
+    if node_id not in mapping:
+        # No current_node - fall back to the newest leaf
+        leaves = [k for k, n in mapping.items() if not n.get("children")]
+        node_id = leaves[-1] if leaves else None
+
+    chain = []
+    while node_id in mapping:
+        node = mapping[node_id]
+        message = node.get("message")
+        if message:
+            chain.append((
+                (message.get("author") or {}).get("role", ""),
+                _text(message.get("content")),
+                (message.get("metadata") or {}).get("model_slug") or "chatgpt",
+                message.get("create_time")
+            ))
+        node_id = node.get("parent")
+    chain.reverse()
+    return chain
+
+
+def _claude_messages(conversation: dict):
+    return [
+        ("user" if m.get("sender") == "human" else m.get("sender", ""),
+         m.get("text") or _text(m.get("content")),
+         conversation.get("model") or "claude",
+         m.get("created_at"))
+        for m in conversation.get("chat_messages") or []
+    ]
+
+
+def _generic_messages(conversation: dict, default_model: str):
+    return [
+        (m.get("role") or m.get("sender") or "",
+         _text(m.get("content") if "content" in m else m.get("text")),
+         m.get("model") or conversation.get("model") or default_model,
+         m.get("created_at") or m.get("timestamp") or m.get("create_time"))
+        for m in conversation.get("messages") or []
+        if isinstance(m, dict)
+    ]
+
+
+def detect_source(conversation: dict) -> Optional[str]:
+    """Export format of one conversation object, or None."""
+    if not isinstance(conversation, dict):
+        return None
+    if "mapping" in conversation:
+        return "chatgpt"
+    if "chat_messages" in conversation:
+        return "claude"
+    if "messages" in conversation:
+        return "kimi"
+    return None
+
+
+def conversation_turns(conversation: dict, source: str = "auto") -> List[Turn]:
+    """(query, response, model, timestamp) pairs from one conversation.
+
+    A user message followed by one or more assistant messages makes a
+    turn; system/tool messages and unanswered prompts are dropped.
+    """
+    if not isinstance(conversation, dict):
+        return []
+    if source == "auto":
+        source = detect_source(conversation)
+    if source == "chatgpt":
+        messages = _chatgpt_messages(conversation)
+    elif source == "claude":
+        messages = _claude_messages(conversation)
+    elif source == "kimi":
+        messages = _generic_messages(conversation, "kimi")
+    else:
+        return []
+
+    turns = []
+    query = None
+    answer: List[str] = []
+    model, started = source, None
+    for role, text, message_model, created in messages:
+        if role in ("user", "human"):
+            if query and answer:
+                turns.append((query, "\n".join(answer), model, started))
+            query, answer, started = text.strip(), [], _timestamp(created)
+        elif role == "assistant" and query and text.strip():
+            answer.append(text.strip())
+            model = message_model
+    if query and answer:
+        turns.append((query, "\n".join(answer), model, started))
+    return turns
+
+
+# ---- checkpoints ----------------------------------------------------------
+
+def _checkpoint_path(path: Path) -> Path:
+    name = f"{path.stem}.{hash_text(str(path.resolve()))}.json"
+    return memory.DATA_ROOT / "imports" / name
+
+
+def _load_checkpoint(checkpoint: Path, path: Path) -> Optional[dict]:
+    """Saved progress, if it belongs to this exact file version."""
+    if not checkpoint.exists():
+        return None
+    try:
+        with open(checkpoint) as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return None
+    stat = path.stat()
+    if saved.get("size") != stat.st_size or saved.get("mtime") != stat.st_mtime:
+        return None
+    return saved
+
+
+def _save_checkpoint(checkpoint: Path, path: Path, report: dict) -> None:
+    stat = path.stat()
+    checkpoint.parent.mkdir(parents=True, exist_ok=True)
+    tmp = checkpoint.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump({"path": str(path), "size": stat.st_size,
+                   "mtime": stat.st_mtime, **report}, f)
+    tmp.replace(checkpoint)
+
+
+# ---- import ---------------------------------------------------------------
+
+def _write_batch(turns: List[Tuple[str, Turn]], ttl: int) -> None:
+    """Knowledge first, then cache: a cached query implies both landed."""
+    memory.remember_many(
+        (
+            f"import:{source}:{hash_text(query + response)}",
+            {"query": query[:500], "response": response[:1000], "model": model},
+            {
+                "type": "conversation",
+                "source": source,
+                "model": model,
+                "imported": True,
+                "timestamp": started.isoformat() if started else None
+            }
+        )
+        for source, (query, response, model, started) in turns
+    )
+    memory.cache_store_many(
+        [(query, response, model)
+         for _, (query, response, model, _) in turns],
+        ttl=ttl
+    )
+
+
+def import_chat_export(path, source: str = "auto", workers: int = 4,
+                       batch_size: int = 256, ttl: int = 90 * 86400,
+                       resume: bool = True,
+                       progress: Optional[Callable[[dict], None]] = None,
+                       progress_interval: float = 5.0) -> dict:
+    """Import a chat export into the cache and knowledge store.
+
+    Args:
+        path: conversations.json (array) or a JSON Lines export
+        source: "auto", "chatgpt", "claude" or "kimi"
+        workers: Batches written concurrently
+        batch_size: Turns per remember_many()/cache_store_many() call
+        ttl: Cache time-to-live for imported responses (seconds)
+        resume: Continue from the last checkpoint for this file
+        progress: Called with the running report every progress_interval s
+        progress_interval: Seconds between progress calls
+
+    Returns:
+        Report: bytes, conversations, turns, duplicates, written, failed,
+        elapsed_s, and whether the run resumed. Counts cover this run
+        only: a resumed run starts at the checkpoint, and turns written
+        past it before an interruption are counted as duplicates
+    """
+    if source not in SOURCES:
+        raise ValueError(
+            f"Unknown source {source!r} (expected one of {', '.join(SOURCES)})"
+        )
+    path = Path(path)
+
+    checkpoint = _checkpoint_path(path)
+    saved = _load_checkpoint(checkpoint, path) if resume else None
+    report = {
+        "bytes_total": path.stat().st_size,
+        "bytes_done": saved["bytes_done"] if saved else 0,
+        # Counted from the resume point
+        "conversations": 0,
+        "turns": 0,
+        "duplicates": 0,
+        "written": 0,
+        "failed": 0,
+        "resumed": saved is not None
+    }
+    start = time.perf_counter()
+    last_progress = start
+
+    # Batch sequence numbers -> byte offset after the batch's last
+    # conversation; the checkpoint only advances past contiguous successes
+    lock = threading.Lock()
+    ends = {}
+    done = set()
+    failed_seq: Optional[int] = None
+    next_commit = 0
+
+    def finished(seq: int, count: int, ok: bool) -> None:
+        nonlocal next_commit, failed_seq
+        with lock:
+            if ok:
+                report["written"] += count
+                done.add(seq)
+            else:
+                report["failed"] += count
+                failed_seq = seq if failed_seq is None else min(failed_seq, seq)
+            advanced = False
+            while next_commit in done and (failed_seq is None
+                                           or next_commit < failed_seq):
+                report["bytes_done"] = ends.pop(next_commit)
+                done.discard(next_commit)
+                next_commit += 1
+                advanced = True
+            if advanced:
+                _save_checkpoint(checkpoint, path, report)
+
+    def run(seq: int, batch: List[Tuple[str, Turn]]) -> None:
+        try:
+            _write_batch(batch, ttl)
+        except Exception as e:
+            print(f"Import batch failed (non-critical): {e}")
+            finished(seq, len(batch), False)
+        else:
+            finished(seq, len(batch), True)
+
+    seen = set()
+    batch: List[Tuple[str, Turn]] = []
+    seq = 0
+    pending = set()
+    with ThreadPoolExecutor(max_workers=max(workers, 1),
+                            thread_name_prefix="chat-import") as pool:
+
+        def submit(offset: int) -> None:
+            nonlocal batch, seq
+            with lock:
+                ends[seq] = offset
+            if batch:
+                # Bounded in-flight work keeps memory flat on huge exports
+                while len(pending) >= 2 * max(workers, 1):
+                    pending.difference_update(
+                        wait(pending, return_when=FIRST_COMPLETED).done
+                    )
+                pending.add(pool.submit(run, seq, batch))
+            else:
+                finished(seq, 0, True)
+            batch = []
+            seq += 1
+
+        offset = report["bytes_done"]
+        for conversation, offset in iter_json_items(path, start=offset):
+            report["conversations"] += 1
+            kind = detect_source(conversation) if source == "auto" else source
+            turns = conversation_turns(conversation, kind or "auto")
+            keys = [cache_key(query, model) for query, _, model, _ in turns]
+            cached = memory.cache_contains_many(keys)
+            for key, turn in zip(keys, turns):
+                report["turns"] += 1
+                query_hash = str(key)
+                if query_hash in seen or query_hash in cached:
+                    report["duplicates"] += 1
+                    continue
+                seen.add(query_hash)
+                batch.append((kind, turn))
+            if len(batch) >= batch_size:
+                submit(offset)
+
+            now = time.perf_counter()
+            if progress is not None and now - last_progress >= progress_interval:
+                last_progress = now
+                with lock:
+                    progress({**report, "bytes_read": offset,
+                              "elapsed_s": round(now - start, 1)})
+        submit(offset)
+        wait(pending)
+
+    report["elapsed_s"] = round(time.perf_counter() - start, 2)
+    return report
@@ -0,0 +1,127 @@
+"""Ingest Queue
+
+Bounded background queue that batches items into a sink (e.g.
+remember_many), so producers like ChatLogger.log() return without
+waiting on the store, the embedding model or Qdrant.
+
+    - Bounded: when the queue is full, submit() blocks the producer
+      (backpressure) instead of letting memory grow
+    - Batched: the worker drains up to ``batch_size`` items per sink call,
+      waiting at most ``flush_interval`` seconds to fill a batch
+    - Drained on exit: close() (registered with atexit by the owner)
+      stops intake and writes everything still queued
+
+Usage:
+    >>> q = IngestQueue(remember_many, max_size=10000, batch_size=64)
+    >>> q.submit(("conversation:abc", value, metadata))
+    >>> q.flush()   # wait until everything submitted so far is written
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Callable, List, Optional
+
+_STOP = object()
+
+
+class IngestQueue:
+    """Bounded queue drained in batches by a background thread.
+
+    Args:
+        sink: Called with a list of items; failures are logged, not raised
+        max_size: Queue capacity before submit() blocks
+        batch_size: Max items per sink call
+        flush_interval: Max seconds an item waits for its batch to fill
+        name: Worker thread name
+    """
+
+    def __init__(self, sink: Callable[[List[Any]], Any], max_size: int = 10000,
+                 batch_size: int = 64, flush_interval: float = 2.0,
+                 name: str = "ingest-queue"):
+        self.sink = sink
+        self.batch_size = max(batch_size, 1)
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_size)
+        self._closed = False
+        self.submitted = 0
+        self.written = 0
+        self.failed = 0
+        self._worker = threading.Thread(target=self._run, name=name, daemon=True)
+        self._worker.start()
+
+    def submit(self, item: Any, timeout: Optional[float] = None) -> bool:
+        """Queue an item, blocking while the queue is full.
+
+        Args:
+            item: Passed to the sink as part of a batch
+            timeout: Max seconds to wait for room (None = wait)
+
+        Returns:
+            False if the queue is closed or stayed full past ``timeout``
+        """
+        if self._closed:
+            return False
+        try:
+            self._queue.put(item, timeout=timeout)
+        except queue.Full:
+            return False
+        self.submitted += 1
+        return True
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(
+                        timeout=max(deadline - time.monotonic(), 0)
+                    )
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            self._write(batch)
+            for _ in range(len(batch) + stop):
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, batch: List[Any]) -> None:
+        try:
+            self.sink(batch)
+            self.written += len(batch)
+        except Exception as e:
+            self.failed += len(batch)
+            print(f"Background ingest failed (non-critical): {e}")
+
+    def flush(self) -> None:
+        """Block until every item submitted so far has been written."""
+        self._queue.join()
+
+    def close(self, timeout: Optional[float] = 30.0) -> None:
+        """Stop intake, write what is queued, and stop the worker."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._worker.join(timeout=timeout)
+
+    def __len__(self) -> int:
+        return self._queue.qsize()
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "submitted": self.submitted,
+            "written": self.written,
+            "failed": self.failed
+        }
@@ -4,5 +4,10 @@ Qdrant vector database and file storage.
 """
 
 from .vector_store import VectorStore, get_store
+from .local_index import LocalVectorStore
+from .async_vector_store import AsyncVectorStore, get_async_store
 
-__all__ = ["VectorStore", "get_store"]
+__all__ = [
+    "VectorStore", "LocalVectorStore", "AsyncVectorStore",
+    "get_store", "get_async_store"
+]
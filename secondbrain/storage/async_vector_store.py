@@ -0,0 +1,166 @@
+"""Async Vector Store
+
+asyncio counterpart of VectorStore for the Telegram bot's event loop.
+Talks to Qdrant through AsyncQdrantClient with the same key -> UUID point
+mapping as VectorStore. When the sync store fell back to the local index,
+calls run on the default thread pool instead (the index is in-process, so
+that's a short CPU hop, not a blocked network call).
+"""
+
+import asyncio
+import weakref
+from typing import Any, Dict, List, Optional
+
+from shared.utils.vectors import VectorLike, to_list
+from .vector_store import VectorStore, get_store, point_id, qdrant_filter
+
+
+class AsyncVectorStore:
+    """Async Qdrant-based vector storage (same methods as VectorStore).
+
+    Args:
+        host: Qdrant host
+        port: Qdrant HTTP port
+        location: Passed to AsyncQdrantClient instead of host/port
+            (e.g. ":memory:" for tests)
+    """
+
+    COLLECTION_QUERIES = VectorStore.COLLECTION_QUERIES
+    COLLECTION_DOCUMENTS = VectorStore.COLLECTION_DOCUMENTS
+    COLLECTION_KNOWLEDGE = VectorStore.COLLECTION_KNOWLEDGE
+
+    def __init__(self, host: str = "localhost", port: int = 6333,
+                 location: Optional[str] = None):
+        from qdrant_client import AsyncQdrantClient
+        if location is not None:
+            self._client = AsyncQdrantClient(location=location)
+        else:
+            self._client = AsyncQdrantClient(host=host, port=port)
+
+    async def upsert(self, collection: str, id: str, vector: VectorLike,
+                     payload: Dict[str, Any]) -> bool:
+        """Store a vector with metadata."""
+        return await self.upsert_many(
+            collection, [{"id": id, "vector": vector, "payload": payload}]
+        )
+
+    async def upsert_many(self, collection: str, points: List[dict]) -> bool:
+        """Store many vectors in one request."""
+        if not points:
+            return True
+        try:
+            await self._client.upsert(
+                collection_name=collection,
+                points=[
+                    VectorStore._point(p["id"], p["vector"], p["payload"])
+                    for p in points
+                ]
+            )
+            return True
+        except Exception as e:
+            print(f"Failed to upsert {len(points)} points: {e}")
+            return False
+
+    async def search(self, collection: str, vector: VectorLike,
+                     limit: int = 5, threshold: float = 0.0,
+                     filter: Optional[dict] = None) -> List[dict]:
+        """Search for similar vectors (see VectorStore.search)."""
+        try:
+            response = await self._client.query_points(
+                collection_name=collection,
+                query=to_list(vector),
+                query_filter=qdrant_filter(filter),
+                limit=limit,
+                score_threshold=threshold,
+                with_payload=True
+            )
+            return [VectorStore._result(r, r.score) for r in response.points]
+        except Exception as e:
+            print(f"Search failed: {e}")
+            return []
+
+    async def get(self, collection: str, key: Any) -> Optional[dict]:
+        """Fetch one point by its original key."""
+        return (await self.get_many(collection, [key])).get(key)
+
+    async def get_many(self, collection: str,
+                       keys: List[Any]) -> Dict[Any, dict]:
+        """Fetch points by original key (no similarity search)."""
+        if not keys:
+            return {}
+        try:
+            points = await self._client.retrieve(
+                collection_name=collection,
+                ids=[point_id(k) for k in keys],
+                with_payload=True,
+                with_vectors=False
+            )
+            results = (VectorStore._result(p) for p in points)
+            return {r["id"]: r for r in results}
+        except Exception as e:
+            print(f"Retrieve failed: {e}")
+            return {}
+
+    async def delete_many(self, collection: str, ids: List[str]) -> bool:
+        """Delete many vectors in one request."""
+        if not ids:
+            return True
+        try:
+            from qdrant_client.models import PointIdsList
+            await self._client.delete(
+                collection_name=collection,
+                points_selector=PointIdsList(points=[point_id(i) for i in ids])
+            )
+            return True
+        except Exception as e:
+            print(f"Delete failed: {e}")
+            return False
+
+    async def delete(self, collection: str, id: str) -> bool:
+        """Delete a vector by ID."""
+        return await self.delete_many(collection, [id])
+
+    async def close(self) -> None:
+        await self._client.close()
+
+
+class _ThreadedStore:
+    """Async facade over a sync store (the local index)."""
+
+    def __init__(self, store: VectorStore):
+        self._store = store
+        self.COLLECTION_QUERIES = store.COLLECTION_QUERIES
+        self.COLLECTION_DOCUMENTS = store.COLLECTION_DOCUMENTS
+        self.COLLECTION_KNOWLEDGE = store.COLLECTION_KNOWLEDGE
+
+    def __getattr__(self, name):
+        method = getattr(self._store, name)
+
+        async def call(*args, **kwargs):
+            return await asyncio.to_thread(method, *args, **kwargs)
+        return call
+
+    async def close(self) -> None:
+        pass
+
+
+# One store per event loop (AsyncQdrantClient is bound to its loop)
+_stores: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+async def get_async_store():
+    """Get or create the async vector store for the running event loop.
+
+    Uses the backend get_store() picked (it also creates the collections),
+    so sync and async code always read and write the same index.
+    """
+    loop = asyncio.get_running_loop()
+    store = _stores.get(loop)
+    if store is None:
+        sync_store = await asyncio.to_thread(get_store)
+        if type(sync_store) is VectorStore:
+            store = AsyncVectorStore(sync_store.host, sync_store.port)
+        else:
+            store = _ThreadedStore(sync_store)
+        _stores[loop] = store
+    return store
@@ -0,0 +1,112 @@
+"""Cache Keys
+
+Structured keys for the response cache. An entry is keyed by what
+actually determines the answer:
+
+    model       Model that generated the response
+    template    Prompt template id (None for free-form queries)
+    variables   The template's variable part, whitespace-normalized
+
+The engine key is "<namespace>:<sha256>": the namespace is the template
+id ("query" for free-form text) and the digest is the full SHA-256 of
+the canonical (model, template, variables) tuple. Two models answering
+the same prompt get separate entries, and a templated prompt is cached
+by its variables alone - the fixed instructions around them don't make
+every call unique. Give a template a new id (e.g. "job_analysis:v2")
+when its text changes, so old answers aren't reused.
+
+Lookups without a model (``model=None``) accept an entry from any model.
+Templated keys are looked up exactly by default: their variables are
+what differ between calls (another company, another posting), so a
+"similar" entry is usually a different answer.
+
+Usage:
+    >>> key = cache_key("What is Python?", model="kimi-k2")
+    >>> key = cache_key(template="job_analysis:v1", model=MODEL_ID,
+    ...                 variables={"title": title, "description": text})
+    >>> str(key)
+    'job_analysis:v1:3b4c...'
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from .near_duplicate import normalize_text
+
+# Namespace of free-form (untemplated) queries
+QUERY_NAMESPACE = "query"
+
+
+def digest(text: str) -> str:
+    """Full-width SHA-256 hex digest."""
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _normalize_value(value: Any) -> Any:
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, dict):
+        return {str(k): _normalize_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize_value(v) for v in value]
+    return value
+
+
+@dataclass(frozen=True)
+class CacheKey:
+    """A response cache key - build with cache_key()."""
+    namespace: str
+    model: Optional[str]
+    text: str           # Query, or rendered variables (fuzzy tiers, embedding)
+    digest: str         # Model + template + variables
+    text_hash: str      # Template + variables, any model
+    normalized_hash: str
+
+    def __str__(self) -> str:
+        return f"{self.namespace}:{self.digest}"
+
+    @property
+    def templated(self) -> bool:
+        """Built from a template (exact-key lookups by default)."""
+        return self.namespace != QUERY_NAMESPACE
+
+
+def cache_key(query: Optional[str] = None, model: Optional[str] = None,
+              template: Optional[str] = None,
+              variables: Optional[dict] = None) -> CacheKey:
+    """Build a structured cache key.
+
+    Args:
+        query: Free-form query text (when there is no template)
+        model: Model that answers (None = any model, lookups only)
+        template: Prompt template id; the key's namespace
+        variables: Values filled into the template
+
+    Returns:
+        CacheKey; str(key) is the engine key
+    """
+    if template is None:
+        if query is None:
+            raise ValueError("cache_key() needs a query or a template")
+        namespace, text, payload = QUERY_NAMESPACE, query, query
+    else:
+        if template == QUERY_NAMESPACE:
+            raise ValueError(f"{QUERY_NAMESPACE!r} is reserved for free-form queries")
+        normalized = _normalize_value(variables or {})
+        payload = json.dumps(normalized, sort_keys=True, ensure_ascii=False,
+                             separators=(",", ":"), default=str)
+        text = "\n".join(
+            f"{name}: {value}" for name, value in sorted(normalized.items())
+        )
+        namespace = template
+
+    return CacheKey(
+        namespace=namespace,
+        model=model,
+        text=text,
+        digest=digest(json.dumps([model, template, payload])),
+        text_hash=digest(json.dumps([template, payload])),
+        normalized_hash=digest(normalize_text(text))
+    )
@@ -0,0 +1,275 @@
+"""Record Codec
+
+Versioned, pickle-free serialization for storage engine records
+(log frames, snapshots, SQLite values).
+
+Blob layout:
+    b"SB"            Magic
+    format (1 byte)  1 = MessagePack, 2 = JSON
+    version (1 byte) SCHEMA_VERSION the body was written with
+    body             Encoded plain tree (dicts, lists, str, numbers)
+
+Records become tagged dicts - {"__type__": "MemoryRecord", <fields>} -
+and are rebuilt field by field: fields a record no longer has are
+dropped and new fields take their defaults, so schema changes don't
+break old stores. Only the types in RECORD_TYPES are ever constructed,
+so loading a store can't run arbitrary code the way unpickling can.
+
+Storable values round-trip to an equal value of the same type:
+    None, bool, int, float, str, bytes, list, tuple, set, frozenset,
+    dict (any storable keys), datetime, date, Decimal, pathlib paths,
+    array.array, numpy scalars, the RECORD_TYPES and ENUM_TYPES.
+bytearray comes back as bytes and PurePath subclasses as Path. Anything
+else raises TypeError when written, so a value that reads back fine
+in-process can't change shape after a reload.
+
+MessagePack is used when the msgpack package is installed
+(STORAGE_FORMAT=auto), JSON otherwise. Legacy pickles are read only
+when ``allow_pickle=True`` (migration of pre-existing stores).
+
+Usage:
+    >>> blob = dumps(record)
+    >>> loads(blob) == record
+"""
+
+import base64
+import json
+import pickle
+from array import array
+from dataclasses import fields, is_dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from functools import lru_cache
+from pathlib import Path, PurePath
+from typing import Any, Optional
+
+from shared.models.schemas import (
+    CachedResponse, ChatMessage, Conversation, MemoryRecord, MessageRole,
+    SkillResult, VectorDocument
+)
+
+MAGIC = b"SB"
+FORMAT_MSGPACK = 1
+FORMAT_JSON = 2
+FORMATS = {"msgpack": FORMAT_MSGPACK, "json": FORMAT_JSON}
+
+# Bump when a record type changes incompatibly and add a step to _MIGRATIONS
+SCHEMA_VERSION = 2
+
+RECORD_TYPES = {
+    cls.__name__: cls
+    for cls in (MemoryRecord, CachedResponse, ChatMessage, Conversation,
+                VectorDocument, SkillResult)
+}
+ENUM_TYPES = {cls.__name__: cls for cls in (MessageRole,)}
+
+# Tags of encoded values; a dict using one as a key is stored as __map__
+_TAGS = frozenset((
+    "__type__", "__dt__", "__date__", "__enum__", "__array__", "__bytes__",
+    "__set__", "__frozenset__", "__tuple__", "__map__", "__decimal__",
+    "__path__", "__numpy__"
+))
+
+# version -> function upgrading a plain tree written with that version
+_MIGRATIONS = {
+    # v2 added the __tuple__/__map__/__decimal__/__path__/__numpy__ tags;
+    # v1 trees never contain them
+    1: lambda plain: plain,
+}
+
+
+class CodecError(ValueError):
+    """Blob is not a readable record (corrupt, too new, or a pickle)."""
+
+
+def is_pickle(blob: bytes) -> bool:
+    """True for a legacy pickle (protocol 2+ starts with PROTO)."""
+    return blob[:1] == b"\x80"
+
+
+@lru_cache(maxsize=None)
+def _msgpack():
+    # Optional dependency, imported once
+    try:
+        import msgpack
+        return msgpack
+    except ImportError:
+        return None
+
+
+def default_format() -> int:
+    """Format for new writes, from STORAGE_FORMAT (auto/msgpack/json)."""
+    from shared.config import get_config
+
+    name = get_config().STORAGE_FORMAT
+    if name == "auto":
+        return FORMAT_MSGPACK if _msgpack() is not None else FORMAT_JSON
+    if name not in FORMATS:
+        raise ValueError(
+            f"Unknown STORAGE_FORMAT {name!r} (expected auto, msgpack or json)"
+        )
+    return FORMATS[name]
+
+
+# ---- plain trees ----------------------------------------------------------
+
+def _is_numpy_scalar(value: Any) -> bool:
+    # Checked by module so numpy is never imported just to store a record
+    return (type(value).__module__ == "numpy" and hasattr(value, "dtype")
+            and getattr(value, "ndim", None) == 0)
+
+
+def to_plain(value: Any) -> Any:
+    """Convert a record (or any stored value) to JSON/msgpack types.
+
+    Raises:
+        TypeError: Not one of the storable types (see module docstring)
+    """
+    # Exact types: subclasses (numpy.float64, str enums) would come back
+    # as the base type, so they go through the checks below
+    if value is None or type(value) in (str, int, float, bool):
+        return value
+    if isinstance(value, dict):
+        if all(type(k) is str and k not in _TAGS for k in value):
+            return {k: to_plain(v) for k, v in value.items()}
+        return {"__map__": [[to_plain(k), to_plain(v)]
+                            for k, v in value.items()]}
+    if isinstance(value, list):
+        return [to_plain(v) for v in value]
+    if isinstance(value, tuple):
+        return {"__tuple__": [to_plain(v) for v in value]}
+    if isinstance(value, datetime):
+        return {"__dt__": value.isoformat()}
+    if isinstance(value, date):
+        return {"__date__": value.isoformat()}
+    if isinstance(value, Enum) and type(value).__name__ in ENUM_TYPES:
+        return {"__enum__": type(value).__name__, "value": value.value}
+    if is_dataclass(value) and type(value).__name__ in RECORD_TYPES:
+        plain = {f.name: to_plain(getattr(value, f.name)) for f in fields(value)}
+        plain["__type__"] = type(value).__name__
+        return plain
+    if isinstance(value, array):
+        return {"__array__": value.typecode,
+                "data": base64.b64encode(value.tobytes()).decode()}
+    if isinstance(value, (bytes, bytearray)):
+        return {"__bytes__": base64.b64encode(bytes(value)).decode()}
+    if isinstance(value, frozenset):
+        return {"__frozenset__": [to_plain(v) for v in value]}
+    if isinstance(value, set):
+        return {"__set__": [to_plain(v) for v in value]}
+    if isinstance(value, Decimal):
+        return {"__decimal__": str(value)}
+    if isinstance(value, PurePath):
+        return {"__path__": str(value)}
+    if _is_numpy_scalar(value):
+        return {"__numpy__": value.dtype.str, "value": to_plain(value.item())}
+    raise TypeError(
+        f"Cannot store {type(value).__name__} values; use plain data "
+        f"or one of {', '.join(RECORD_TYPES)}"
+    )
+
+
+def from_plain(value: Any) -> Any:
+    """Inverse of to_plain()."""
+    if isinstance(value, list):
+        return [from_plain(v) for v in value]
+    if not isinstance(value, dict):
+        return value
+    if "__type__" in value:
+        cls = RECORD_TYPES.get(value["__type__"])
+        if cls is None:
+            raise CodecError(f"Unknown record type {value['__type__']!r}")
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: from_plain(v) for k, v in value.items() if k in known})
+    if "__dt__" in value:
+        return datetime.fromisoformat(value["__dt__"])
+    if "__date__" in value:
+        return date.fromisoformat(value["__date__"])
+    if "__enum__" in value:
+        return ENUM_TYPES[value["__enum__"]](value["value"])
+    if "__array__" in value:
+        return array(value["__array__"], base64.b64decode(value["data"]))
+    if "__bytes__" in value:
+        return base64.b64decode(value["__bytes__"])
+    if "__set__" in value:
+        return set(from_plain(value["__set__"]))
+    if "__frozenset__" in value:
+        return frozenset(from_plain(value["__frozenset__"]))
+    if "__tuple__" in value:
+        return tuple(from_plain(value["__tuple__"]))
+    if "__map__" in value:
+        return {from_plain(k): from_plain(v) for k, v in value["__map__"]}
+    if "__decimal__" in value:
+        return Decimal(value["__decimal__"])
+    if "__path__" in value:
+        return Path(value["__path__"])
+    if "__numpy__" in value:
+        import numpy as np
+        return np.dtype(value["__numpy__"]).type(from_plain(value["value"]))
+    return {k: from_plain(v) for k, v in value.items()}
+
+
+# ---- blobs ----------------------------------------------------------------
+
+def dumps(value: Any, format: Optional[int] = None) -> bytes:
+    """Serialize a value to a versioned blob."""
+    format = format or default_format()
+    plain = to_plain(value)
+    if format == FORMAT_MSGPACK:
+        msgpack = _msgpack()
+        if msgpack is None:
+            raise CodecError("STORAGE_FORMAT=msgpack but msgpack is not installed")
+        body = msgpack.packb(plain, use_bin_type=True)
+    else:
+        body = json.dumps(plain, separators=(",", ":"),
+                          ensure_ascii=False).encode()
+    return MAGIC + bytes((format, SCHEMA_VERSION)) + body
+
+
+def loads(blob: bytes, allow_pickle: bool = False) -> Any:
+    """Deserialize a blob written by dumps() (or a legacy pickle).
+
+    Args:
+        blob: Serialized value
+        allow_pickle: Accept legacy pickles (trusted local files only)
+
+    Raises:
+        CodecError: Unreadable, written by a newer schema, or a pickle
+            when ``allow_pickle`` is off
+    """
+    if blob[:2] != MAGIC:
+        if is_pickle(blob):
+            if not allow_pickle:
+                raise CodecError("Refusing to unpickle a legacy record")
+            return pickle.loads(blob)
+        raise CodecError("Not a SecondBrain record")
+
+    format, version = blob[2], blob[3]
+    if version > SCHEMA_VERSION:
+        raise CodecError(
+            f"Record written by schema v{version}; this code reads up to "
+            f"v{SCHEMA_VERSION} - upgrade before opening this store"
+        )
+    body = memoryview(blob)[4:]
+    try:
+        if format == FORMAT_MSGPACK:
+            msgpack = _msgpack()
+            if msgpack is None:
+                raise CodecError(
+                    "Store was written with MessagePack - pip install msgpack"
+                )
+            plain = msgpack.unpackb(body, raw=False, strict_map_key=False)
+        elif format == FORMAT_JSON:
+            plain = json.loads(bytes(body))
+        else:
+            raise CodecError(f"Unknown record format {format}")
+    except CodecError:
+        raise
+    except Exception as e:
+        raise CodecError(f"Corrupt record: {e}") from e
+
+    while version < SCHEMA_VERSION:
+        plain = _MIGRATIONS[version](plain)
+        version += 1
+    return from_plain(plain)
@@ -0,0 +1,780 @@
+"""Storage Engines
+
+Pluggable key-value persistence for the memory and cache stores.
+
+Engines:
+    log     Append-only log + periodic snapshot compaction (default).
+            A write appends one record, so cost is O(1) regardless of
+            store size. Startup replays snapshot + log tail.
+    pickle  Legacy behaviour: rewrite the whole store on every write.
+    sqlite  Indexed table with JSON metadata; supports fast query()
+            over metadata fields (see secondbrain.storage.sqlite_engine).
+
+The log and sqlite engines serialize records with
+secondbrain.storage.codec (versioned MessagePack/JSON, no pickle).
+Stores written by older versions are read once and rewritten.
+
+Usage:
+    >>> engine = open_engine("log", DATA_ROOT / "memory" / "memory")
+    >>> engine.put("client_acme", record)
+    >>> engine.get("client_acme")
+"""
+
+import os
+import pickle
+import re
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from . import codec
+
+try:
+    import fcntl
+except ImportError:  # Windows - cross-process locking is best effort
+    fcntl = None
+
+# Log record ops
+OP_PUT = 1
+OP_DELETE = 2
+
+# Frame header: payload length + crc32 of payload
+_FRAME = struct.Struct("<II")
+
+FSYNC_POLICIES = ("always", "interval", "never")
+
+# Record attributes queryable directly; anything else is a metadata key
+RECORD_FIELDS = ("key", "created_at", "updated_at")
+FILTER_OPS = ("eq", "ne", "lt", "lte", "gt", "gte", "in")
+_FIELD_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+class StorageEngine:
+    """Base interface for key-value storage engines.
+
+    Engines are responsible for making writes durable. The log and
+    pickle engines serve reads from memory; sqlite reads from its table.
+    """
+
+    name = "base"
+
+    # Bumped whenever state is reloaded because of an external change
+    generation = 0
+
+    def refresh(self) -> bool:
+        """Pick up changes written by other processes.
+
+        Returns:
+            True if state was reloaded
+        """
+        return False
+
+    def get(self, key: str, default: Any = None) -> Any:
+        raise NotImplementedError
+
+    def put(self, key: str, value: Any) -> None:
+        raise NotImplementedError
+
+    def put_many(self, items) -> None:
+        """Store many (key, value) pairs with a single persist."""
+        for key, value in items:
+            self.put(key, value)
+
+    def get_many(self, keys) -> Dict[str, Any]:
+        """Fetch many keys at once; missing keys are left out."""
+        found = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    def delete(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def keys(self):
+        raise NotImplementedError
+
+    def values(self):
+        raise NotImplementedError
+
+    def items(self):
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def __contains__(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def query(self, filter: Optional[dict] = None,
+              order_by: Optional[str] = None,
+              limit: Optional[int] = None) -> List[Any]:
+        """Find stored values by metadata.
+
+        Engines without indexes scan every value; see SQLiteEngine for
+        the indexed implementation.
+
+        Args:
+            filter: {field: value} equality, or {field: {op: value}} with
+                op in FILTER_OPS. Fields are metadata keys, or one of
+                RECORD_FIELDS.
+            order_by: Field to sort by; prefix with "-" for descending
+            limit: Max results
+
+        Returns:
+            Matching values
+        """
+        conditions = parse_filter(filter)
+        matches = [
+            v for v in self.values()
+            if all(_matches(field_value(v, f), op, arg)
+                   for f, op, arg in conditions)
+        ]
+
+        if order_by:
+            name, descending = parse_order_by(order_by)
+            present = [v for v in matches if field_value(v, name) is not None]
+            missing = [v for v in matches if field_value(v, name) is None]
+            present.sort(key=lambda v: field_value(v, name), reverse=descending)
+            matches = present + missing
+
+        return matches[:limit] if limit is not None else matches
+
+    def flush(self) -> None:
+        """Force pending writes to stable storage."""
+
+    def close(self) -> None:
+        """Flush and release file handles."""
+        self.flush()
+
+
+def check_field(name: str) -> str:
+    """Validate a query field name (it ends up in SQL JSON paths)."""
+    if not _FIELD_NAME.match(name):
+        raise ValueError(f"Invalid query field: {name!r}")
+    return name
+
+
+def parse_filter(filter: Optional[dict]) -> List[Tuple[str, str, Any]]:
+    """Normalize a query filter to [(field, op, value), ...]."""
+    conditions = []
+    for name, spec in (filter or {}).items():
+        check_field(name)
+        if isinstance(spec, dict):
+            for op, arg in spec.items():
+                if op not in FILTER_OPS:
+                    raise ValueError(f"Unknown filter op: {op!r}")
+                conditions.append((name, op, arg))
+        else:
+            conditions.append((name, "eq", spec))
+    return conditions
+
+
+def parse_order_by(order_by: str) -> Tuple[str, bool]:
+    """Split "-field" into ("field", descending=True)."""
+    descending = order_by.startswith("-")
+    return check_field(order_by.lstrip("-")), descending
+
+
+def field_value(value: Any, name: str) -> Any:
+    """Read a queryable field from a stored value."""
+    if name in RECORD_FIELDS:
+        return getattr(value, name, None)
+    metadata = getattr(value, "metadata", None) or {}
+    return metadata.get(name)
+
+
+def _matches(actual: Any, op: str, arg: Any) -> bool:
+    if op == "eq":
+        return actual == arg
+    if op == "ne":
+        return actual != arg
+    if op == "in":
+        return actual in arg
+    if actual is None:
+        return False
+    try:
+        if op == "lt":
+            return actual < arg
+        if op == "lte":
+            return actual <= arg
+        if op == "gt":
+            return actual > arg
+        return actual >= arg
+    except TypeError:
+        return False
+
+
+class _DictEngine(StorageEngine):
+    """Shared dict-backed read path."""
+
+    def __init__(self):
+        self._data: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._data.get(key, default)
+
+    def keys(self):
+        return list(self._data.keys())
+
+    def values(self):
+        return list(self._data.values())
+
+    def items(self):
+        return list(self._data.items())
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._data
+
+
+def _load_pickle(path: Path) -> dict:
+    """Load a pickled dict, returning {} if missing or unreadable."""
+    if not path.exists():
+        return {}
+    try:
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
+
+def _file_stamp(path: Path) -> Optional[Tuple[int, int, int]]:
+    """Identity of a file's current contents: (inode, mtime_ns, size)."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _write_atomic(path: Path, data: dict) -> None:
+    """Write a pickled dict via temp file + rename."""
+    _write_bytes_atomic(
+        path, pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+    )
+
+
+def _write_temp(path: Path, blob: bytes) -> Path:
+    """Write blob to a uniquely named, fsynced temp file next to path."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".",
+                               suffix=".tmp")
+    try:
+        with open(fd, "wb") as f:
+            f.write(blob)
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return Path(tmp)
+
+
+def _write_bytes_atomic(path: Path, blob: bytes) -> None:
+    os.replace(_write_temp(path, blob), path)
+
+
+def _save_snapshot(path: Path, data: dict) -> None:
+    """Write a store snapshot in the versioned record format."""
+    _write_bytes_atomic(path, codec.dumps(data))
+
+
+class _FileLock:
+    """flock() on a lock file, shared with other processes.
+
+    Re-entrant for the holder: nested acquire() calls only count. Callers
+    serialize threads themselves (LogEngine holds its RLock), since
+    flock() treats every thread using the same file as one owner. A
+    no-op where fcntl is unavailable.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = None
+        self._depth = 0
+
+    def acquire(self, blocking: bool = True) -> bool:
+        if self._depth == 0 and fcntl is not None:
+            if self._file is None:
+                self._file = open(self.path, "ab")
+            flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+            try:
+                fcntl.flock(self._file.fileno(), flags)
+            except BlockingIOError:
+                return False
+        self._depth += 1
+        return True
+
+    def release(self) -> None:
+        self._depth -= 1
+        if self._depth == 0 and self._file is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def __enter__(self) -> "_FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._depth = 0
+
+
+def _load_snapshot(path: Path) -> Tuple[dict, bool]:
+    """Load a snapshot (versioned format or legacy pickle).
+
+    Returns:
+        (data, True if it was a legacy pickle); ({}, False) if missing
+    """
+    if not path.exists():
+        return {}, False
+    with open(path, "rb") as f:
+        blob = f.read()
+    if codec.is_pickle(blob):
+        return _load_pickle(path), True
+    try:
+        return codec.loads(blob), False
+    except codec.CodecError as e:
+        # Refuse to start empty and overwrite the store on next compaction
+        raise codec.CodecError(f"Snapshot {path} unreadable: {e}") from e
+
+
+class PickleEngine(_DictEngine):
+    """Legacy engine: re-pickles the entire store on every write."""
+
+    name = "pickle"
+
+    def __init__(self, base_path: Path, legacy_file: Optional[Path] = None,
+                 **_options):
+        super().__init__()
+        self.path = legacy_file or Path(str(base_path) + ".pkl")
+        self._data = _load_pickle(self.path)
+        self._stamp = _file_stamp(self.path)
+
+    def refresh(self) -> bool:
+        with self._lock:
+            stamp = _file_stamp(self.path)
+            if stamp == self._stamp:
+                return False
+            self._data = _load_pickle(self.path)
+            self._stamp = stamp
+            self.generation += 1
+            return True
+
+    def put(self, key: str, value: Any) -> None:
+        self.put_many([(key, value)])
+
+    def put_many(self, items) -> None:
+        with self._lock:
+            self.refresh()
+            self._data.update(items)
+            self._save()
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            self.refresh()
+            if key not in self._data:
+                return False
+            del self._data[key]
+            self._save()
+            return True
+
+    def _save(self) -> None:
+        _write_atomic(self.path, self._data)
+        self._stamp = _file_stamp(self.path)
+
+
+class LogEngine(_DictEngine):
+    """Append-only log engine with background snapshot compaction.
+
+    Files (for base path ``memory/memory``):
+        memory.snapshot   Full store as of the last compaction
+        memory.log        Records written since that compaction
+        memory.log.old    Log being folded into a snapshot (transient)
+        memory.lock       Serializes writes, rotation and snapshot
+                          replacement across processes
+        memory.compact.lock  Held by the one process compacting
+
+    Args:
+        base_path: Path prefix for the engine's files
+        legacy_file: Full-store pickle to import on first open
+        fsync: "always" (every write), "interval" (at most every
+            ``fsync_interval`` seconds) or "never" (leave it to the OS)
+        fsync_interval: Seconds between fsyncs for the "interval" policy
+        compact_threshold: Log records that trigger a compaction
+    """
+
+    name = "log"
+
+    def __init__(self, base_path: Path, legacy_file: Optional[Path] = None,
+                 fsync: str = "interval", fsync_interval: float = 1.0,
+                 compact_threshold: int = 10000):
+        super().__init__()
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+
+        base_path = Path(base_path)
+        self.snapshot_path = Path(str(base_path) + ".snapshot")
+        self.log_path = Path(str(base_path) + ".log")
+        self.old_log_path = Path(str(base_path) + ".log.old")
+        self._file_lock = _FileLock(Path(str(base_path) + ".lock"))
+        self._compact_lock = _FileLock(Path(str(base_path) + ".compact.lock"))
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.compact_threshold = compact_threshold
+
+        self._log = None
+        self._log_ino = None
+        self._log_offset = 0  # bytes of the live log applied to _data
+        self._log_records = 0
+        self._last_fsync = time.monotonic()
+        self._compactor: Optional[threading.Thread] = None
+        # Pickled snapshot/frames seen on recovery (pre-codec stores)
+        self._legacy = False
+
+        with self._file_lock:
+            self._recover(legacy_file)
+            self._open_log()
+        if self._legacy:
+            # Rewrite the store in the versioned format once
+            self.compact()
+
+    def _open_log(self) -> None:
+        self._log = open(self.log_path, "ab", buffering=0)
+        self._log_ino = os.fstat(self._log.fileno()).st_ino
+
+    # ---- recovery -------------------------------------------------------
+
+    def _recover(self, legacy_file: Optional[Path]) -> None:
+        """Rebuild state from snapshot + log tail (or a legacy pickle)."""
+        fresh = not (self.snapshot_path.exists() or self.log_path.exists()
+                     or self.old_log_path.exists())
+
+        if fresh and legacy_file is not None and Path(legacy_file).exists():
+            self._data = _load_pickle(Path(legacy_file))
+            _save_snapshot(self.snapshot_path, self._data)
+            return
+
+        self._data, legacy = _load_snapshot(self.snapshot_path)
+        self._legacy = self._legacy or legacy
+
+        # A crash mid-compaction leaves log.old behind. Replaying it over
+        # the snapshot is idempotent, so no need to know which step died.
+        if self.old_log_path.exists():
+            self._replay(self.old_log_path)
+        self._log_records, self._log_offset = self._replay(
+            self.log_path, truncate=True
+        )
+
+    def _replay(self, path: Path, start: int = 0,
+                truncate: bool = False) -> Tuple[int, int]:
+        """Apply records from a log file.
+
+        Args:
+            path: Log file
+            start: Byte offset of the first record to apply
+            truncate: Cut a torn tail left by a crashed writer
+
+        Returns:
+            (records applied, offset after the last intact record)
+        """
+        if not path.exists():
+            return 0, start
+
+        count = 0
+        good_offset = start
+        with open(path, "rb") as f:
+            f.seek(start)
+            for op, key, value, end, legacy in _iter_frames(f, start):
+                self._legacy = self._legacy or legacy
+                if op == OP_PUT:
+                    self._data[key] = value
+                elif op == OP_DELETE:
+                    self._data.pop(key, None)
+                count += 1
+                good_offset = end
+
+        if truncate and good_offset < path.stat().st_size:
+            # Partial write from a crash - drop it so appends stay aligned
+            with open(path, "r+b") as f:
+                f.truncate(good_offset)
+        return count, good_offset
+
+    def refresh(self) -> bool:
+        """Apply records other processes appended since the last check.
+
+        One stat() when nothing changed. A new log tail is replayed
+        incrementally; a rotated log (another process compacted) forces
+        a full reload from snapshot + logs.
+        """
+        with self._lock:
+            stamp = _file_stamp(self.log_path)
+            if (stamp is not None and stamp[0] == self._log_ino
+                    and stamp[2] <= self._log_offset):
+                return False
+            with self._file_lock:
+                return self._reload()
+
+    def _reload(self) -> bool:
+        # Under both locks: nobody rotates or replaces the snapshot
+        stamp = _file_stamp(self.log_path)
+        if stamp is not None and stamp[0] == self._log_ino:
+            if stamp[2] <= self._log_offset:
+                return False
+            applied, self._log_offset = self._replay(
+                self.log_path, self._log_offset
+            )
+            self._log_records += applied
+        else:
+            self._log.close()
+            self._recover(None)
+            self._open_log()
+        self.generation += 1
+        return True
+
+    # ---- writes ---------------------------------------------------------
+
+    def put(self, key: str, value: Any) -> None:
+        self.put_many([(key, value)])
+
+    def put_many(self, items) -> None:
+        """Append one record per item, written with a single write()."""
+        items = list(items)
+        if not items:
+            return
+        with self._lock:
+            with self._file_lock:
+                # Appending to a log another process just rotated away
+                # would lose the records - reload first
+                self.refresh()
+                self._write([_encode_frame(OP_PUT, key, value)
+                             for key, value in items])
+                self._data.update(items)
+            self._maybe_compact()
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            with self._file_lock:
+                self.refresh()
+                if key not in self._data:
+                    return False
+                self._write([_encode_frame(OP_DELETE, key, None)])
+                del self._data[key]
+            self._maybe_compact()
+            return True
+
+    def _write(self, frames: List[bytes]) -> None:
+        data = b"".join(frames)
+        # One write() per batch keeps frames intact for other readers
+        written = self._log.write(data)
+        while written < len(data):
+            written += self._log.write(data[written:])
+        self._log_records += len(frames)
+
+        end = os.fstat(self._log.fileno()).st_size
+        if end == self._log_offset + len(data):
+            self._log_offset = end
+        else:
+            # Another process appended concurrently (only possible
+            # without fcntl) - replay everything past our last known
+            # offset (our own frames included)
+            applied, self._log_offset = self._replay(
+                self.log_path, self._log_offset
+            )
+            self._log_records += applied - len(frames)
+            # Foreign records changed _data; caches built on it are stale
+            self.generation += 1
+
+        if self.fsync == "always":
+            os.fsync(self._log.fileno())
+        elif self.fsync == "interval":
+            now = time.monotonic()
+            if now - self._last_fsync >= self.fsync_interval:
+                os.fsync(self._log.fileno())
+                self._last_fsync = now
+
+    def _maybe_compact(self) -> None:
+        # Called after _data is updated so the snapshot includes the write
+        if self._log_records >= self.compact_threshold:
+            self.compact(background=True)
+
+    # ---- compaction -----------------------------------------------------
+
+    def compact(self, background: bool = False) -> None:
+        """Fold the log into a fresh snapshot.
+
+        Only one process compacts at a time (the compact lock); others
+        skip. The log is re-read and rotated under the file lock; the
+        snapshot is serialized outside it and only swapped in (with
+        log.old removed) under it again, so writers in any process are
+        only blocked for the rotation and the swap.
+
+        Args:
+            background: Run the snapshot write on a daemon thread
+        """
+        with self._lock:
+            if self._compactor is not None and self._compactor.is_alive():
+                return
+            if not self._compact_lock.acquire(blocking=False):
+                return  # Another process is compacting
+            rotated = False
+            try:
+                with self._file_lock:
+                    # Records other processes appended must be in the
+                    # snapshot before their log is rotated away
+                    self.refresh()
+                    if self.old_log_path.exists():
+                        # Previous compaction never finished - finish it inline
+                        _save_snapshot(self.snapshot_path, dict(self._data))
+                        self.old_log_path.unlink()
+
+                    os.fsync(self._log.fileno())
+                    self._log.close()
+                    os.replace(self.log_path, self.old_log_path)
+                    self._open_log()
+                rotated = True
+            except OSError as e:
+                # e.g. another process holds the log open on Windows
+                print(f"Log compaction skipped (non-critical): {e}")
+                if self._log.closed:
+                    self._open_log()
+            finally:
+                if not rotated:
+                    self._compact_lock.release()
+            if not rotated:
+                return
+
+            self._log_offset = 0
+            self._log_records = 0
+            snapshot = dict(self._data)
+
+        if background:
+            self._compactor = threading.Thread(
+                target=self._write_snapshot, args=(snapshot,),
+                name=f"compact-{self.log_path.name}", daemon=True
+            )
+            self._compactor.start()
+        else:
+            self._write_snapshot(snapshot)
+
+    def _write_snapshot(self, snapshot: dict) -> None:
+        tmp = None
+        try:
+            tmp = _write_temp(self.snapshot_path, codec.dumps(snapshot))
+            with self._lock, self._file_lock:
+                # Swapped together, so a process reloading (under the
+                # file lock) sees either old snapshot + log.old or the
+                # new snapshot alone
+                os.replace(tmp, self.snapshot_path)
+                tmp = None
+                self.old_log_path.unlink()
+        except Exception as e:
+            if tmp is not None:
+                tmp.unlink(missing_ok=True)
+            # log.old is kept and replayed on next open
+            print(f"Snapshot compaction failed (non-critical): {e}")
+        finally:
+            self._compact_lock.release()
+
+    # ---- lifecycle ------------------------------------------------------
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._log is not None and not self._log.closed:
+                os.fsync(self._log.fileno())
+                self._last_fsync = time.monotonic()
+
+    def close(self) -> None:
+        if self._compactor is not None:
+            self._compactor.join()
+        with self._lock:
+            if self._log is not None and not self._log.closed:
+                os.fsync(self._log.fileno())
+                self._log.close()
+            self._file_lock.close()
+            self._compact_lock.close()
+
+
+def _encode_frame(op: int, key: str, value: Any) -> bytes:
+    payload = codec.dumps((op, key, value))
+    return _FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def _iter_frames(f, offset: int = 0) -> Iterator[Tuple[int, str, Any, int, bool]]:
+    """Yield (op, key, value, end_offset, legacy) for each intact frame.
+
+    Stops at a torn tail (short read or CRC mismatch). ``legacy`` marks
+    frames pickled by older versions; they are read (the log is our own
+    local file) and rewritten by the next compaction.
+
+    Args:
+        f: Binary file positioned at ``offset``
+        offset: Starting byte offset (for reporting end offsets)
+
+    Raises:
+        CodecError: An intact frame can't be decoded (e.g. msgpack not
+            installed, or written by a newer schema) - never treated as
+            a torn tail, so the log isn't truncated over readable data
+    """
+    while True:
+        header = f.read(_FRAME.size)
+        if len(header) < _FRAME.size:
+            return
+        length, crc = _FRAME.unpack(header)
+        payload = f.read(length)
+        if len(payload) < length or zlib.crc32(payload) != crc:
+            return
+        try:
+            op, key, value = codec.loads(payload, allow_pickle=True)
+        except Exception as e:
+            raise codec.CodecError(
+                f"Log record at byte {offset} of {getattr(f, 'name', 'log')} "
+                f"unreadable: {e}"
+            ) from e
+        offset += _FRAME.size + length
+        yield op, key, value, offset, codec.is_pickle(payload)
+
+
+ENGINES = {
+    LogEngine.name: LogEngine,
+    PickleEngine.name: PickleEngine,
+}
+
+
+def _engine_class(name: str):
+    if name == "sqlite":
+        # Imported lazily - it builds on the helpers above
+        from .sqlite_engine import SQLiteEngine
+        return SQLiteEngine
+    return ENGINES.get(name)
+
+
+def open_engine(name: str, base_path: Path, **options) -> StorageEngine:
+    """Open a storage engine by name.
+
+    Args:
+        name: Engine name (see ENGINES)
+        base_path: Path prefix for the engine's files
+        **options: Engine-specific options
+
+    Returns:
+        Opened engine with persisted state loaded
+    """
+    engine_cls = _engine_class(name)
+    if engine_cls is None:
+        available = ", ".join(list(ENGINES) + ["sqlite"])
+        raise ValueError(f"Unknown storage engine: {name} (available: {available})")
+    return engine_cls(Path(base_path), **options)
@@ -0,0 +1,403 @@
+"""Local Vector Index
+
+In-process replacement for Qdrant, used when the server is unavailable
+(or VECTOR_BACKEND=local). Implements the VectorStore interface so the
+rest of SecondBrain doesn't care which one it talks to.
+
+Per collection (under VECTOR_INDEX_PATH/<collection>/):
+    vectors.f32      Unit-normalized float32 rows, memory-mapped for search
+    meta.json        Vector dimension
+    points.*         id -> {row, payload} (append-only LogEngine)
+
+Search is cosine similarity. Small collections use a brute-force matrix
+multiply + top-k; above ``ivf_threshold`` live points an IVF index
+(spherical k-means partitions, probing the ``nprobe`` closest) is built
+in memory and kept up to date as points are added.
+
+Payload filters (same syntax as VectorStore.search) are checked while
+walking matches best-first, so a filtered search still returns up to
+``limit`` matching points rather than filtering a top-k after the fact.
+"""
+
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from shared.utils.vectors import VectorLike, as_numpy
+from .engine import LogEngine, _matches, parse_filter
+from .vector_store import VectorStore
+
+
+class _Collection:
+    """One memory-mapped collection."""
+
+    def __init__(self, path: Path, ivf_threshold: int, nprobe: int):
+        import numpy as np
+        self._np = np
+
+        path.mkdir(parents=True, exist_ok=True)
+        self.vectors_path = path / "vectors.f32"
+        self.meta_path = path / "meta.json"
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+
+        self._lock = threading.RLock()
+        self.points = LogEngine(path / "points", fsync="never")
+        self.dim: Optional[int] = None
+        if self.meta_path.exists():
+            self.dim = json.loads(self.meta_path.read_text())["dim"]
+
+        self._load_rows()
+
+    # ---- row bookkeeping ------------------------------------------------
+
+    def _load_rows(self) -> None:
+        """Rebuild row -> id and liveness from the points engine."""
+        np = self._np
+        rows = 0
+        if self.dim and self.vectors_path.exists():
+            rows = self.vectors_path.stat().st_size // (4 * self.dim)
+
+        self._row_ids: List[Any] = [None] * rows
+        for point_id, point in self.points.items():
+            if point["row"] < rows:
+                self._row_ids[point["row"]] = point_id
+        self._live = np.array([i is not None for i in self._row_ids], dtype=bool)
+        self._matrix = None
+        self._generation = self.points.generation
+        self._drop_ivf()
+
+    @property
+    def live_count(self) -> int:
+        return int(self._live.sum())
+
+    def _view(self):
+        """Memory-mapped (rows x dim) matrix, reopened after appends."""
+        np = self._np
+        rows = len(self._row_ids)
+        if self._matrix is None or self._matrix.shape[0] != rows:
+            if rows == 0:
+                self._matrix = np.zeros((0, self.dim or 0), dtype=np.float32)
+            else:
+                self._matrix = np.memmap(
+                    self.vectors_path, dtype=np.float32, mode="r",
+                    shape=(rows, self.dim)
+                )
+        return self._matrix
+
+    def _normalize(self, vectors):
+        np = self._np
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (vectors / norms).astype(np.float32, copy=False)
+
+    # ---- writes ---------------------------------------------------------
+
+    def upsert_many(self, points: List[dict]) -> None:
+        np = self._np
+        # Last write wins for repeated ids - one live row per id
+        points = list({p["id"]: p for p in points}.values())
+        with self._lock:
+            self._sync()
+            matrix = np.stack([as_numpy(p["vector"]) for p in points])
+            if self.dim is None:
+                self.dim = int(matrix.shape[1])
+                self.meta_path.write_text(json.dumps({"dim": self.dim}))
+            if matrix.shape[1] != self.dim:
+                raise ValueError(
+                    f"Vector dimension {matrix.shape[1]} != collection "
+                    f"dimension {self.dim}"
+                )
+            matrix = self._normalize(matrix)
+
+            first_row = len(self._row_ids)
+            with open(self.vectors_path, "ab") as f:
+                f.write(matrix.tobytes())
+
+            records = []
+            for offset, point in enumerate(points):
+                old = self.points.get(point["id"])
+                if old is not None and old["row"] < len(self._row_ids):
+                    self._row_ids[old["row"]] = None
+                    self._live[old["row"]] = False
+                records.append((point["id"], {
+                    "row": first_row + offset,
+                    "payload": point["payload"]
+                }))
+            # _generation is left as of _sync(): if the write picked up
+            # another process's points, the next _sync() reloads rows
+            self.points.put_many(records)
+
+            self._row_ids.extend(p["id"] for p in points)
+            self._live = np.concatenate(
+                [self._live, np.ones(len(points), dtype=bool)]
+            )
+            self._matrix = None
+
+            if self._centroids is not None:
+                self._assign = np.concatenate(
+                    [self._assign, self._nearest_lists(matrix)]
+                )
+            self._maybe_compact()
+
+    def delete_many(self, ids: List[Any]) -> int:
+        with self._lock:
+            self._sync()
+            deleted = 0
+            for point_id in ids:
+                point = self.points.get(point_id)
+                if point is None:
+                    continue
+                self.points.delete(point_id)
+                if point["row"] < len(self._row_ids):
+                    self._row_ids[point["row"]] = None
+                    self._live[point["row"]] = False
+                deleted += 1
+            self._maybe_compact()
+            return deleted
+
+    def _maybe_compact(self) -> None:
+        """Rewrite the vector file once dead rows outnumber live ones."""
+        dead = len(self._row_ids) - self.live_count
+        if dead < 1000 or dead < self.live_count:
+            return
+
+        np = self._np
+        live_rows = np.flatnonzero(self._live)
+        matrix = np.array(self._view()[live_rows])
+        self._matrix = None
+
+        tmp = self.vectors_path.with_name(self.vectors_path.name + ".tmp")
+        tmp.write_bytes(matrix.tobytes())
+        tmp.replace(self.vectors_path)
+
+        records = []
+        for new_row, old_row in enumerate(live_rows):
+            point_id = self._row_ids[old_row]
+            point = self.points.get(point_id)
+            records.append((point_id, {"row": new_row, "payload": point["payload"]}))
+        self.points.put_many(records)
+        self.points.compact()
+
+        self._row_ids = [self._row_ids[r] for r in live_rows]
+        self._live = np.ones(len(self._row_ids), dtype=bool)
+        self._drop_ivf()
+
+    def _sync(self) -> None:
+        """Pick up points written by another process."""
+        self.points.refresh()
+        if self.points.generation != self._generation:
+            self._load_rows()
+
+    # ---- IVF ------------------------------------------------------------
+
+    def _drop_ivf(self) -> None:
+        self._centroids = None
+        self._assign = None
+        self._ivf_size = 0
+
+    def _nearest_lists(self, vectors):
+        return (vectors @ self._centroids.T).argmax(axis=1).astype(self._np.int32)
+
+    def _build_ivf(self) -> None:
+        """Spherical k-means over (a sample of) the live rows."""
+        np = self._np
+        matrix = self._view()
+        live_rows = np.flatnonzero(self._live)
+        nlist = int(min(1024, max(8, np.sqrt(len(live_rows)))))
+
+        rng = np.random.default_rng(0)
+        sample_rows = rng.choice(
+            live_rows, size=min(len(live_rows), nlist * 50), replace=False
+        )
+        sample = np.array(matrix[np.sort(sample_rows)])
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)]
+
+        for _ in range(10):
+            labels = (sample @ centroids.T).argmax(axis=1)
+            for c in range(nlist):
+                members = sample[labels == c]
+                if len(members):
+                    centroids[c] = members.sum(axis=0)
+            centroids = self._normalize(centroids)
+
+        self._centroids = centroids
+        assign = np.full(len(self._row_ids), -1, dtype=np.int32)
+        for start in range(0, len(live_rows), 65536):
+            rows = live_rows[start:start + 65536]
+            assign[rows] = self._nearest_lists(np.asarray(matrix[rows]))
+        self._assign = assign
+        self._ivf_size = len(live_rows)
+
+    # ---- search ---------------------------------------------------------
+
+    def search(self, vector: VectorLike, limit: int, threshold: float,
+               filter: Optional[dict] = None) -> List[dict]:
+        np = self._np
+        conditions = parse_filter(filter)
+        with self._lock:
+            self._sync()
+            if self.dim is None or self.live_count == 0:
+                return []
+
+            query = self._normalize(as_numpy(vector).reshape(1, -1))[0]
+            if query.shape[0] != self.dim:
+                raise ValueError(
+                    f"Query dimension {query.shape[0]} != collection "
+                    f"dimension {self.dim}"
+                )
+            matrix = self._view()
+
+            live = self.live_count
+            if live >= self.ivf_threshold and (
+                self._centroids is None or live > 2 * self._ivf_size
+            ):
+                self._build_ivf()
+
+            if self._centroids is not None:
+                probes = np.argsort(self._centroids @ query)[-self.nprobe:]
+                candidates = np.flatnonzero(
+                    np.isin(self._assign, probes) & self._live
+                )
+                scores = np.asarray(matrix[candidates]) @ query
+            else:
+                candidates = np.flatnonzero(self._live)
+                scores = (np.asarray(matrix) @ query)[candidates]
+
+            if conditions:
+                # Walk everything above the threshold, best first
+                top = np.flatnonzero(scores >= threshold)
+            elif len(scores) > limit:
+                top = np.argpartition(-scores, limit - 1)[:limit]
+            else:
+                top = np.arange(len(scores))
+            top = top[np.argsort(-scores[top])]
+
+            results = []
+            for i in top:
+                score = float(scores[i])
+                if score < threshold or len(results) >= limit:
+                    break
+                point_id = self._row_ids[candidates[i]]
+                payload = self.points.get(point_id)["payload"]
+                if not all(_matches(payload.get(name), op, arg)
+                           for name, op, arg in conditions):
+                    continue
+                results.append({
+                    "id": point_id,
+                    "score": score,
+                    "payload": payload
+                })
+            return results
+
+    def get_many(self, ids: List[Any]) -> Dict[Any, dict]:
+        with self._lock:
+            self._sync()
+            return {
+                point_id: {"id": point_id, "payload": point["payload"]}
+                for point_id, point in self.points.get_many(ids).items()
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._matrix = None
+            self.points.close()
+
+
+class LocalVectorStore(VectorStore):
+    """Embedded vector index with the VectorStore interface.
+
+    Args:
+        root: Directory holding one subdirectory per collection
+        ivf_threshold: Live points above which search switches to IVF
+        nprobe: IVF partitions scanned per query
+    """
+
+    def __init__(self, root: Path, ivf_threshold: int = 20000,
+                 nprobe: int = 8):
+        super().__init__()
+        self.root = Path(root)
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+        self._collections: Dict[str, _Collection] = {}
+        self._lock = threading.Lock()
+
+    def connect(self) -> bool:
+        """Check NumPy is available and the index directory is writable."""
+        try:
+            import numpy  # noqa: F401
+            self.root.mkdir(parents=True, exist_ok=True)
+            return True
+        except Exception as e:
+            print(f"Local vector index unavailable: {e}")
+            return False
+
+    def _collection(self, name: str) -> _Collection:
+        with self._lock:
+            if name not in self._collections:
+                self._collections[name] = _Collection(
+                    self.root / name, self.ivf_threshold, self.nprobe
+                )
+            return self._collections[name]
+
+    def upsert(self, collection: str, id: str, vector: VectorLike,
+               payload: Dict[str, Any]) -> bool:
+        """Store a vector with metadata."""
+        return self.upsert_many(
+            collection, [{"id": id, "vector": vector, "payload": payload}]
+        )
+
+    def upsert_many(self, collection: str, points: List[dict]) -> bool:
+        """Store many vectors with one file append."""
+        if not points:
+            return True
+        try:
+            self._collection(collection).upsert_many(points)
+            return True
+        except Exception as e:
+            print(f"Failed to upsert {len(points)} points: {e}")
+            return False
+
+    def search(self, collection: str, vector: VectorLike,
+               limit: int = 5, threshold: float = 0.0,
+               filter: Optional[dict] = None) -> List[dict]:
+        """Search for similar vectors (cosine), optionally payload-filtered."""
+        try:
+            return self._collection(collection).search(
+                vector, limit, threshold, filter
+            )
+        except Exception as e:
+            print(f"Search failed: {e}")
+            return []
+
+    def get_many(self, collection: str, keys: List[Any]) -> Dict[Any, dict]:
+        """Fetch points by key (no similarity search)."""
+        try:
+            return self._collection(collection).get_many(keys)
+        except Exception as e:
+            print(f"Retrieve failed: {e}")
+            return {}
+
+    def delete(self, collection: str, id: str) -> bool:
+        """Delete a vector by ID."""
+        try:
+            return self._collection(collection).delete_many([id]) > 0
+        except Exception as e:
+            print(f"Delete failed: {e}")
+            return False
+
+    def delete_many(self, collection: str, ids: List[str]) -> bool:
+        """Delete many vectors by ID."""
+        try:
+            self._collection(collection).delete_many(list(ids))
+            return True
+        except Exception as e:
+            print(f"Delete failed: {e}")
+            return False
+
+    def close(self) -> None:
+        with self._lock:
+            for collection in self._collections.values():
+                collection.close()
+            self._collections.clear()
@@ -0,0 +1,142 @@
+"""Near-duplicate text index
+
+Cheap lookup tiers for the response cache, checked before paying for an
+embedding and a vector search:
+
+    normalize_text()  Case/whitespace/punctuation folding, so "What is
+                      Python?" and "what is python" hash the same.
+                      Operators and number punctuation are kept, so
+                      "2+2" and "2-2" (or "3.5" and "35") don't
+    simhash()         64-bit SimHash over word unigrams + bigrams. On
+                      typical 15-20 word prompts a one-word edit lands
+                      ~4-12 bits away, unrelated prompts 20+
+    SimHashIndex      Finds stored fingerprints within ``max_distance``
+                      bits, using max_distance + 1 bands (pigeonhole: a
+                      match must agree exactly on at least one band)
+"""
+
+import hashlib
+import math
+import re
+from typing import Dict, Optional, Set, Tuple
+
+# Sentence punctuation only - operators (+ - * / = < > % ^ & | ~ $ # @)
+# change what a question asks, so they stay
+_PUNCTUATION = re.compile(r"[^\w\s+\-*/=<>%^&|~$#@.]+")
+# A dot that isn't a decimal point ("3.5" keeps it, "Python." doesn't)
+_DOT = re.compile(r"(?<!\d)\.|\.(?!\d)")
+_WHITESPACE = re.compile(r"\s+")
+
+FINGERPRINT_BITS = 64
+
+
+def normalize_text(text: str) -> str:
+    """Fold case, drop sentence punctuation and collapse whitespace."""
+    text = _PUNCTUATION.sub(" ", text.casefold())
+    text = _DOT.sub(" ", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little"
+    )
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash fingerprint of a text (normalized first)."""
+    import numpy as np
+
+    words = normalize_text(text).split()
+    features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    if not features:
+        return 0
+
+    hashes = np.array([_feature_hash(f) for f in features], dtype="<u8")
+    bits = np.unpackbits(hashes.view(np.uint8), bitorder="little")
+    votes = bits.reshape(len(features), FINGERPRINT_BITS).sum(axis=0)
+    # Bit i is set when most features have it set
+    packed = np.packbits(votes * 2 > len(features), bitorder="little")
+    return int.from_bytes(packed.tobytes(), "little")
+
+
+def hamming(a: int, b: int) -> int:
+    """Number of differing bits."""
+    return bin(a ^ b).count("1")
+
+
+def distance_for(similarity: float) -> int:
+    """Most SimHash bits two texts may differ by at ``similarity`` (0-1).
+
+    Bit agreement stands in for similarity: 0.90 allows 6 of 64 bits,
+    0.95 allows 3 and 0.99 none.
+    """
+    return max(0, math.floor((1 - similarity) * FINGERPRINT_BITS + 1e-9))
+
+
+class SimHashIndex:
+    """Banded index of SimHash fingerprints.
+
+    Args:
+        max_distance: Max Hamming distance counted as a near duplicate
+    """
+
+    def __init__(self, max_distance: int = 6):
+        self.max_distance = max_distance
+        self.bands = max_distance + 1
+        self._band_bits = FINGERPRINT_BITS // self.bands
+        self._mask = (1 << self._band_bits) - 1
+        self._buckets: Dict[Tuple[int, int], Set[str]] = {}
+        self._fingerprints: Dict[str, int] = {}
+
+    def _band_keys(self, fingerprint: int):
+        for band in range(self.bands):
+            yield band, (fingerprint >> (band * self._band_bits)) & self._mask
+
+    def add(self, key: str, fingerprint: int) -> None:
+        self.remove(key)
+        self._fingerprints[key] = fingerprint
+        for band_key in self._band_keys(fingerprint):
+            self._buckets.setdefault(band_key, set()).add(key)
+
+    def remove(self, key: str) -> None:
+        fingerprint = self._fingerprints.pop(key, None)
+        if fingerprint is None:
+            return
+        for band_key in self._band_keys(fingerprint):
+            bucket = self._buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band_key]
+
+    def find(self, fingerprint: int,
+             max_distance: Optional[int] = None) -> Optional[Tuple[str, int]]:
+        """Closest stored key within max_distance.
+
+        Args:
+            fingerprint: SimHash to match
+            max_distance: Tighter limit for this lookup (None = the
+                index's own; larger values are capped to it)
+
+        Returns:
+            (key, distance), or None if nothing is close enough
+        """
+        if max_distance is None or max_distance > self.max_distance:
+            max_distance = self.max_distance
+        best = None
+        for band_key in self._band_keys(fingerprint):
+            for key in self._buckets.get(band_key, ()):
+                distance = hamming(fingerprint, self._fingerprints[key])
+                if distance <= max_distance and (
+                    best is None or distance < best[1]
+                ):
+                    best = (key, distance)
+        return best
+
+    def clear(self) -> None:
+        self._buckets.clear()
+        self._fingerprints.clear()
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
@@ -0,0 +1,718 @@
+"""Response Cache
+
+Tiered lookup over the cache storage engine. cache_get() tries the
+cheap tiers in order and only falls through to an embedding + vector
+search (the "semantic" tier, run by the caller) when they all miss:
+
+    exact           The structured cache key (see cache_key.py)
+    normalized      hash of normalize_text(query)
+    near_duplicate  SimHash within CACHE_NEAR_DUPLICATE_DISTANCE bits
+                    (off by default), tightened to the caller's
+                    similarity threshold
+
+Every tier stays inside the key's namespace (template), and inside its
+model unless the lookup is for any model. The fuzzy tiers (normalized,
+near-duplicate) can answer a question with another one's response -
+"capital of France" is a few bits from "capital of Germany" - so
+lookups can opt out of them (``fuzzy=False``). The text, normalized and
+near-duplicate indexes live in memory and are rebuilt from the engine
+when another process changes it. Every tier records
+lookups, hits and latency; see stats().
+
+Reads don't write: hit counts accumulate in memory and are flushed by a
+background thread every ``flush_interval`` seconds (and on close()).
+
+Stats are running counters updated on every write, hit and removal -
+totals() and usage() never scan the engine. ``recent`` holds the same
+events in 10-second buckets for windowed views (last minute, hour).
+
+Capacity: expiry times sit in a min-heap, so the sweeper only touches
+entries that are actually due. Past ``max_entries`` or ``max_bytes``,
+put() evicts by LRU or LFU. Every removal (expiry or eviction) is
+reported to ``on_remove`` so the caller can drop the matching points
+from the queries vector collection.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections import Counter, OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from shared.models.schemas import CachedResponse
+from .cache_key import CacheKey, cache_key, digest
+from .engine import StorageEngine
+from .near_duplicate import SimHashIndex, distance_for, normalize_text, simhash
+from .stats import WindowedCounters
+
+TIERS = ("exact", "normalized", "near_duplicate", "semantic")
+
+EVICTION_POLICIES = ("lru", "lfu")
+
+
+class TierStats:
+    """Lookup/hit/latency counters for one tier."""
+
+    def __init__(self):
+        self.lookups = 0
+        self.hits = 0
+        self.skipped = 0
+        self.seconds = 0.0
+
+    def record(self, hit: bool, seconds: float) -> None:
+        self.lookups += 1
+        self.hits += int(hit)
+        self.seconds += seconds
+
+    def as_dict(self) -> dict:
+        return {
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "skipped": self.skipped,
+            "hit_rate": round(self.hits / max(self.lookups, 1), 4),
+            "avg_ms": round(1000 * self.seconds / max(self.lookups, 1), 4)
+        }
+
+
+class _LRU:
+    """Least recently used first."""
+
+    def __init__(self):
+        self._order: "OrderedDict[str, None]" = OrderedDict()
+
+    def add(self, key: str, hits: int = 0) -> None:
+        self._order[key] = None
+        self._order.move_to_end(key)
+
+    def touch(self, key: str) -> None:
+        if key in self._order:
+            self._order.move_to_end(key)
+
+    def remove(self, key: str) -> None:
+        self._order.pop(key, None)
+
+    def victim(self, exclude: Optional[str] = None) -> Optional[str]:
+        for key in self._order:
+            if key != exclude:
+                return key
+        return None
+
+    def clear(self) -> None:
+        self._order.clear()
+
+
+class _LFU:
+    """Least frequently used first, ties to the least recent.
+
+    Lazy min-heap: every touch pushes a new (hits, tick, key) entry and
+    stale ones are dropped when they reach the top.
+    """
+
+    def __init__(self):
+        self._current: Dict[str, Tuple[int, int]] = {}
+        self._heap: List[Tuple[int, int, str]] = []
+        self._tick = itertools.count()
+
+    def _push(self, key: str, hits: int) -> None:
+        entry = (hits, next(self._tick))
+        self._current[key] = entry
+        heapq.heappush(self._heap, (*entry, key))
+        if len(self._heap) > 2 * len(self._current) + 1024:
+            self._heap = [(*e, k) for k, e in self._current.items()]
+            heapq.heapify(self._heap)
+
+    def add(self, key: str, hits: int = 0) -> None:
+        self._push(key, hits)
+
+    def touch(self, key: str) -> None:
+        if key in self._current:
+            self._push(key, self._current[key][0] + 1)
+
+    def remove(self, key: str) -> None:
+        self._current.pop(key, None)
+
+    def victim(self, exclude: Optional[str] = None) -> Optional[str]:
+        held = None
+        found = None
+        while self._heap:
+            hits, tick, key = self._heap[0]
+            if self._current.get(key) != (hits, tick):
+                heapq.heappop(self._heap)
+            elif key == exclude:
+                # A new entry has the fewest hits - look past it
+                held = heapq.heappop(self._heap)
+            else:
+                found = key
+                break
+        if held is not None:
+            heapq.heappush(self._heap, held)
+        return found
+
+    def clear(self) -> None:
+        self._current.clear()
+        self._heap.clear()
+
+
+# (namespace, hash) -> {model: engine key}
+ScopedIndex = Dict[Tuple[str, str], Dict[str, str]]
+
+
+def _scoped_add(index: ScopedIndex, scope: Tuple[str, str],
+                model: str, key: str) -> None:
+    index.setdefault(scope, {})[model] = key
+
+
+def _scoped_remove(index: ScopedIndex, scope: Tuple[str, str],
+                   model: str, key: str) -> None:
+    models = index.get(scope)
+    if models is not None and models.get(model) == key:
+        del models[model]
+        if not models:
+            del index[scope]
+
+
+def _scoped_get(index: ScopedIndex, scope: Tuple[str, str],
+                model: Optional[str]) -> Optional[str]:
+    """Key for one model, or the latest written for any model."""
+    models = index.get(scope)
+    if not models:
+        return None
+    if model is not None:
+        return models.get(model)
+    return next(reversed(models.values()))
+
+
+def _entry_bytes(cached: CachedResponse) -> int:
+    """Approximate stored size of an entry (its text payload)."""
+    return len(cached.query_text.encode()) + len(cached.response.encode())
+
+
+class ResponseCache:
+    """Cached AI responses with tiered lookup and bounded capacity.
+
+    Args:
+        engine: Storage engine holding CachedResponse records
+        near_duplicate_distance: Max SimHash distance for a hit (0 = off)
+        flush_interval: Seconds between hit-count flushes
+        sweep_interval: Seconds between expired-entry sweeps
+        max_entries: Entry budget (0 = unbounded)
+        max_bytes: Budget for query + response text (0 = unbounded)
+        eviction: "lru" or "lfu"
+        on_remove: Called with the query hashes of expired/evicted entries
+        background: Run the flush/sweep thread (off = call them yourself)
+    """
+
+    def __init__(self, engine: StorageEngine, near_duplicate_distance: int = 0,
+                 flush_interval: float = 30.0, sweep_interval: float = 300.0,
+                 max_entries: int = 0, max_bytes: int = 0,
+                 eviction: str = "lru",
+                 on_remove: Optional[Callable[[List[str]], None]] = None,
+                 background: bool = True):
+        if eviction not in EVICTION_POLICIES:
+            raise ValueError(
+                f"Unknown eviction policy {eviction!r} "
+                f"(expected one of {', '.join(EVICTION_POLICIES)})"
+            )
+        self.engine = engine
+        self.near_duplicate_distance = near_duplicate_distance
+        self.flush_interval = flush_interval
+        self.sweep_interval = sweep_interval
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.eviction = eviction
+        self.on_remove = on_remove
+
+        self._texts: ScopedIndex = {}
+        self._normalized: ScopedIndex = {}
+        # One SimHash index per namespace
+        self._near: Dict[str, SimHashIndex] = {}
+        self._policy = _LRU() if eviction == "lru" else _LFU()
+        self._sizes: Dict[str, int] = {}
+        self._bytes = 0
+        # Running totals over indexed entries
+        self._hit_total = 0
+        self._by_model: Counter = Counter()
+        self._by_namespace: Counter = Counter()
+        # (expires_at timestamp, query_hash); stale entries skipped lazily
+        self._expiry: List[Tuple[float, str]] = []
+        self._generation: Optional[int] = None
+        self._lock = threading.RLock()
+        self.tiers = {tier: TierStats() for tier in TIERS}
+
+        # query_hash -> hits not yet written to the engine
+        self._pending_hits: Dict[str, int] = {}
+        self._pending_total = 0
+        self.swept = 0
+        self.evicted = 0
+        # Windowed event counts: last hour in 10s buckets
+        self.recent = WindowedCounters(bucket_seconds=10, buckets=360)
+
+        self._stop = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        if background:
+            self._worker = threading.Thread(
+                target=self._maintain, name="response-cache", daemon=True
+            )
+            self._worker.start()
+
+    # ---- indexes --------------------------------------------------------
+
+    @staticmethod
+    def _fingerprints(cached: CachedResponse) -> Tuple[str, int]:
+        """(normalized hash, SimHash), filling them in on older records.
+
+        Records from before structured keys carry a 16-hex query hash;
+        their text hash is rebuilt from the stored query text.
+        """
+        if cached.text_hash is None:
+            cached.text_hash = cache_key(cached.query_text).text_hash
+        if cached.normalized_hash is None or len(cached.normalized_hash) < 64:
+            cached.normalized_hash = digest(normalize_text(cached.query_text))
+        if cached.similarity_hash is None:
+            cached.similarity_hash = f"{simhash(cached.query_text):016x}"
+        return cached.normalized_hash, int(cached.similarity_hash, 16)
+
+    def _index(self, cached: CachedResponse) -> None:
+        key = cached.query_hash
+        namespace = cached.namespace
+        normalized, fingerprint = self._fingerprints(cached)
+        _scoped_add(self._texts, (namespace, cached.text_hash),
+                    cached.model, key)
+        _scoped_add(self._normalized, (namespace, normalized),
+                    cached.model, key)
+        if self.near_duplicate_distance > 0:
+            if namespace not in self._near:
+                self._near[namespace] = SimHashIndex(self.near_duplicate_distance)
+            self._near[namespace].add(key, fingerprint)
+
+        self._policy.add(key, cached.hit_count)
+        size = _entry_bytes(cached)
+        self._bytes += size - self._sizes.get(key, 0)
+        self._sizes[key] = size
+        self._hit_total += cached.hit_count
+        self._by_model[cached.model] += 1
+        self._by_namespace[namespace] += 1
+        if cached.expires_at:
+            heapq.heappush(self._expiry, (cached.expires_at.timestamp(), key))
+            if len(self._expiry) > 2 * len(self._sizes) + 1024:
+                self._rebuild_expiry()
+
+    def _rebuild_expiry(self) -> None:
+        """Drop stale heap entries left by overwrites and removals."""
+        self._expiry = [
+            (cached.expires_at.timestamp(), key)
+            for key, cached in self.engine.get_many(self._sizes).items()
+            if cached.expires_at
+        ]
+        heapq.heapify(self._expiry)
+
+    def _unindex(self, cached: CachedResponse) -> None:
+        key = cached.query_hash
+        namespace = cached.namespace
+        _scoped_remove(self._texts, (namespace, cached.text_hash),
+                       cached.model, key)
+        _scoped_remove(self._normalized, (namespace, cached.normalized_hash),
+                       cached.model, key)
+        near = self._near.get(namespace)
+        if near is not None:
+            near.remove(key)
+            if not len(near):
+                del self._near[namespace]
+        self._policy.remove(key)
+        size = self._sizes.pop(key, None)
+        if size is not None:
+            self._bytes -= size
+            self._hit_total -= cached.hit_count
+            self._by_model[cached.model] -= 1
+            if not self._by_model[cached.model]:
+                del self._by_model[cached.model]
+            self._by_namespace[namespace] -= 1
+            if not self._by_namespace[namespace]:
+                del self._by_namespace[namespace]
+        # Its expiry heap entry goes stale and is skipped by the sweeper
+
+    def _sync(self) -> None:
+        """Rebuild the in-memory indexes after an external change."""
+        self.engine.refresh()
+        if self._generation == self.engine.generation:
+            return
+        self._texts.clear()
+        self._normalized.clear()
+        self._near.clear()
+        self._policy.clear()
+        self._sizes.clear()
+        self._bytes = 0
+        self._hit_total = 0
+        self._by_model.clear()
+        self._by_namespace.clear()
+        self._expiry = []
+        for cached in self.engine.values():
+            self._index(cached)
+        self._generation = self.engine.generation
+
+    # ---- reads ----------------------------------------------------------
+
+    def lookup(self, key: Union[CacheKey, str],
+               similarity_threshold: Optional[float] = None,
+               fuzzy: Optional[bool] = None) -> Optional[CachedResponse]:
+        """Try the exact, normalized and near-duplicate tiers in order.
+
+        A fresh hit is counted (in memory); expired entries are misses.
+
+        Args:
+            key: Cache key, or a free-form query (any model)
+            similarity_threshold: Caller's minimum similarity (0-1); caps
+                the near-duplicate distance (see distance_for)
+            fuzzy: Also try the normalized and near-duplicate tiers
+                (False = exact key only; None = only for free-form
+                queries, see CacheKey.templated)
+
+        Returns:
+            The cached entry, or None if every tier missed
+        """
+        if isinstance(key, str):
+            key = cache_key(key)
+        if fuzzy is None:
+            fuzzy = not key.templated
+        namespace, model = key.namespace, key.model
+        with self._lock:
+            self._sync()
+
+            start = time.perf_counter()
+            # Via the text index rather than str(key): it also finds any
+            # model's entry, and entries stored under pre-structured keys
+            target = _scoped_get(self._texts, (namespace, key.text_hash), model)
+            cached = self._fresh(target) if target else None
+            self._record("exact", cached, start)
+            if cached is not None:
+                return cached
+
+            if not fuzzy:
+                self.tiers["normalized"].skipped += 1
+                self.tiers["near_duplicate"].skipped += 1
+                return None
+
+            start = time.perf_counter()
+            target = _scoped_get(
+                self._normalized, (namespace, key.normalized_hash), model
+            )
+            cached = self._fresh(target) if target else None
+            self._record("normalized", cached, start)
+            if cached is not None:
+                return cached
+
+            near = self._near.get(namespace)
+            distance = self.near_duplicate_distance
+            if similarity_threshold is not None:
+                distance = min(distance, distance_for(similarity_threshold))
+            if distance <= 0 or near is None:
+                self.tiers["near_duplicate"].skipped += 1
+                return None
+            start = time.perf_counter()
+            match = near.find(simhash(key.text), distance)
+            cached = self._fresh(match[0], model) if match else None
+            self._record("near_duplicate", cached, start)
+            return cached
+
+    def resolve(self, query_hash: str) -> Optional[CachedResponse]:
+        """Live entry for a vector search match (counts the hit).
+
+        Guards the semantic tier against points whose entry is gone.
+        """
+        with self._lock:
+            return self._fresh(query_hash)
+
+    def _fresh(self, query_hash: str,
+               model: Optional[str] = None) -> Optional[CachedResponse]:
+        """Unexpired entry, counting the hit in memory only.
+
+        Args:
+            query_hash: Engine key
+            model: Reject entries from other models (None = any)
+        """
+        cached = self.engine.get(query_hash)
+        if cached is None or (model is not None and cached.model != model):
+            return None
+        if cached.expires_at and datetime.now() < cached.expires_at:
+            self._pending_hits[query_hash] = (
+                self._pending_hits.get(query_hash, 0) + 1
+            )
+            self._pending_total += 1
+            self._policy.touch(query_hash)
+            return cached
+        # Expired - the sweeper removes it
+        return None
+
+    def _record(self, tier: str, cached, start: float) -> None:
+        hit = cached is not None
+        self.tiers[tier].record(hit, time.perf_counter() - start)
+        self.recent.add(f"{tier}.{'hits' if hit else 'misses'}")
+
+    def record(self, tier: str, hit: bool, seconds: float) -> None:
+        """Record a lookup done outside this class (the semantic tier)."""
+        with self._lock:
+            self.tiers[tier].record(hit, seconds)
+            self.recent.add(f"{tier}.{'hits' if hit else 'misses'}")
+
+    def skip(self, tier: str) -> None:
+        """Count a tier that was not worth running."""
+        with self._lock:
+            self.tiers[tier].skipped += 1
+
+    # ---- writes ---------------------------------------------------------
+
+    def put(self, cached: CachedResponse) -> None:
+        """Store an entry, evicting others if over budget."""
+        self.put_many([cached])
+
+    def put_many(self, entries: List[CachedResponse]) -> None:
+        """Store entries with one engine write, then enforce the budget."""
+        # Last write wins for repeated queries
+        entries = list({cached.query_hash: cached for cached in entries}.values())
+        if not entries:
+            return
+        with self._lock:
+            self._sync()
+            old = self.engine.get_many(cached.query_hash for cached in entries)
+            for cached in old.values():
+                self._unindex(cached)
+            for cached in entries:
+                self._fingerprints(cached)
+            self.engine.put_many((cached.query_hash, cached) for cached in entries)
+            for cached in entries:
+                self._index(cached)
+            self.recent.add("stored", len(entries))
+            evicted = self._enforce_budget(keep=entries[-1].query_hash)
+        self._notify(evicted)
+
+    def delete(self, query_hash: str) -> bool:
+        with self._lock:
+            removed = self._remove(query_hash)
+        if removed:
+            self._notify([query_hash])
+        return removed
+
+    def clear_namespace(self, namespace: str) -> int:
+        """Remove every entry in one namespace (prompt template).
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            self._sync()
+            if not self._by_namespace.get(namespace):
+                return 0
+            keys = [
+                key for key, cached in self.engine.get_many(self._sizes).items()
+                if cached.namespace == namespace
+            ]
+            removed = [key for key in keys if self._remove(key)]
+        self._notify(removed)
+        return len(removed)
+
+    def _remove(self, query_hash: str) -> bool:
+        cached = self.engine.get(query_hash)
+        if cached is None:
+            return False
+        self._unindex(cached)
+        self._pending_total -= self._pending_hits.pop(query_hash, 0)
+        return self.engine.delete(query_hash)
+
+    def _over_budget(self) -> bool:
+        return bool(
+            (self.max_entries and len(self._sizes) > self.max_entries)
+            or (self.max_bytes and self._bytes > self.max_bytes)
+        )
+
+    def _enforce_budget(self, keep: Optional[str] = None) -> List[str]:
+        """Evict until within budget (never the entry just written)."""
+        evicted = []
+        while self._over_budget():
+            victim = self._policy.victim(exclude=keep)
+            if victim is None:
+                break
+            if not self._remove(victim):
+                # Index out of step with the engine - just forget it
+                self._policy.remove(victim)
+                self._bytes -= self._sizes.pop(victim, 0)
+                continue
+            evicted.append(victim)
+        if evicted:
+            self.evicted += len(evicted)
+            self.recent.add("evicted", len(evicted))
+        return evicted
+
+    def _notify(self, query_hashes: List[str]) -> None:
+        if query_hashes and self.on_remove is not None:
+            try:
+                self.on_remove(query_hashes)
+            except Exception as e:
+                print(f"Cache removal hook failed (non-critical): {e}")
+
+    # ---- background maintenance -----------------------------------------
+
+    def flush_hits(self) -> int:
+        """Write accumulated hit counts in one batch.
+
+        Returns:
+            Number of entries updated
+        """
+        with self._lock:
+            pending, self._pending_hits = self._pending_hits, {}
+            self._pending_total = 0
+            if not pending:
+                return 0
+            entries = self.engine.get_many(pending)
+            for query_hash, cached in entries.items():
+                cached.hit_count += pending[query_hash]
+                if query_hash in self._sizes:
+                    self._hit_total += pending[query_hash]
+            self.engine.put_many(entries.items())
+            return len(entries)
+
+    def sweep(self) -> int:
+        """Delete entries whose TTL has passed (and enforce the budget).
+
+        Pops due entries off the expiry heap, so the cost is proportional
+        to what expired, not to the cache size.
+
+        Returns:
+            Number of entries removed
+        """
+        now = time.time()
+        removed = []
+        with self._lock:
+            self._sync()
+            while self._expiry and self._expiry[0][0] <= now:
+                expires_ts, query_hash = heapq.heappop(self._expiry)
+                cached = self.engine.get(query_hash)
+                # Skip heap entries for replaced or already removed entries
+                if (cached is None or cached.expires_at is None
+                        or cached.expires_at.timestamp() != expires_ts):
+                    continue
+                if self._remove(query_hash):
+                    removed.append(query_hash)
+            if removed:
+                self.swept += len(removed)
+                self.recent.add("expired", len(removed))
+            removed += self._enforce_budget()
+        self._notify(removed)
+        return len(removed)
+
+    def _maintain(self) -> None:
+        next_sweep = time.monotonic() + self.sweep_interval
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush_hits()
+                if time.monotonic() >= next_sweep:
+                    self.sweep()
+                    next_sweep = time.monotonic() + self.sweep_interval
+            except Exception as e:
+                print(f"Cache maintenance failed (non-critical): {e}")
+
+    def close(self) -> None:
+        """Stop the background thread and flush pending hit counts."""
+        self._stop.set()
+        if self._worker is not None:
+            self._worker.join(timeout=5)
+            self._worker = None
+        self.flush_hits()
+
+    # ---- stats ----------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.engine)
+
+    def pending_hits(self) -> int:
+        """Hits counted but not yet flushed."""
+        return self._pending_total
+
+    def _due(self, now: float) -> int:
+        """Entries past their TTL but not yet swept.
+
+        Walks only the heap nodes that are due (a node's children are
+        never earlier than it), so the cost tracks the backlog, not the
+        cache size.
+        """
+        heap = self._expiry
+        due = 0
+        stack = [0] if heap else []
+        while stack:
+            i = stack.pop()
+            expires_ts, query_hash = heap[i]
+            if expires_ts > now:
+                continue
+            cached = self.engine.get(query_hash)
+            if (cached is not None and cached.expires_at is not None
+                    and cached.expires_at.timestamp() == expires_ts):
+                due += 1
+            stack.extend(c for c in (2 * i + 1, 2 * i + 2) if c < len(heap))
+        return due
+
+    def totals(self) -> dict:
+        """Entry, hit and expiry totals from the running counters."""
+        with self._lock:
+            self._sync()
+            entries = len(self._sizes)
+            expired = self._due(time.time())
+            return {
+                "total_cached": entries,
+                "total_hits": self._hit_total + self._pending_total,
+                "expired_entries": expired,
+                "active_entries": entries - expired,
+                "by_model": dict(self._by_model),
+                "by_namespace": dict(self._by_namespace)
+            }
+
+    def usage(self) -> dict:
+        """Capacity use against the configured budgets."""
+        with self._lock:
+            return {
+                "entries": len(self._sizes),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "eviction": self.eviction,
+                "evicted": self.evicted,
+                "expired": self.swept
+            }
+
+    def stats(self) -> dict:
+        """Per-tier counters plus the overall hit rate."""
+        with self._lock:
+            tiers = {name: t.as_dict() for name, t in self.tiers.items()}
+            requests = self.tiers["exact"].lookups
+            hits = sum(t.hits for t in self.tiers.values())
+            return {
+                "lookups": requests,
+                "hits": hits,
+                "hit_rate": round(hits / max(requests, 1), 4),
+                "tiers": tiers
+            }
+
+    def window(self, seconds: Optional[float] = None) -> dict:
+        """Lookups, hits and removals over the last ``seconds``.
+
+        Args:
+            seconds: Window length (default: the last hour)
+        """
+        counts = self.recent.window(seconds)
+        tiers = {
+            tier: {"hits": int(counts.get(f"{tier}.hits", 0)),
+                   "misses": int(counts.get(f"{tier}.misses", 0))}
+            for tier in TIERS
+        }
+        lookups = tiers["exact"]["hits"] + tiers["exact"]["misses"]
+        hits = sum(t["hits"] for t in tiers.values())
+        return {
+            "seconds": seconds or self.recent.span_seconds,
+            "lookups": lookups,
+            "hits": hits,
+            "hit_rate": round(hits / max(lookups, 1), 4),
+            "stored": int(counts.get("stored", 0)),
+            "evicted": int(counts.get("evicted", 0)),
+            "expired": int(counts.get("expired", 0)),
+            "tiers": tiers
+        }
@@ -0,0 +1,180 @@
+"""Segmented Log
+
+Append-only JSON Lines log for records that are only ever appended and
+read back by time range (the chat log). Segments rotate at midnight and
+when they pass ``max_bytes``:
+
+    conversations/2026-10-17.000.jsonl   First segment of the day
+    conversations/2026-10-17.001.jsonl   Next one, once .000 was full
+
+A write appends one line, so its cost doesn't grow with history.
+read(since=...) opens only the segments from that day on and yields
+records one at a time - the history never has to fit in memory.
+
+Usage:
+    >>> log = SegmentedLog(DATA_ROOT / "memory" / "conversations")
+    >>> log.append({"timestamp": datetime.now(), "query": "..."})
+    >>> for record in log.read(since=datetime.now() - timedelta(days=7)):
+    ...     print(record["query"])
+"""
+
+import json
+import os
+import re
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+_SEGMENT = re.compile(r"^(\d{4}-\d{2}-\d{2})\.(\d{3,})\.jsonl$")
+
+
+def _encode(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Not JSON serializable: {type(value).__name__}")
+
+
+class SegmentedLog:
+    """Day/size-rotated JSON Lines log.
+
+    Args:
+        directory: Directory holding the segment files
+        max_bytes: Rotate a segment once it reaches this size
+        timestamp_field: Record field (a datetime) that picks the segment
+    """
+
+    def __init__(self, directory: Path, max_bytes: int = 64 * 1024 * 1024,
+                 timestamp_field: str = "timestamp"):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.timestamp_field = timestamp_field
+
+        self._file = None
+        self._day: Optional[date] = None
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    # ---- segments -------------------------------------------------------
+
+    def _segments(self) -> List[Tuple[date, int, Path]]:
+        found = []
+        for path in self.directory.iterdir():
+            match = _SEGMENT.match(path.name)
+            if match:
+                day = date.fromisoformat(match.group(1))
+                found.append((day, int(match.group(2)), path))
+        found.sort()
+        return found
+
+    def segments(self, since: Optional[date] = None,
+                 until: Optional[date] = None) -> List[Path]:
+        """Segment files covering [since, until] days, oldest first."""
+        return [
+            path for day, _, path in self._segments()
+            if (since is None or day >= since)
+            and (until is None or day <= until)
+        ]
+
+    def _path(self, day: date, seq: int) -> Path:
+        return self.directory / f"{day.isoformat()}.{seq:03d}.jsonl"
+
+    def _open_for(self, day: date) -> None:
+        """Point the writer at the newest segment for ``day``."""
+        if self._file is not None:
+            self._file.close()
+        seqs = [seq for d, seq, _ in self._segments() if d == day]
+        self._day = day
+        self._seq = max(seqs) if seqs else 0
+        path = self._path(day, self._seq)
+        if path.exists() and path.stat().st_size >= self.max_bytes:
+            self._seq += 1
+            path = self._path(day, self._seq)
+        self._file = open(path, "ab", buffering=0)
+
+    # ---- writes ---------------------------------------------------------
+
+    def append(self, record: dict) -> None:
+        self.append_many([record])
+
+    def append_many(self, records: Iterable[dict]) -> int:
+        """Append records to their own day's segment and return how many.
+
+        Records for an earlier day (late arrivals, backfills) go to that
+        day's newest segment, so read(since=...) and read_day() find
+        them; the writer moves back to the newer day with the next one.
+        """
+        count = 0
+        with self._lock:
+            lines = []
+            for record in records:
+                day = record[self.timestamp_field].date()
+                if self._file is None or day != self._day:
+                    self._write(lines)
+                    lines = []
+                    self._open_for(day)
+                lines.append(json.dumps(record, default=_encode) + "\n")
+                count += 1
+            self._write(lines)
+        return count
+
+    def _write(self, lines: List[str]) -> None:
+        if not lines:
+            return
+        # One write() per batch so concurrent readers never see half a line
+        self._file.write("".join(lines).encode())
+        if os.fstat(self._file.fileno()).st_size >= self.max_bytes:
+            self._seq += 1
+            self._file.close()
+            self._file = open(self._path(self._day, self._seq), "ab", buffering=0)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    # ---- reads ----------------------------------------------------------
+
+    def days(self) -> List[date]:
+        """Days that have at least one segment, oldest first."""
+        return sorted({day for day, _, _ in self._segments()})
+
+    def _read_segment(self, path: Path) -> Iterator[dict]:
+        field = self.timestamp_field
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Torn last line from a crashed writer
+                    continue
+                record[field] = datetime.fromisoformat(record[field])
+                yield record
+
+    def read_day(self, day: date) -> Iterator[dict]:
+        """Stream every record in the segments for one day."""
+        for path in self.segments(day, day):
+            yield from self._read_segment(path)
+
+    def read(self, since: Optional[datetime] = None,
+             until: Optional[datetime] = None) -> Iterator[dict]:
+        """Stream records with since < timestamp <= until, oldest first."""
+        field = self.timestamp_field
+        segments = self.segments(
+            since.date() if since else None, until.date() if until else None
+        )
+        for path in segments:
+            for record in self._read_segment(path):
+                if since is not None and record[field] <= since:
+                    continue
+                if until is not None and record[field] > until:
+                    continue
+                yield record
+
+    def __iter__(self) -> Iterator[dict]:
+        return self.read()
+
+    def size_bytes(self) -> int:
+        return sum(path.stat().st_size for _, _, path in self._segments())
@@ -0,0 +1,315 @@
+"""SQLite Storage Engine
+
+Optional engine (STORAGE_ENGINE=sqlite) that keeps records in an indexed
+table instead of in memory. Record metadata is stored as a JSON column
+with expression indexes on the fields the job tools filter by, so
+metadata queries don't have to scan and decode every record. Values
+are serialized with secondbrain.storage.codec.
+
+Usage:
+    >>> engine = open_engine("sqlite", DATA_ROOT / "memory" / "memory")
+    >>> engine.query({"type": "job_application", "status": "applied"},
+    ...              order_by="-date_applied", limit=20)
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, List, Optional
+
+from . import codec
+from .engine import (
+    StorageEngine, LogEngine, RECORD_FIELDS,
+    parse_filter, parse_order_by, _load_pickle
+)
+
+# Metadata fields with a secondary index
+INDEXED_FIELDS = ("type", "status", "company", "date_applied")
+
+# Composite indexes for the common "records of type X where ..." queries
+COMPOSITE_INDEXES = (("type", "status"), ("type", "date_applied"))
+
+# fsync policy -> PRAGMA synchronous
+_SYNCHRONOUS = {"always": "FULL", "interval": "NORMAL", "never": "OFF"}
+
+# PRAGMA user_version once older stores have been imported (0 = not yet)
+_IMPORTED_VERSION = 1
+
+_SQL_OPS = {"eq": "=", "ne": "!=", "lt": "<", "lte": "<=",
+            "gt": ">", "gte": ">="}
+
+
+def _metadata_expr(name: str) -> str:
+    # Must match the index expressions exactly for the planner to use them
+    return f"json_extract(metadata, '$.{name}')"
+
+
+def _column(name: str) -> str:
+    return name if name in RECORD_FIELDS else _metadata_expr(name)
+
+
+def _sql_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, bool):
+        return int(value)
+    return value
+
+
+def _iso(value: Any) -> Optional[str]:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+class SQLiteEngine(StorageEngine):
+    """SQLite-backed engine with JSON metadata and indexed queries.
+
+    Args:
+        base_path: Path prefix; the database is ``<base_path>.db``
+        legacy_file: Full-store pickle to import into a new database
+        fsync: Durability policy, mapped to PRAGMA synchronous
+    """
+
+    name = "sqlite"
+
+    def __init__(self, base_path: Path, legacy_file: Optional[Path] = None,
+                 fsync: str = "interval", **_options):
+        base_path = Path(base_path)
+        self.path = Path(str(base_path) + ".db")
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            str(self.path), check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA synchronous={_SYNCHRONOUS.get(fsync, 'NORMAL')}")
+        self._create_schema()
+
+        # Import once - a table emptied later must stay empty, not be
+        # refilled from stale snapshot/log/pickle files
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < _IMPORTED_VERSION and len(self) == 0:
+            self._import_existing(base_path, legacy_file)
+        else:
+            self._migrate_pickled_rows()
+        if version < _IMPORTED_VERSION:
+            self._conn.execute(f"PRAGMA user_version = {_IMPORTED_VERSION}")
+        self._data_version = self._read_data_version()
+
+    def _create_schema(self) -> None:
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS records (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                metadata TEXT NOT NULL DEFAULT '{}',
+                created_at TEXT,
+                updated_at TEXT
+            )
+        """)
+        for fields in [(name,) for name in INDEXED_FIELDS] + list(COMPOSITE_INDEXES):
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_records_{'_'.join(fields)} "
+                f"ON records({', '.join(_metadata_expr(f) for f in fields)})"
+            )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_records_updated_at "
+            "ON records(updated_at)"
+        )
+
+    def _import_existing(self, base_path: Path,
+                         legacy_file: Optional[Path]) -> None:
+        """Seed a new database from log-engine files or a legacy pickle."""
+        log_files = [Path(str(base_path) + suffix)
+                     for suffix in (".snapshot", ".log")]
+        if any(p.exists() for p in log_files):
+            source = LogEngine(base_path)
+            data = dict(source.items())
+            source.close()
+        elif legacy_file is not None:
+            data = _load_pickle(Path(legacy_file))
+        else:
+            return
+
+        if data:
+            self.put_many(data.items())
+
+    def _migrate_pickled_rows(self, chunk_size: int = 1000) -> None:
+        """Re-encode values pickled by older versions (once per database)."""
+        with self._lock:
+            keys = [r[0] for r in self._conn.execute(
+                "SELECT key FROM records WHERE substr(value, 1, 1) = x'80'"
+            )]
+        for i in range(0, len(keys), chunk_size):
+            chunk = keys[i:i + chunk_size]
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM records WHERE key IN "
+                    f"({', '.join('?' * len(chunk))})", chunk
+                ).fetchall()
+            self.put_many(
+                (k, codec.loads(v, allow_pickle=True)) for k, v in rows
+            )
+
+    # ---- external changes -----------------------------------------------
+
+    def _read_data_version(self) -> int:
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def refresh(self) -> bool:
+        """Bump generation if another connection committed since last check.
+
+        Reads always hit the table, so there is nothing to reload - but
+        in-memory indexes built on top (ResponseCache) must be rebuilt.
+        PRAGMA data_version only changes for other connections' commits,
+        so this connection's own writes don't count.
+        """
+        with self._lock:
+            version = self._read_data_version()
+            if version == self._data_version:
+                return False
+            self._data_version = version
+            self.generation += 1
+            return True
+
+    # ---- reads ----------------------------------------------------------
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM records WHERE key = ?", (key,)
+            ).fetchone()
+        return codec.loads(row[0]) if row else default
+
+    def get_many(self, keys) -> dict:
+        keys = list(keys)
+        found = {}
+        # Stay under SQLite's bound-parameter limit
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM records WHERE key IN "
+                    f"({', '.join('?' * len(chunk))})", chunk
+                ).fetchall()
+            found.update((k, codec.loads(v)) for k, v in rows)
+        return found
+
+    def keys(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT key FROM records").fetchall()
+        return [r[0] for r in rows]
+
+    def values(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT value FROM records").fetchall()
+        return [codec.loads(r[0]) for r in rows]
+
+    def items(self):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value FROM records"
+            ).fetchall()
+        return [(k, codec.loads(v)) for k, v in rows]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM records"
+            ).fetchone()[0]
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM records WHERE key = ?", (key,)
+            ).fetchone() is not None
+
+    def query(self, filter: Optional[dict] = None,
+              order_by: Optional[str] = None,
+              limit: Optional[int] = None) -> List[Any]:
+        """Indexed metadata query - see StorageEngine.query."""
+        where = []
+        params = []
+        for name, op, arg in parse_filter(filter):
+            column = _column(name)
+            if op == "in":
+                values = [_sql_value(v) for v in arg]
+                if not values:
+                    return []
+                where.append(f"{column} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+            elif arg is None and op in ("eq", "ne"):
+                where.append(f"{column} IS {'NOT ' if op == 'ne' else ''}NULL")
+            elif op == "ne":
+                where.append(f"({column} IS NULL OR {column} != ?)")
+                params.append(_sql_value(arg))
+            else:
+                where.append(f"{column} {_SQL_OPS[op]} ?")
+                params.append(_sql_value(arg))
+
+        sql = "SELECT value FROM records"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        if order_by:
+            name, descending = parse_order_by(order_by)
+            column = _column(name)
+            # NULLs last either way, matching the scan implementation
+            sql += (f" ORDER BY {column} IS NULL, {column}"
+                    f"{' DESC' if descending else ''}")
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [codec.loads(r[0]) for r in rows]
+
+    # ---- writes ---------------------------------------------------------
+
+    def put(self, key: str, value: Any) -> None:
+        self.put_many([(key, value)])
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM records WHERE key = ?", (key,)
+            )
+        return cursor.rowcount > 0
+
+    def put_many(self, items) -> None:
+        rows = [
+            (
+                key,
+                codec.dumps(value),
+                json.dumps(getattr(value, "metadata", None) or {},
+                           default=str),
+                _iso(getattr(value, "created_at", None)),
+                _iso(getattr(value, "updated_at", None)),
+            )
+            for key, value in items
+        ]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO records "
+                    "(key, value, metadata, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    # ---- lifecycle ------------------------------------------------------
+
+    def flush(self) -> None:
+        with self._lock:
+            self._conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def close(self) -> None:
+        with self._lock:
+            try:
+                self._conn.close()
+            except sqlite3.ProgrammingError:
+                pass
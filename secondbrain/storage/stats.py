@@ -0,0 +1,227 @@
+"""Windowed counters and daily rollups
+
+Running statistics that cost O(1) to update and to read, so dashboards
+can poll every second.
+
+    WindowedCounters  Recent events in fixed-width time buckets; buckets
+                      older than the span fall off and are subtracted
+                      from the running span totals
+    DailyRollups      Per-day (and per-hour) totals over a SegmentedLog,
+                      saved beside the segments once a day is over, so
+                      a window of N days costs N dict merges
+
+Usage:
+    >>> recent = WindowedCounters(bucket_seconds=10, buckets=360)  # 1 hour
+    >>> recent.add("hits")
+    >>> recent.add("cost:claude", 0.003)
+    >>> recent.window(60)      # last minute
+    >>> recent.window()        # whole span, from the running totals
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from collections import Counter, deque
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+
+class WindowedCounters:
+    """Named counters over a sliding window of time buckets.
+
+    Args:
+        bucket_seconds: Width of one bucket (the window resolution)
+        buckets: Buckets kept; span = bucket_seconds * buckets
+        clock: Time source (seconds)
+    """
+
+    def __init__(self, bucket_seconds: float = 10.0, buckets: int = 360,
+                 clock: Callable[[], float] = time.time):
+        self.bucket_seconds = bucket_seconds
+        self.buckets = buckets
+        self._clock = clock
+        # (bucket index, counters) - only buckets that saw events
+        self._buckets: "deque[tuple]" = deque()
+        self._span = Counter()
+        self._lock = threading.Lock()
+
+    @property
+    def span_seconds(self) -> float:
+        return self.bucket_seconds * self.buckets
+
+    def _expire(self, index: int) -> None:
+        while self._buckets and self._buckets[0][0] <= index - self.buckets:
+            _, counters = self._buckets.popleft()
+            self._span.subtract(counters)
+
+    def add(self, name: str, value: float = 1,
+            at: Optional[float] = None) -> None:
+        """Count ``value`` under ``name`` (now, or at a past timestamp)."""
+        index = int((self._clock() if at is None else at) // self.bucket_seconds)
+        with self._lock:
+            now_index = int(self._clock() // self.bucket_seconds)
+            self._expire(now_index)
+            if index <= now_index - self.buckets:
+                return
+            if self._buckets and self._buckets[-1][0] == index:
+                self._buckets[-1][1][name] += value
+            elif not self._buckets or self._buckets[-1][0] < index:
+                self._buckets.append((index, Counter({name: value})))
+            else:
+                # Backfilled event - find (or insert) its bucket
+                for i, (bucket_index, counters) in enumerate(self._buckets):
+                    if bucket_index == index:
+                        counters[name] += value
+                        break
+                    if bucket_index > index:
+                        self._buckets.insert(i, (index, Counter({name: value})))
+                        break
+            self._span[name] += value
+
+    def window(self, seconds: Optional[float] = None) -> Dict[str, float]:
+        """Totals over the last ``seconds`` (default: the whole span)."""
+        with self._lock:
+            now_index = int(self._clock() // self.bucket_seconds)
+            self._expire(now_index)
+            if seconds is None or seconds >= self.span_seconds:
+                totals = self._span
+            else:
+                first = now_index - math.ceil(seconds / self.bucket_seconds) + 1
+                totals = Counter()
+                for index, counters in reversed(self._buckets):
+                    if index < first:
+                        break
+                    totals.update(counters)
+            return {k: v for k, v in totals.items() if v}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+            self._span.clear()
+
+
+class DailyRollups:
+    """Per-day counter rollups over a SegmentedLog.
+
+    Each day holds per-hour counters plus their total. Finished days are
+    recounted from their segments (so every process's records are in)
+    and saved as ``YYYY-MM-DD.rollup.json`` next to the segments, then
+    loaded on open; only days without one (today, or days logged before
+    rollups existed) are read back from the log.
+
+    A window is the sum of the whole days after its start plus the hours
+    of its first day, so the window edge has one-hour resolution.
+
+    Args:
+        log: SegmentedLog the rollups summarize
+        counts: Maps a record to its counter increments
+    """
+
+    def __init__(self, log, counts: Callable[[dict], Dict[str, float]]):
+        self.log = log
+        self._counts = counts
+        self._days: Dict[date, Counter] = {}
+        self._hours: Dict[date, Dict[int, Counter]] = {}
+        self._saved = set()
+        self._latest: Optional[date] = None
+        self._lock = threading.Lock()
+        self._load()
+
+    def _path(self, day: date) -> Path:
+        return self.log.directory / f"{day.isoformat()}.rollup.json"
+
+    def _load(self) -> None:
+        today = date.today()
+        for day in self.log.days():
+            path = self._path(day)
+            if day < today and path.exists():
+                try:
+                    with open(path) as f:
+                        hours = json.load(f)["hours"]
+                    self._hours[day] = {
+                        int(hour): Counter(counts)
+                        for hour, counts in hours.items()
+                    }
+                    self._days[day] = sum(self._hours[day].values(), Counter())
+                    self._saved.add(day)
+                    continue
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"Rollup {path.name} unreadable, rebuilding: {e}")
+            if day < today:
+                self._save(day)
+            else:
+                for record in self.log.read_day(day):
+                    self._add(record)
+
+    def _add(self, record: dict) -> None:
+        at = record[self.log.timestamp_field]
+        day = at.date()
+        counts = self._counts(record)
+        hours = self._hours.setdefault(day, {})
+        hours.setdefault(at.hour, Counter()).update(counts)
+        self._days.setdefault(day, Counter()).update(counts)
+        if self._latest is None or day > self._latest:
+            self._latest = day
+
+    def _save(self, day: date) -> None:
+        """Recount a finished day from the log and save its rollup.
+
+        Counted from the segments rather than this process's counters,
+        so records other processes logged that day are included.
+        """
+        self._hours.pop(day, None)
+        self._days.pop(day, None)
+        for record in self.log.read_day(day):
+            self._add(record)
+
+        path = self._path(day)
+        # Per-process temp file; the replace itself is atomic
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp, "w") as f:
+                json.dump({"hours": {str(hour): dict(counts) for hour, counts
+                                     in self._hours.get(day, {}).items()}}, f)
+            os.replace(tmp, path)
+            self._saved.add(day)
+        except OSError as e:
+            print(f"Rollup save failed (non-critical): {e}")
+
+    def _save_before(self, day: date) -> None:
+        """Save rollups of days before ``day`` that aren't saved yet."""
+        for done in [d for d in self._days if d < day and d not in self._saved]:
+            self._save(done)
+
+    def add(self, record: dict) -> None:
+        """Count a record just appended to the log."""
+        with self._lock:
+            day = record[self.log.timestamp_field].date()
+            if day in self._saved:
+                # Late record for a finished day: recount its saved rollup
+                self._save(day)
+                return
+            latest = self._latest
+            self._add(record)
+            if latest is not None and self._latest > latest:
+                # A new day started - the previous ones are final
+                self._save_before(self._latest)
+
+    def window(self, since: datetime) -> Dict[str, float]:
+        """Totals for records after ``since`` (rounded up to the hour)."""
+        first = since.date()
+        totals = Counter()
+        with self._lock:
+            last = max(self._latest or first, date.today())
+            for offset in range(1, (last - first).days + 1):
+                totals.update(self._days.get(first + timedelta(days=offset), {}))
+            for hour, counts in self._hours.get(first, {}).items():
+                if hour > since.hour:
+                    totals.update(counts)
+        return {k: v for k, v in totals.items() if v}
+
+    def day(self, day: date) -> Dict[str, float]:
+        """Totals for one day."""
+        with self._lock:
+            return dict(self._days.get(day, {}))
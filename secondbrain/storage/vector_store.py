@@ -1,15 +1,70 @@
 """Vector Store
 
-Qdrant integration for similarity search.
+Qdrant integration for similarity search. Falls back to the embedded
+LocalVectorStore (local_index.py) when Qdrant can't be reached.
+
+Qdrant only accepts unsigned ints or UUIDs as point IDs, so callers'
+string keys (e.g. "conversation:ab12...") are mapped to a deterministic
+UUIDv5 (see point_id). The original key is kept in the payload under
+KEY_FIELD, which is payload-indexed, and is what search/get return as
+"id" - callers never see the UUIDs.
+
+search() takes an optional payload filter in the engine query syntax
+({"model": "x", "expires_at": {"gt": time.time()}}), applied by Qdrant
+before ranking so non-matching points never take a top-k slot. Fields
+in PAYLOAD_INDEXES get a payload index.
 """
 
 import hashlib
-from typing import List, Optional, Dict, Any
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Dict, Any
 from pathlib import Path
 
+from shared.utils.vectors import VectorLike, to_list
+from .engine import parse_filter
+
 # Lazy imports - only load when needed
 _qdrant_client = None
 
+# Namespace for key -> point ID mapping. Never change it: existing points
+# would no longer be found by key.
+POINT_NAMESPACE = uuid.UUID("6f1c1a52-3b8e-5d8a-9c39-2d0e8f4b7a10")
+
+# Payload field holding the caller's original key
+KEY_FIELD = "key"
+
+
+def point_id(key: Any) -> str:
+    """Deterministic Qdrant point ID (UUIDv5) for a key."""
+    return str(uuid.uuid5(POINT_NAMESPACE, str(key)))
+
+
+def qdrant_filter(filter: Optional[dict]):
+    """Translate an engine-style payload filter to a Qdrant Filter."""
+    conditions = parse_filter(filter)
+    if not conditions:
+        return None
+
+    from qdrant_client.models import (
+        FieldCondition, Filter, IsNullCondition, MatchAny, MatchValue,
+        PayloadField, Range
+    )
+    must, must_not = [], []
+    for name, op, arg in conditions:
+        if arg is None and op in ("eq", "ne"):
+            condition = IsNullCondition(is_null=PayloadField(key=name))
+        elif op in ("eq", "ne"):
+            condition = FieldCondition(key=name, match=MatchValue(value=arg))
+        elif op == "in":
+            condition = FieldCondition(key=name, match=MatchAny(any=list(arg)))
+        else:
+            condition = FieldCondition(key=name, range=Range(**{op: arg}))
+        (must_not if op == "ne" else must).append(condition)
+    return Filter(must=must or None, must_not=must_not or None)
+
+
 def _get_qdrant_client():
     global _qdrant_client
     if _qdrant_client is None:
@@ -25,8 +80,14 @@ class VectorStore:
     COLLECTION_DOCUMENTS = "documents"
     COLLECTION_KNOWLEDGE = "knowledge"
     
-    # Embedding dimension (using all-MiniLM-L6-v2 = 384)
-    VECTOR_SIZE = 384
+    # Embedding dimension (nomic-embed-text = 768)
+    VECTOR_SIZE = 768
+    
+    # Filterable payload fields per collection -> PayloadSchemaType
+    PAYLOAD_INDEXES = {
+        COLLECTION_QUERIES: {"expires_at": "float", "model": "keyword",
+                             "namespace": "keyword"}
+    }
     
     def __init__(self, host: str = "localhost", port: int = 6333):
         self.host = host
@@ -45,8 +106,8 @@ class VectorStore:
             return False
     
     def _ensure_collections(self) -> None:
-        """Create collections if they don't exist."""
-        from qdrant_client.models import Distance, VectorParams
+        """Create collections and payload indexes if missing."""
+        from qdrant_client.models import Distance, PayloadSchemaType, VectorParams
         
         collections = [
             self.COLLECTION_QUERIES,
@@ -56,8 +117,22 @@ class VectorStore:
         
         for collection in collections:
             try:
-                self._client.get_collection(collection)
+                info = self._client.get_collection(collection)
             except Exception:
+                info = None
+            
+            if info is not None and self._vector_size(info) != self.VECTOR_SIZE:
+                if info.points_count:
+                    print(f"Collection {collection} has dimension "
+                          f"{self._vector_size(info)}, expected "
+                          f"{self.VECTOR_SIZE} - re-create it and run "
+                          f"reindex_knowledge()")
+                    continue
+                # Empty collection from the old 384-dim default
+                self._client.delete_collection(collection)
+                info = None
+            
+            if info is None:
                 self._client.create_collection(
                     collection_name=collection,
                     vectors_config=VectorParams(
@@ -65,8 +140,42 @@ class VectorStore:
                         distance=Distance.COSINE
                     )
                 )
+            
+            indexed = (info.payload_schema or {}) if info is not None else {}
+            wanted = {KEY_FIELD: "keyword",
+                      **self.PAYLOAD_INDEXES.get(collection, {})}
+            for field, schema in wanted.items():
+                if field not in indexed:
+                    self._client.create_payload_index(
+                        collection_name=collection,
+                        field_name=field,
+                        field_schema=PayloadSchemaType(schema)
+                    )
+    
+    @staticmethod
+    def _vector_size(info) -> Optional[int]:
+        vectors = info.config.params.vectors
+        return getattr(vectors, "size", None)
+    
+    @staticmethod
+    def _point(key: Any, vector: VectorLike, payload: Dict[str, Any]):
+        """PointStruct with a UUID ID and the original key in the payload."""
+        from qdrant_client.models import PointStruct
+        return PointStruct(
+            id=point_id(key),
+            vector=to_list(vector),
+            payload={**payload, KEY_FIELD: key}
+        )
+    
+    @staticmethod
+    def _result(point, score: Optional[float] = None) -> dict:
+        payload = point.payload or {}
+        result = {"id": payload.get(KEY_FIELD, point.id), "payload": payload}
+        if score is not None:
+            result["score"] = score
+        return result
     
-    def upsert(self, collection: str, id: str, vector: List[float],
+    def upsert(self, collection: str, id: str, vector: VectorLike,
                payload: Dict[str, Any]) -> bool:
         """Store a vector with metadata."""
         if self._client is None:
@@ -74,57 +183,187 @@ class VectorStore:
                 return False
         
         try:
-            from qdrant_client.models import PointStruct
             self._client.upsert(
                 collection_name=collection,
-                points=[PointStruct(id=id, vector=vector, payload=payload)]
+                points=[self._point(id, vector, payload)]
             )
             return True
         except Exception as e:
             print(f"Failed to upsert: {e}")
             return False
     
-    def search(self, collection: str, vector: List[float],
-               limit: int = 5, threshold: float = 0.0) -> List[dict]:
-        """Search for similar vectors."""
+    def upsert_many(self, collection: str, points: List[dict]) -> bool:
+        """Store many vectors in one request.
+        
+        Args:
+            collection: Target collection
+            points: Dicts with "id", "vector" and "payload"
+        
+        Returns:
+            True if stored
+        """
+        if not points:
+            return True
+        if self._client is None:
+            if not self.connect():
+                return False
+        
+        try:
+            self._client.upsert(
+                collection_name=collection,
+                points=[
+                    self._point(p["id"], p["vector"], p["payload"])
+                    for p in points
+                ]
+            )
+            return True
+        except Exception as e:
+            print(f"Failed to upsert {len(points)} points: {e}")
+            return False
+    
+    def search(self, collection: str, vector: VectorLike,
+               limit: int = 5, threshold: float = 0.0,
+               filter: Optional[dict] = None) -> List[dict]:
+        """Search for similar vectors.
+        
+        Args:
+            collection: Collection to search
+            vector: Query vector
+            limit: Max results
+            threshold: Minimum similarity score
+            filter: Payload filter (engine query syntax), applied
+                server-side before ranking
+        """
         if self._client is None:
             if not self.connect():
                 return []
         
         try:
-            results = self._client.search(
+            results = self._client.query_points(
                 collection_name=collection,
-                query_vector=vector,
+                query=to_list(vector),
+                query_filter=qdrant_filter(filter),
                 limit=limit,
-                score_threshold=threshold
-            )
-            return [
-                {
-                    "id": r.id,
-                    "score": r.score,
-                    "payload": r.payload
-                }
-                for r in results
-            ]
+                score_threshold=threshold,
+                with_payload=True
+            ).points
+            return [self._result(r, r.score) for r in results]
         except Exception as e:
             print(f"Search failed: {e}")
             return []
     
+    def get(self, collection: str, key: Any) -> Optional[dict]:
+        """Fetch one point by its original key (no similarity search)."""
+        return self.get_many(collection, [key]).get(key)
+    
+    def get_many(self, collection: str, keys: List[Any]) -> Dict[Any, dict]:
+        """Fetch points by original key.
+        
+        Returns:
+            {key: {"id": key, "payload": {...}}} for keys that exist
+        """
+        if not keys:
+            return {}
+        if self._client is None:
+            if not self.connect():
+                return {}
+        
+        try:
+            points = self._client.retrieve(
+                collection_name=collection,
+                ids=[point_id(k) for k in keys],
+                with_payload=True,
+                with_vectors=False
+            )
+            results = (self._result(p) for p in points)
+            return {r["id"]: r for r in results}
+        except Exception as e:
+            print(f"Retrieve failed: {e}")
+            return {}
+    
     def delete(self, collection: str, id: str) -> bool:
         """Delete a vector by ID."""
+        return self.delete_many(collection, [id])
+    
+    def delete_many(self, collection: str, ids: List[str]) -> bool:
+        """Delete many vectors in one request."""
+        if not ids:
+            return True
         if self._client is None:
-            return False
+            if not self.connect():
+                return False
         
         try:
             from qdrant_client.models import PointIdsList
             self._client.delete(
                 collection_name=collection,
-                points_selector=PointIdsList(points=[id])
+                points_selector=PointIdsList(points=[point_id(i) for i in ids])
             )
             return True
         except Exception as e:
             print(f"Delete failed: {e}")
             return False
+    
+    def upsert_batch(self, collection: str, points: List[dict],
+                     batch_size: int = 256, parallel: int = 1) -> dict:
+        """Upsert a large set of points in chunks.
+        
+        Args:
+            collection: Target collection
+            points: Dicts with "id", "vector" and "payload"
+            batch_size: Points per request
+            parallel: Requests in flight at once (worker threads; needs
+                a Qdrant server - the embedded ":memory:" mode isn't
+                thread-safe)
+        
+        Returns:
+            Report with point/batch counts, failures and per-batch latency
+        """
+        return self._run_batches(
+            lambda chunk: self.upsert_many(collection, chunk),
+            list(points), batch_size, parallel
+        )
+    
+    def delete_batch(self, collection: str, ids: List[str],
+                     batch_size: int = 1000, parallel: int = 1) -> dict:
+        """Delete a large set of IDs in chunks (see upsert_batch)."""
+        return self._run_batches(
+            lambda chunk: self.delete_many(collection, chunk),
+            list(ids), batch_size, parallel
+        )
+    
+    def _run_batches(self, send: Callable[[list], bool], items: list,
+                     batch_size: int, parallel: int) -> dict:
+        """Send items in chunks, optionally pipelined across threads."""
+        chunks = [
+            items[i:i + batch_size]
+            for i in range(0, len(items), max(batch_size, 1))
+        ]
+        
+        def timed(chunk):
+            start = time.perf_counter()
+            ok = send(chunk)
+            return ok, (time.perf_counter() - start) * 1000
+        
+        start = time.perf_counter()
+        if parallel > 1 and len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=parallel) as pool:
+                results = list(pool.map(timed, chunks))
+        else:
+            results = [timed(chunk) for chunk in chunks]
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        
+        latencies = [round(ms, 2) for _, ms in results]
+        failed = [i for i, (ok, _) in enumerate(results) if not ok]
+        return {
+            "points": len(items),
+            "batches": len(chunks),
+            "failed_batches": failed,
+            "failed_points": sum(len(chunks[i]) for i in failed),
+            "batch_latency_ms": latencies,
+            "max_batch_ms": max(latencies, default=0.0),
+            "elapsed_ms": round(elapsed_ms, 2)
+        }
 
 
 # Global instance
@@ -132,8 +371,29 @@ _store: Optional[VectorStore] = None
 
 
 def get_store() -> VectorStore:
-    """Get or create the global vector store."""
+    """Get or create the global vector store.
+    
+    VECTOR_BACKEND picks the implementation: "qdrant", "local", or
+    "auto" (Qdrant if it answers at startup, else the local index).
+    """
     global _store
     if _store is None:
-        _store = VectorStore()
+        from shared.config import get_config
+        cfg = get_config()
+        backend = cfg.VECTOR_BACKEND
+        
+        if backend in ("auto", "qdrant"):
+            store = VectorStore(host=cfg.QDRANT_HOST, port=cfg.QDRANT_PORT)
+            if backend == "qdrant" or store.connect():
+                _store = store
+        
+        if _store is None:
+            from .local_index import LocalVectorStore
+            if backend == "auto":
+                print("Qdrant unavailable - using local vector index")
+            _store = LocalVectorStore(
+                Path(cfg.VECTOR_INDEX_PATH),
+                ivf_threshold=cfg.VECTOR_IVF_THRESHOLD
+            )
+            _store.connect()
     return _store
@@ -0,0 +1,80 @@
+"""Shared fixtures: an isolated SecondBrain under tmp_path.
+
+Storage goes to a temp directory, vectors to the local index, and
+embeddings come from fake_embedding() instead of Ollama, so the tests
+run without Qdrant, Ollama or network access.
+"""
+
+import hashlib
+
+import pytest
+
+EMBEDDING_DIM = 32
+
+
+def fake_embedding(text: str):
+    """Deterministic unit vector per text; different texts are ~orthogonal."""
+    import numpy as np
+
+    seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "little")
+    vector = np.random.default_rng(seed).standard_normal(EMBEDDING_DIM)
+    return (vector / np.linalg.norm(vector)).astype("float32")
+
+
+@pytest.fixture
+def env(tmp_path, monkeypatch):
+    """Point config at tmp_path; returns a setter for extra settings."""
+    from shared import config
+
+    settings = {
+        "EMBEDDING_CACHE_PATH": "",
+        "VECTOR_BACKEND": "local",
+        "VECTOR_INDEX_PATH": str(tmp_path / "vectors"),
+        "OLLAMA_HOST": "http://127.0.0.1:9",
+        "STORAGE_FSYNC": "never",
+        "CACHE_FLUSH_INTERVAL": "3600",
+        "CACHE_SWEEP_INTERVAL": "3600",
+    }
+
+    def setenv(**values):
+        for name, value in values.items():
+            monkeypatch.setenv(name, str(value))
+        monkeypatch.setattr(config, "_config", None)
+
+    setenv(**settings)
+    return setenv
+
+
+@pytest.fixture
+def memory(env, tmp_path, monkeypatch):
+    """secondbrain.api.memory over fresh storage (opened on first use)."""
+    from secondbrain.api import memory
+    from secondbrain.storage import vector_store
+
+    memory.close_storage()
+    monkeypatch.setattr(memory, "DATA_ROOT", tmp_path / "data")
+    monkeypatch.setattr(memory, "get_embedding", fake_embedding)
+    monkeypatch.setattr(memory, "get_embeddings",
+                        lambda texts: [fake_embedding(t) for t in texts])
+    monkeypatch.setattr(vector_store, "_store", None)
+    yield memory
+    memory.close_storage()
+    # Only the local index has files to close
+    if hasattr(vector_store._store, "close"):
+        vector_store._store.close()
+
+
+@pytest.fixture
+def chat_logger(memory, tmp_path, monkeypatch):
+    """secondbrain.ingest.chat_logger writing under tmp_path."""
+    from secondbrain.ingest import chat_logger
+
+    chat_logger.close_logger()
+    monkeypatch.setattr(chat_logger, "DATA_ROOT", tmp_path / "data")
+    monkeypatch.setattr(chat_logger, "CONVERSATIONS_DIR",
+                        tmp_path / "data" / "memory" / "conversations")
+    monkeypatch.setattr(chat_logger, "CONVERSATIONS_FILE",
+                        tmp_path / "data" / "memory" / "conversations.pkl")
+    monkeypatch.setattr(chat_logger, "_logger", None)
+    yield chat_logger
+    chat_logger.close_logger()
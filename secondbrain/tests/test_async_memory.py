@@ -0,0 +1,28 @@
+"""Async memory API on the event loop."""
+
+import asyncio
+import threading
+
+
+def test_cache_evictions_run_off_the_event_loop(memory, env, monkeypatch):
+    env(CACHE_MAX_ENTRIES=1)
+    removed = []
+
+    def drop_query_vectors(query_hashes):
+        removed.append((query_hashes, threading.current_thread()))
+
+    # Bound as on_remove when storage opens on first use
+    monkeypatch.setattr(memory, "_drop_query_vectors", drop_query_vectors)
+
+    async def main():
+        from secondbrain.api import async_memory
+
+        await async_memory.acache_store("first question", "one", model="m")
+        await async_memory.acache_store("second question", "two", model="m")
+        return threading.current_thread()
+
+    loop_thread = asyncio.run(main())
+
+    assert len(removed) == 1
+    assert removed[0][1] is not loop_thread
+    assert memory.cache_get("second question", fuzzy=False) == "two"
@@ -0,0 +1,86 @@
+"""Record codec: stored values come back equal and of the same type."""
+
+from array import array
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from secondbrain.storage import codec
+from secondbrain.storage.engine import LogEngine
+from shared.models.schemas import ChatMessage, MessageRole
+
+VALUES = [
+    {1: "one", 2: "two"},
+    {(1, 2): "pair", None: "none", True: "yes"},
+    (1, "a", (2.5, None)),
+    [(1, 2), (3, 4)],
+    Decimal("0.1"),
+    Path("/tmp/report.docx"),
+    np.float32(0.5),
+    np.int64(7),
+    np.bool_(True),
+    {"price": Decimal("19.99"), "rows": np.int32(3)},
+    {"__dt__": "not a datetime", "__type__": "plain dict"},
+    frozenset({1, 2}),
+    {1, 2},
+    b"\x00\xff",
+    array("f", [1.0, 2.0]),
+    datetime(2026, 1, 2, 3, 4, 5),
+    date(2026, 1, 2),
+    ChatMessage(role=MessageRole.USER, content="hi",
+                metadata={"scores": (1, 2), 3: Decimal("1.5")}),
+]
+
+
+def _formats():
+    formats = [codec.FORMAT_JSON]
+    if codec._msgpack() is not None:
+        formats.append(codec.FORMAT_MSGPACK)
+    return formats
+
+
+def _same(a, b):
+    assert a == b
+    assert type(a) is type(b)
+    if isinstance(a, dict):
+        for key, value in a.items():
+            other = next(k for k in b if k == key)
+            assert type(key) is type(other)
+            _same(value, b[key])
+    elif isinstance(a, (list, tuple)):
+        for x, y in zip(a, b):
+            _same(x, y)
+
+
+@pytest.mark.parametrize("format", _formats())
+@pytest.mark.parametrize("value", VALUES, ids=lambda v: type(v).__name__)
+def test_round_trip(value, format):
+    _same(codec.loads(codec.dumps(value, format)), value)
+
+
+def test_reloaded_values_match_in_process_reads(tmp_path):
+    engine = LogEngine(tmp_path / "store", fsync="never")
+    for i, value in enumerate(VALUES):
+        engine.put(str(i), value)
+    engine.close()
+
+    reopened = LogEngine(tmp_path / "store", fsync="never")
+    for i, value in enumerate(VALUES):
+        _same(reopened.get(str(i)), engine.get(str(i)))
+    reopened.close()
+
+
+def test_unsupported_values_are_rejected_on_write():
+    with pytest.raises(TypeError):
+        codec.dumps(object())
+    with pytest.raises(TypeError):
+        codec.dumps({"vector": np.zeros(3)})
+
+
+def test_reads_version_1_records():
+    blob = codec.MAGIC + bytes((codec.FORMAT_JSON, 1)) + b'{"a":[1,2]}'
+
+    assert codec.loads(blob) == {"a": [1, 2]}
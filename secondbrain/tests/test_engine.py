@@ -0,0 +1,147 @@
+"""LogEngine: compaction, crash recovery and other processes' writes."""
+
+import multiprocessing
+import os
+import zlib
+
+import pytest
+
+from secondbrain.storage import codec
+from secondbrain.storage.engine import _FRAME, LogEngine, _write_bytes_atomic
+
+WRITERS = 4
+RECORDS = 300
+
+
+def _write_records(base_path, writer):
+    engine = LogEngine(base_path, fsync="never", compact_threshold=50)
+    for i in range(RECORDS):
+        engine.put(f"w{writer}-{i}", {"writer": writer, "i": i})
+    engine.close()
+
+
+def test_concurrent_writers_and_compactions_keep_every_record(tmp_path):
+    base_path = tmp_path / "store"
+    ctx = multiprocessing.get_context("spawn")
+    workers = [ctx.Process(target=_write_records, args=(base_path, w))
+               for w in range(WRITERS)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(60)
+        assert worker.exitcode == 0
+
+    engine = LogEngine(base_path, fsync="never")
+    assert len(engine) == WRITERS * RECORDS
+    assert engine.get(f"w{WRITERS - 1}-{RECORDS - 1}") == {
+        "writer": WRITERS - 1, "i": RECORDS - 1
+    }
+    engine.close()
+
+
+def test_compaction_is_seen_by_another_handle(tmp_path):
+    first = LogEngine(tmp_path / "store", fsync="never")
+    second = LogEngine(tmp_path / "store", fsync="never")
+    first.put("a", 1)
+    second.put("b", 2)
+
+    first.compact()     # Must fold in second's record before rotating
+    second.put("c", 3)
+    first.refresh()
+
+    assert dict(first.items()) == {"a": 1, "b": 2, "c": 3}
+    first.close()
+    second.close()
+    reopened = LogEngine(tmp_path / "store", fsync="never")
+    assert dict(reopened.items()) == {"a": 1, "b": 2, "c": 3}
+    reopened.close()
+
+
+def test_atomic_writes_leave_no_temp_files(tmp_path):
+    path = tmp_path / "blob"
+    _write_bytes_atomic(path, b"one")
+    _write_bytes_atomic(path, b"two")
+
+    assert path.read_bytes() == b"two"
+    assert [p.name for p in tmp_path.iterdir()] == ["blob"]
+
+
+def test_foreign_frames_found_while_writing_bump_generation(tmp_path):
+    first = LogEngine(tmp_path / "store", fsync="never")
+    second = LogEngine(tmp_path / "store", fsync="never")
+    # Another process appends between first's refresh and its write
+    first.refresh = lambda: False
+    second.put("b", 2)
+    generation = first.generation
+
+    first.put("a", 1)
+
+    assert first.get("b") == 2
+    assert first.generation > generation
+    first.close()
+    second.close()
+
+
+def test_torn_tail_is_cut_and_appends_continue(tmp_path):
+    engine = LogEngine(tmp_path / "store", fsync="never")
+    engine.put("a", 1)
+    engine.put("b", 2)
+    engine.close()
+    # Crash mid-write: half of the last frame made it to disk
+    log = tmp_path / "store.log"
+    size = log.stat().st_size
+    with open(log, "r+b") as f:
+        f.truncate(size - 3)
+
+    engine = LogEngine(tmp_path / "store", fsync="never")
+    assert dict(engine.items()) == {"a": 1}
+    engine.put("c", 3)
+    engine.close()
+
+    reopened = LogEngine(tmp_path / "store", fsync="never")
+    assert dict(reopened.items()) == {"a": 1, "c": 3}
+    reopened.close()
+
+
+def test_crash_mid_compaction_is_recovered(tmp_path):
+    engine = LogEngine(tmp_path / "store", fsync="never")
+    engine.put("a", 1)
+    engine.compact()
+    engine.put("b", 2)
+    engine.delete("a")
+    engine.close()
+    # Crash after the rotation, before the new snapshot replaced the old
+    os.replace(tmp_path / "store.log", tmp_path / "store.log.old")
+    with open(tmp_path / "store.log", "wb") as f:
+        f.write(_frame((1, "c", 3)))
+
+    engine = LogEngine(tmp_path / "store", fsync="never")
+    assert dict(engine.items()) == {"b": 2, "c": 3}
+    engine.compact()
+    assert not (tmp_path / "store.log.old").exists()
+    engine.close()
+
+    reopened = LogEngine(tmp_path / "store", fsync="never")
+    assert dict(reopened.items()) == {"b": 2, "c": 3}
+    reopened.close()
+
+
+def test_unreadable_frame_is_an_error_not_a_torn_tail(tmp_path):
+    engine = LogEngine(tmp_path / "store", fsync="never")
+    engine.put("a", 1)
+    engine.close()
+    log = tmp_path / "store.log"
+    # Intact (CRC-valid) frame from a newer schema
+    with open(log, "ab") as f:
+        f.write(_frame((1, "b", 2), version=codec.SCHEMA_VERSION + 1))
+    size = log.stat().st_size
+
+    with pytest.raises(codec.CodecError):
+        LogEngine(tmp_path / "store", fsync="never")
+    assert log.stat().st_size == size
+
+
+def _frame(record, version=codec.SCHEMA_VERSION):
+    payload = codec.dumps(record, codec.FORMAT_JSON)
+    payload = payload[:3] + bytes((version,)) + payload[4:]
+    return _FRAME.pack(len(payload), zlib.crc32(payload)) + payload
@@ -0,0 +1,68 @@
+"""Chat export import: dedupe and resuming an interrupted run."""
+
+import json
+
+import pytest
+
+from secondbrain.ingest.importer import import_chat_export
+
+
+class Interrupted(Exception):
+    pass
+
+
+def _export(path, conversations: int):
+    with open(path, "w") as f:
+        for i in range(conversations):
+            f.write(json.dumps({"model": "kimi", "messages": [
+                {"role": "user", "content": f"Question {i}"},
+                {"role": "assistant", "content": f"Answer {i}"},
+                # Asked again in the same conversation - a duplicate
+                {"role": "user", "content": f"Question {i}"},
+                {"role": "assistant", "content": f"Answer {i}"},
+            ]}) + "\n")
+    return path
+
+
+def test_import_writes_every_turn_once(memory, tmp_path):
+    path = _export(tmp_path / "kimi.jsonl", 10)
+
+    report = import_chat_export(path, workers=2, batch_size=3)
+
+    assert (report["conversations"], report["turns"]) == (10, 20)
+    assert (report["duplicates"], report["written"]) == (10, 10)
+    assert report["failed"] == 0
+    assert memory.cache_get("Question 7", model="kimi", fuzzy=False) == "Answer 7"
+
+    again = import_chat_export(path, resume=False)
+    assert (again["duplicates"], again["written"]) == (20, 0)
+
+
+def test_interrupted_import_resumes_from_checkpoint(memory, tmp_path):
+    path = _export(tmp_path / "kimi.jsonl", 10)
+
+    def interrupt(report):
+        if report["conversations"] == 6:
+            raise Interrupted()
+
+    with pytest.raises(Interrupted):
+        import_chat_export(path, workers=1, batch_size=2,
+                           progress=interrupt, progress_interval=0)
+
+    report = import_chat_export(path, workers=1, batch_size=2)
+
+    assert report["resumed"]
+    # Only the conversations after the checkpoint are read again, and
+    # the counts cover them alone
+    assert 0 < report["conversations"] < 10
+    assert report["turns"] == 2 * report["conversations"]
+    assert report["written"] + report["duplicates"] == report["turns"]
+    assert memory.cache_contains_many(
+        [memory.cache_key(f"Question {i}", "kimi") for i in range(10)]
+    ) == {str(memory.cache_key(f"Question {i}", "kimi")) for i in range(10)}
+    for i in range(10):
+        assert memory.cache_get(f"Question {i}", model="kimi",
+                                fuzzy=False) == f"Answer {i}"
+
+    # Finished - a rerun has nothing left to read
+    assert import_chat_export(path)["conversations"] == 0
@@ -0,0 +1,146 @@
+"""Response cache tiers: near-miss questions must not share answers."""
+
+from secondbrain.storage.near_duplicate import (
+    SimHashIndex, distance_for, normalize_text
+)
+
+COUNTRIES = {
+    "France": "Paris", "Germany": "Berlin", "Spain": "Madrid",
+    "Italy": "Rome", "Portugal": "Lisbon", "Austria": "Vienna",
+    "Poland": "Warsaw", "Sweden": "Stockholm", "Norway": "Oslo",
+    "Denmark": "Copenhagen", "Finland": "Helsinki", "Greece": "Athens",
+    "Ireland": "Dublin", "Belgium": "Brussels", "Hungary": "Budapest",
+    "Japan": "Tokyo", "Egypt": "Cairo", "Kenya": "Nairobi",
+    "Peru": "Lima", "Chile": "Santiago",
+}
+
+
+def _question(country: str) -> str:
+    return f"What is the capital of {country}?"
+
+
+def test_capital_questions_get_their_own_answers(memory):
+    for country, capital in COUNTRIES.items():
+        memory.cache_store(_question(country), capital, model="m")
+
+    for country, capital in COUNTRIES.items():
+        assert memory.cache_get(_question(country)) == capital
+    assert memory.cache_get(_question("Canada")) is None
+
+
+def test_near_duplicate_tier_respects_threshold(memory, env):
+    env(CACHE_NEAR_DUPLICATE_DISTANCE=6)
+    memory.cache_store(_question("France"), "Paris", model="m")
+
+    assert memory.cache_get(_question("Germany"),
+                            similarity_threshold=0.99) is None
+    assert memory._response_cache.near_duplicate_distance == 6
+
+
+def test_operators_and_numbers_are_not_folded(memory):
+    memory.cache_store("What is 2+2?", "4", model="m")
+    memory.cache_store("What is 3.5 * 2?", "7", model="m")
+
+    assert memory.cache_get("what is 2+2") == "4"
+    assert memory.cache_get("What is 2-2?") is None
+    assert memory.cache_get("What is 35 * 2?") is None
+
+
+def test_fuzzy_false_is_exact_only(memory):
+    memory.cache_store("What is Python?", "A language", model="m")
+
+    assert memory.cache_get("what is python") == "A language"
+    assert memory.cache_get("what is python", fuzzy=False) is None
+    assert memory.cache_get("What is Python?", fuzzy=False) == "A language"
+    tiers = memory.get_cache_stats()["lookups"]["tiers"]
+    assert tiers["semantic"]["skipped"] >= 1
+
+
+def test_normalize_text():
+    assert normalize_text("What is  Python?") == "what is python"
+    assert normalize_text("2+2") != normalize_text("2-2")
+    assert normalize_text("pi is 3.14.") == "pi is 3.14"
+
+
+def test_simhash_lookup_distance_is_capped():
+    index = SimHashIndex(max_distance=6)
+    index.add("a", 0)
+
+    assert index.find(0b111) == ("a", 3)
+    assert index.find(0b111, max_distance=2) is None
+    # Never looser than the index itself
+    assert index.find(0b1111111, max_distance=20) is None
+    assert [distance_for(t) for t in (0.90, 0.95, 0.99)] == [6, 3, 0]
+
+
+def _store_in_another_process(data_root, query, response):
+    from secondbrain.api import memory
+    from secondbrain.tests.conftest import fake_embedding
+
+    memory.DATA_ROOT = data_root
+    memory.get_embedding = fake_embedding
+    memory.get_embeddings = lambda texts: [fake_embedding(t) for t in texts]
+    memory.cache_store(query, response, model="m")
+    memory.close_storage()
+
+
+def test_sees_entries_stored_by_another_process(memory, env):
+    import multiprocessing
+
+    env(STORAGE_ENGINE="sqlite")
+    memory.cache_store(_question("France"), "Paris", model="m")
+    assert memory.cache_get(_question("Spain"), fuzzy=False) is None
+
+    worker = multiprocessing.get_context("spawn").Process(
+        target=_store_in_another_process,
+        args=(memory.DATA_ROOT, _question("Spain"), "Madrid")
+    )
+    worker.start()
+    worker.join(60)
+    assert worker.exitcode == 0
+
+    assert memory.cache_get(_question("Spain"), fuzzy=False) == "Madrid"
+    assert memory.cache_get(_question("France"), fuzzy=False) == "Paris"
+
+
+def test_failed_vector_cleanup_is_reported(memory, env, capsys):
+    # Nothing listens on port 9: the delete must try to connect and say
+    # that it failed instead of silently doing nothing
+    env(VECTOR_BACKEND="qdrant", QDRANT_HOST="127.0.0.1", QDRANT_PORT=9)
+
+    memory._drop_query_vectors(["query:abc"])
+
+    out = capsys.readouterr().out
+    assert "Failed to connect to Qdrant" in out
+    assert "1 of 1 points not deleted" in out
+
+
+def test_expired_entries_miss_and_are_swept(memory, monkeypatch):
+    removed = []
+    monkeypatch.setattr(memory, "_drop_query_vectors", removed.extend)
+    memory.cache_store("Old question", "stale", model="m", ttl=-1)
+    memory.cache_store("New question", "fresh", model="m")
+
+    # Every tier, the semantic one included, skips the expired entry
+    assert memory.cache_get("Old question") is None
+    assert memory.cache_get("New question") == "fresh"
+
+    stats = memory.get_cache_stats()
+    assert (stats["total_cached"], stats["expired_entries"]) == (2, 1)
+
+    assert memory._response_cache.sweep() == 1
+    assert len(removed) == 1
+    assert memory.get_cache_stats()["total_cached"] == 1
+
+
+def test_budget_evicts_least_recently_used(memory, env):
+    env(CACHE_MAX_ENTRIES=2, CACHE_EVICTION="lru")
+    memory.cache_store("first", "1", model="m")
+    memory.cache_store("second", "2", model="m")
+    assert memory.cache_get("first", fuzzy=False) == "1"
+
+    memory.cache_store("third", "3", model="m")
+
+    assert memory.cache_get("second", fuzzy=False) is None
+    assert memory.cache_get("first", fuzzy=False) == "1"
+    assert memory.cache_get("third", fuzzy=False) == "3"
@@ -0,0 +1,46 @@
+"""SegmentedLog: records land in their own day's segment."""
+
+from datetime import datetime, timedelta
+
+from secondbrain.storage.segmented_log import SegmentedLog
+from secondbrain.storage.stats import DailyRollups
+
+
+def _record(at: datetime, query: str) -> dict:
+    return {"timestamp": at, "query": query}
+
+
+def test_earlier_records_go_to_their_own_day(tmp_path):
+    now = datetime.now().replace(microsecond=0)
+    yesterday = now - timedelta(days=1)
+    log = SegmentedLog(tmp_path)
+
+    log.append(_record(now, "first"))
+    log.append_many([_record(yesterday, "late"), _record(now, "second")])
+
+    assert [r["query"] for r in log.read_day(yesterday.date())] == ["late"]
+    assert [r["query"] for r in log.read_day(now.date())] == ["first", "second"]
+    assert [r["query"] for r in log.read(since=now - timedelta(hours=1))] == [
+        "first", "second"
+    ]
+    log.close()
+
+
+def test_late_records_update_saved_rollups(tmp_path):
+    now = datetime.now().replace(microsecond=0)
+    yesterday = now - timedelta(days=1)
+    log = SegmentedLog(tmp_path)
+    log.append(_record(yesterday, "old"))
+    rollups = DailyRollups(log, lambda record: {"count": 1})
+    assert rollups.day(yesterday.date()) == {"count": 1}
+
+    late = _record(yesterday, "late")
+    log.append(late)
+    rollups.add(late)
+
+    assert rollups.day(yesterday.date()) == {"count": 2}
+    # The saved rollup was recounted, so a fresh process agrees
+    assert DailyRollups(log, lambda record: {"count": 1}).day(
+        yesterday.date()
+    ) == {"count": 2}
+    log.close()
@@ -31,14 +31,42 @@ class Config:
     QDRANT_PORT: int = 6333
     QDRANT_GRPC_PORT: int = 6334
     
+    # Vector backend: auto (Qdrant, else local index), qdrant, local
+    VECTOR_BACKEND: str = "auto"
+    VECTOR_INDEX_PATH: str = "C:/ecosystem/data/vectors"
+    VECTOR_IVF_THRESHOLD: int = 20000
+    VECTOR_BATCH_SIZE: int = 256
+    VECTOR_UPSERT_PARALLEL: int = 4
+    
     # Ollama
     OLLAMA_HOST: str = "http://localhost:11434"
+    EMBEDDING_POOL_SIZE: int = 10
+    EMBEDDING_CONNECT_TIMEOUT: float = 3.0
+    EMBEDDING_READ_TIMEOUT: float = 60.0
+    EMBEDDING_BATCH_SIZE: int = 256
+    EMBEDDING_CACHE_PATH: str = "C:/ecosystem/data/cache/embeddings.db"
+    EMBEDDING_CACHE_MAX_MB: float = 64.0
     
     # Models
     LOCAL_REASONING_MODEL: str = "qwen2.5:32b-instruct"
     LOCAL_FAST_MODEL: str = "llama3.1:8b-instruct"
     LOCAL_LIGHT_MODEL: str = "phi3:mini"
     
+    # AWS Bedrock (clawbot.core.llm)
+    AWS_PROFILE: str = "study"
+    AWS_REGION: str = "us-east-1"
+    BEDROCK_MODEL_ID: str = "moonshot.kimi-k2-thinking"
+    # Seconds a cached LLM answer is reused
+    LLM_CACHE_TTL: int = 86400
+    # Shared bedrock-runtime client (clawbot.core.aws)
+    BEDROCK_MAX_POOL_CONNECTIONS: int = 25
+    BEDROCK_MAX_ATTEMPTS: int = 5
+    BEDROCK_CONNECT_TIMEOUT: float = 5.0
+    BEDROCK_READ_TIMEOUT: float = 120.0
+    BEDROCK_WARMUP: bool = True
+    # Alternate endpoint, e.g. a local stub in tests ("" = AWS)
+    BEDROCK_ENDPOINT_URL: str = ""
+    
     # API Keys (load from env)
     OPENROUTER_API_KEY: Optional[str] = None
     UPWORK_API_KEY: Optional[str] = None
@@ -48,6 +76,31 @@ class Config:
     ENABLE_TELEGRAM: bool = True
     ENABLE_CACHING: bool = True
     CACHE_SIMILARITY_THRESHOLD: float = 0.90
+    # Max SimHash bit distance for a near-duplicate cache hit (0 = off);
+    # a one-word edit ("France" -> "Germany") can land inside 6 bits
+    CACHE_NEAR_DUPLICATE_DISTANCE: int = 0
+    # Semantic candidates fetched per lookup (first live one answers)
+    CACHE_SEMANTIC_TOP_K: int = 5
+    # Background cache maintenance (seconds)
+    CACHE_FLUSH_INTERVAL: float = 30.0
+    CACHE_SWEEP_INTERVAL: float = 300.0
+    # Response cache budget (0 = unbounded) and eviction policy (lru, lfu)
+    CACHE_MAX_ENTRIES: int = 50000
+    CACHE_MAX_MB: float = 256.0
+    CACHE_EVICTION: str = "lru"
+    
+    # Chat log segment size before rotating (segments also rotate daily)
+    CHAT_LOG_SEGMENT_MB: float = 64.0
+    # Background copy of chat turns into the knowledge store
+    CHAT_INGEST_QUEUE_SIZE: int = 10000
+    CHAT_INGEST_BATCH_SIZE: int = 64
+    CHAT_INGEST_FLUSH_INTERVAL: float = 2.0
+    
+    # SecondBrain storage engine
+    STORAGE_ENGINE: str = "log"  # log, pickle, sqlite
+    STORAGE_FSYNC: str = "interval"  # always, interval, never
+    STORAGE_COMPACT_THRESHOLD: int = 10000
+    STORAGE_FORMAT: str = "auto"  # auto (msgpack if installed), msgpack, json
     
     def __init__(self):
         """Load configuration from environment."""
@@ -57,7 +110,58 @@ class Config:
         """Override defaults with environment variables."""
         self.QDRANT_HOST = os.getenv("QDRANT_HOST", self.QDRANT_HOST)
         self.QDRANT_PORT = int(os.getenv("QDRANT_PORT", self.QDRANT_PORT))
+        self.VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", self.VECTOR_BACKEND)
+        self.VECTOR_INDEX_PATH = os.getenv("VECTOR_INDEX_PATH", self.VECTOR_INDEX_PATH)
+        self.VECTOR_IVF_THRESHOLD = int(
+            os.getenv("VECTOR_IVF_THRESHOLD", self.VECTOR_IVF_THRESHOLD)
+        )
+        self.VECTOR_BATCH_SIZE = int(
+            os.getenv("VECTOR_BATCH_SIZE", self.VECTOR_BATCH_SIZE)
+        )
+        self.VECTOR_UPSERT_PARALLEL = int(
+            os.getenv("VECTOR_UPSERT_PARALLEL", self.VECTOR_UPSERT_PARALLEL)
+        )
         self.OLLAMA_HOST = os.getenv("OLLAMA_HOST", self.OLLAMA_HOST)
+        self.EMBEDDING_POOL_SIZE = int(
+            os.getenv("EMBEDDING_POOL_SIZE", self.EMBEDDING_POOL_SIZE)
+        )
+        self.EMBEDDING_CONNECT_TIMEOUT = float(
+            os.getenv("EMBEDDING_CONNECT_TIMEOUT", self.EMBEDDING_CONNECT_TIMEOUT)
+        )
+        self.EMBEDDING_READ_TIMEOUT = float(
+            os.getenv("EMBEDDING_READ_TIMEOUT", self.EMBEDDING_READ_TIMEOUT)
+        )
+        self.EMBEDDING_BATCH_SIZE = int(
+            os.getenv("EMBEDDING_BATCH_SIZE", self.EMBEDDING_BATCH_SIZE)
+        )
+        # Empty path = in-memory cache only
+        self.EMBEDDING_CACHE_PATH = os.getenv(
+            "EMBEDDING_CACHE_PATH", self.EMBEDDING_CACHE_PATH
+        )
+        self.EMBEDDING_CACHE_MAX_MB = float(
+            os.getenv("EMBEDDING_CACHE_MAX_MB", self.EMBEDDING_CACHE_MAX_MB)
+        )
+        
+        self.AWS_PROFILE = os.getenv("AWS_PROFILE", self.AWS_PROFILE)
+        self.AWS_REGION = os.getenv("AWS_REGION", self.AWS_REGION)
+        self.BEDROCK_MODEL_ID = os.getenv("BEDROCK_MODEL_ID", self.BEDROCK_MODEL_ID)
+        self.LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", self.LLM_CACHE_TTL))
+        self.BEDROCK_MAX_POOL_CONNECTIONS = int(
+            os.getenv("BEDROCK_MAX_POOL_CONNECTIONS", self.BEDROCK_MAX_POOL_CONNECTIONS)
+        )
+        self.BEDROCK_MAX_ATTEMPTS = int(
+            os.getenv("BEDROCK_MAX_ATTEMPTS", self.BEDROCK_MAX_ATTEMPTS)
+        )
+        self.BEDROCK_CONNECT_TIMEOUT = float(
+            os.getenv("BEDROCK_CONNECT_TIMEOUT", self.BEDROCK_CONNECT_TIMEOUT)
+        )
+        self.BEDROCK_READ_TIMEOUT = float(
+            os.getenv("BEDROCK_READ_TIMEOUT", self.BEDROCK_READ_TIMEOUT)
+        )
+        self.BEDROCK_WARMUP = os.getenv("BEDROCK_WARMUP", "true").lower() == "true"
+        self.BEDROCK_ENDPOINT_URL = os.getenv(
+            "BEDROCK_ENDPOINT_URL", self.BEDROCK_ENDPOINT_URL
+        )
         
         self.OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
         self.UPWORK_API_KEY = os.getenv("UPWORK_API_KEY")
@@ -68,6 +172,42 @@ class Config:
         self.CACHE_SIMILARITY_THRESHOLD = float(
             os.getenv("CACHE_SIMILARITY_THRESHOLD", "0.90")
         )
+        self.CACHE_NEAR_DUPLICATE_DISTANCE = int(
+            os.getenv("CACHE_NEAR_DUPLICATE_DISTANCE", self.CACHE_NEAR_DUPLICATE_DISTANCE)
+        )
+        self.CACHE_SEMANTIC_TOP_K = int(
+            os.getenv("CACHE_SEMANTIC_TOP_K", self.CACHE_SEMANTIC_TOP_K)
+        )
+        self.CACHE_FLUSH_INTERVAL = float(
+            os.getenv("CACHE_FLUSH_INTERVAL", self.CACHE_FLUSH_INTERVAL)
+        )
+        self.CACHE_SWEEP_INTERVAL = float(
+            os.getenv("CACHE_SWEEP_INTERVAL", self.CACHE_SWEEP_INTERVAL)
+        )
+        self.CACHE_MAX_ENTRIES = int(
+            os.getenv("CACHE_MAX_ENTRIES", self.CACHE_MAX_ENTRIES)
+        )
+        self.CACHE_MAX_MB = float(os.getenv("CACHE_MAX_MB", self.CACHE_MAX_MB))
+        self.CACHE_EVICTION = os.getenv("CACHE_EVICTION", self.CACHE_EVICTION)
+        self.CHAT_LOG_SEGMENT_MB = float(
+            os.getenv("CHAT_LOG_SEGMENT_MB", self.CHAT_LOG_SEGMENT_MB)
+        )
+        self.CHAT_INGEST_QUEUE_SIZE = int(
+            os.getenv("CHAT_INGEST_QUEUE_SIZE", self.CHAT_INGEST_QUEUE_SIZE)
+        )
+        self.CHAT_INGEST_BATCH_SIZE = int(
+            os.getenv("CHAT_INGEST_BATCH_SIZE", self.CHAT_INGEST_BATCH_SIZE)
+        )
+        self.CHAT_INGEST_FLUSH_INTERVAL = float(
+            os.getenv("CHAT_INGEST_FLUSH_INTERVAL", self.CHAT_INGEST_FLUSH_INTERVAL)
+        )
+        
+        self.STORAGE_ENGINE = os.getenv("STORAGE_ENGINE", self.STORAGE_ENGINE)
+        self.STORAGE_FSYNC = os.getenv("STORAGE_FSYNC", self.STORAGE_FSYNC)
+        self.STORAGE_COMPACT_THRESHOLD = int(
+            os.getenv("STORAGE_COMPACT_THRESHOLD", self.STORAGE_COMPACT_THRESHOLD)
+        )
+        self.STORAGE_FORMAT = os.getenv("STORAGE_FORMAT", self.STORAGE_FORMAT)
 
 
 # Global instance
@@ -10,6 +10,8 @@ from enum import Enum
 # Using dataclasses for simplicity (can migrate to Pydantic later)
 from dataclasses import dataclass, field
 
+from shared.utils.vectors import Vector
+
 
 class MessageRole(Enum):
     SYSTEM = "system"
@@ -54,7 +56,10 @@ class CachedResponse:
     query_text: str
     response: str
     model: str
-    similarity_hash: Optional[str] = None
+    similarity_hash: Optional[str] = None  # SimHash fingerprint (hex)
+    normalized_hash: Optional[str] = None  # hash of normalize_text(query)
+    namespace: str = "query"  # template id, "query" for free-form text
+    text_hash: Optional[str] = None  # template + variables, any model
     hit_count: int = 0
     created_at: datetime = field(default_factory=datetime.now)
     expires_at: Optional[datetime] = None
@@ -65,7 +70,7 @@ class VectorDocument:
     """Document stored in vector DB."""
     id: str
     collection: str
-    vector: List[float]
+    vector: Vector  # packed float32, see shared.utils.vectors
     text: str
     metadata: Dict[str, Any] = field(default_factory=dict)
     created_at: datetime = field(default_factory=datetime.now)
@@ -3,6 +3,18 @@
 Common helper functions.
 """
 
-from .embeddings import get_embedding, hash_text
+from .embeddings import (
+    EmbeddingClient, AsyncEmbeddingClient, get_client, get_async_client,
+    get_cache, get_embedding, get_embeddings, aget_embedding,
+    aget_embeddings, hash_text
+)
+from .embedding_cache import EmbeddingCache
+from .vectors import Vector, to_vector, to_list, as_numpy
 
-__all__ = ["get_embedding", "hash_text"]
+__all__ = [
+    "EmbeddingClient", "AsyncEmbeddingClient", "EmbeddingCache",
+    "get_client", "get_async_client", "get_cache",
+    "get_embedding", "get_embeddings", "aget_embedding", "aget_embeddings",
+    "hash_text",
+    "Vector", "to_vector", "to_list", "as_numpy"
+]
@@ -0,0 +1,228 @@
+"""Embedding cache
+
+Two-tier cache for embedding vectors:
+    1. In-memory LRU bounded by total vector bytes
+    2. Persistent SQLite table, so CLI runs don't start cold
+
+Vectors are keyed by sha256(model + text) and held as packed float32
+(``array('f')``): a 768-dim vector is ~3 KB instead of ~25 KB of Python
+floats.
+
+Usage:
+    >>> cache = EmbeddingCache("C:/ecosystem/data/cache/embeddings.db")
+    >>> cache.put("nomic-embed-text", "hello", vector)
+    >>> cache.get("nomic-embed-text", "hello")
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .vectors import Vector, VectorLike, from_bytes, nbytes, to_vector
+
+
+def content_key(model: str, text: str) -> str:
+    """Cache key for a (model, text) pair."""
+    return hashlib.sha256(f"{model}\0{text}".encode()).hexdigest()
+
+
+class EmbeddingCache:
+    """Bounded in-memory LRU backed by an optional SQLite store.
+
+    Args:
+        path: SQLite file for the persistent tier (None = memory only)
+        max_bytes: Byte budget for vectors held in memory
+    """
+
+    def __init__(self, path: Optional[Path] = None,
+                 max_bytes: int = 64 * 1024 * 1024):
+        self.path = Path(path) if path else None
+        self.max_bytes = max_bytes
+
+        self._lru: "OrderedDict[str, Vector]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if self.path is not None:
+            self._open()
+
+    def _open(self) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                str(self.path), check_same_thread=False, isolation_level=None
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    dim INTEGER NOT NULL,
+                    vector BLOB NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            self._conn = conn
+        except sqlite3.Error as e:
+            print(f"Embedding cache persistence disabled (non-critical): {e}")
+            self._conn = None
+
+    # ---- memory tier ----------------------------------------------------
+
+    def _remember(self, key: str, vector: Vector) -> None:
+        """Insert into the LRU, evicting the oldest entries over budget."""
+        old = self._lru.pop(key, None)
+        if old is not None:
+            self._bytes -= nbytes(old)
+        self._lru[key] = vector
+        self._bytes += nbytes(vector)
+
+        while self._bytes > self.max_bytes and len(self._lru) > 1:
+            _, evicted = self._lru.popitem(last=False)
+            self._bytes -= nbytes(evicted)
+            self.evictions += 1
+
+    # ---- lookups --------------------------------------------------------
+
+    def get(self, model: str, text: str) -> Optional[Vector]:
+        """Look up one vector."""
+        return self.get_many(model, [text]).get(text)
+
+    def get_many(self, model: str, texts: Iterable[str]) -> Dict[str, Vector]:
+        """Look up many vectors.
+
+        Returns:
+            {text: vector} for texts found in either tier
+        """
+        found: Dict[str, Vector] = {}
+        disk_lookup: Dict[str, str] = {}
+        seen = set()
+
+        with self._lock:
+            for text in texts:
+                if text in seen:
+                    continue
+                seen.add(text)
+                key = content_key(model, text)
+                vector = self._lru.get(key)
+                if vector is not None:
+                    self._lru.move_to_end(key)
+                    found[text] = vector
+                    self.hits += 1
+                else:
+                    disk_lookup[key] = text
+
+            loaded = self._load(list(disk_lookup))
+            for key, vector in loaded:
+                self._remember(key, vector)
+                found[disk_lookup[key]] = vector
+
+            self.disk_hits += len(loaded)
+            self.misses += len(disk_lookup) - len(loaded)
+        return found
+
+    def _load(self, keys: List[str]) -> List[Tuple[str, Vector]]:
+        if self._conn is None or not keys:
+            return []
+        rows = []
+        try:
+            # Stay under SQLite's bound-parameter limit
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                rows.extend(self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN "
+                    f"({', '.join('?' * len(chunk))})", chunk
+                ).fetchall())
+        except sqlite3.Error as e:
+            print(f"Embedding cache read failed (non-critical): {e}")
+            return []
+        return [(key, from_bytes(blob)) for key, blob in rows]
+
+    # ---- writes ---------------------------------------------------------
+
+    def put(self, model: str, text: str, vector: VectorLike) -> Vector:
+        """Cache one vector; returns it packed."""
+        return self.put_many(model, [(text, vector)])[0]
+
+    def put_many(self, model: str,
+                 pairs: Iterable[Tuple[str, VectorLike]]) -> List[Vector]:
+        """Cache many (text, vector) pairs in both tiers.
+
+        Returns:
+            Packed vectors, in input order
+        """
+        packed = []
+        rows = []
+        now = time.time()
+        with self._lock:
+            for text, vector in pairs:
+                vector = to_vector(vector)
+                key = content_key(model, text)
+                self._remember(key, vector)
+                packed.append(vector)
+                rows.append((key, model, len(vector), vector.tobytes(), now))
+
+            if self._conn is not None and rows:
+                try:
+                    self._conn.execute("BEGIN")
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO embeddings "
+                        "(key, model, dim, vector, created_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        rows
+                    )
+                    self._conn.execute("COMMIT")
+                except sqlite3.Error as e:
+                    if self._conn.in_transaction:
+                        self._conn.execute("ROLLBACK")
+                    print(f"Embedding cache write failed (non-critical): {e}")
+        return packed
+
+    # ---- housekeeping ---------------------------------------------------
+
+    def stats(self) -> dict:
+        """Hit/miss/eviction counters and memory usage."""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "memory_entries": len(self._lru),
+                "memory_bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(
+                    (self.hits + self.disk_hits) / max(lookups, 1), 4
+                )
+            }
+
+    def clear(self, model: Optional[str] = None) -> None:
+        """Drop cached vectors (all, or for one model) from both tiers."""
+        with self._lock:
+            self._lru.clear()
+            self._bytes = 0
+            if self._conn is not None:
+                if model is None:
+                    self._conn.execute("DELETE FROM embeddings")
+                else:
+                    self._conn.execute(
+                        "DELETE FROM embeddings WHERE model = ?", (model,)
+                    )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -1,46 +1,291 @@
 """Embedding utilities
 
 Generate embeddings using local Ollama (no external API calls).
+
+All calls go through one pooled EmbeddingClient, so bulk ingestion reuses
+keep-alive connections instead of opening a TCP connection per text.
+Vectors are cached in memory and on disk (see embedding_cache.py) and
+returned as packed float32 arrays (see vectors.py).
+
+AsyncEmbeddingClient / aget_embeddings() are the asyncio equivalents
+(httpx), sharing the same cache.
 """
 
+import asyncio
 import hashlib
+import threading
+import weakref
 from typing import List, Optional
 
+from .embedding_cache import EmbeddingCache
+from .vectors import Vector, zero_vector
+
+DEFAULT_MODEL = "nomic-embed-text"
+
+# Dimension of the zero vector returned when Ollama is unreachable
+# (matches nomic-embed-text and VectorStore.VECTOR_SIZE)
+FALLBACK_DIM = 768
+
 # Cache for embeddings to avoid recomputation
-_embedding_cache: dict = {}
+_embedding_cache: Optional[EmbeddingCache] = None
 
-def get_embedding(text: str, model: str = "nomic-embed-text") -> List[float]:
-    """Generate embedding using Ollama.
+
+def get_cache() -> EmbeddingCache:
+    """Get or create the global embedding cache."""
+    global _embedding_cache
+    if _embedding_cache is None:
+        from shared.config import get_config
+        cfg = get_config()
+        _embedding_cache = EmbeddingCache(
+            path=cfg.EMBEDDING_CACHE_PATH or None,
+            max_bytes=int(cfg.EMBEDDING_CACHE_MAX_MB * 1024 * 1024)
+        )
+    return _embedding_cache
+
+
+class EmbeddingClient:
+    """Pooled HTTP client for Ollama embeddings.
+
+    Args:
+        host: Ollama base URL
+        pool_size: Max keep-alive connections kept open
+        connect_timeout: Seconds to wait for a connection
+        read_timeout: Seconds to wait for a response
+        batch_size: Max texts per /api/embed request
+    """
+
+    def __init__(self, host: str = "http://localhost:11434",
+                 pool_size: int = 10, connect_timeout: float = 3.0,
+                 read_timeout: float = 60.0, batch_size: int = 256):
+        self.host = host.rstrip("/")
+        self.pool_size = pool_size
+        self.timeout = (connect_timeout, read_timeout)
+        self.batch_size = batch_size
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        """Shared requests.Session, created on first use."""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=1,
+                        pool_maxsize=self.pool_size
+                    )
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._session = session
+        return self._session
+
+    def embed(self, text: str, model: str = DEFAULT_MODEL) -> Vector:
+        """Embed a single text."""
+        return self.embed_batch([text], model)[0]
+
+    def embed_batch(self, texts: List[str],
+                    model: str = DEFAULT_MODEL) -> List[Vector]:
+        """Embed many texts with Ollama's batch /api/embed endpoint.
+
+        Identical texts are sent once; cached texts are not sent at all.
+
+        Args:
+            texts: Texts to embed
+            model: Ollama embedding model
+
+        Returns:
+            Embedding vectors, in the same order as texts
+
+        Raises:
+            requests.RequestException: If Ollama is unreachable or errors
+        """
+        cache = get_cache()
+        vectors = cache.get_many(model, texts)
+
+        # Unique uncached texts, in first-seen order
+        unique = list(dict.fromkeys(t for t in texts if t not in vectors))
+        for start in range(0, len(unique), self.batch_size):
+            chunk = unique[start:start + self.batch_size]
+            response = self.session.post(
+                f"{self.host}/api/embed",
+                json={"model": model, "input": chunk},
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+
+            packed = cache.put_many(model, zip(chunk, response.json()["embeddings"]))
+            vectors.update(zip(chunk, packed))
+
+        return [vectors[text] for text in texts]
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+
+class AsyncEmbeddingClient:
+    """asyncio Ollama embedding client (httpx connection pool).
     
+    Same arguments and cache as EmbeddingClient. An httpx.AsyncClient is
+    bound to the event loop it was first used on, so create one per loop
+    (get_async_client() does this).
+    """
+
+    def __init__(self, host: str = "http://localhost:11434",
+                 pool_size: int = 10, connect_timeout: float = 3.0,
+                 read_timeout: float = 60.0, batch_size: int = 256):
+        import httpx
+        
+        self.host = host.rstrip("/")
+        self.batch_size = batch_size
+        self._http = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size
+            ),
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout)
+        )
+
+    async def embed(self, text: str, model: str = DEFAULT_MODEL) -> Vector:
+        """Embed a single text."""
+        return (await self.embed_batch([text], model))[0]
+
+    async def embed_batch(self, texts: List[str],
+                          model: str = DEFAULT_MODEL) -> List[Vector]:
+        """Embed many texts - see EmbeddingClient.embed_batch.
+        
+        Raises:
+            httpx.HTTPError: If Ollama is unreachable or errors
+        """
+        cache = get_cache()
+        vectors = cache.get_many(model, texts)
+        
+        unique = list(dict.fromkeys(t for t in texts if t not in vectors))
+        chunks = [
+            unique[start:start + self.batch_size]
+            for start in range(0, len(unique), self.batch_size)
+        ]
+        
+        async def send(chunk):
+            response = await self._http.post(
+                f"{self.host}/api/embed",
+                json={"model": model, "input": chunk}
+            )
+            response.raise_for_status()
+            return response.json()["embeddings"]
+        
+        # Chunks go out concurrently; the pool limit bounds the fan-out
+        results = await asyncio.gather(*(send(chunk) for chunk in chunks))
+        for chunk, embeddings in zip(chunks, results):
+            packed = cache.put_many(model, zip(chunk, embeddings))
+            vectors.update(zip(chunk, packed))
+        
+        return [vectors[text] for text in texts]
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        await self._http.aclose()
+
+
+# Global instance
+_client: Optional[EmbeddingClient] = None
+# One async client per event loop (dropped with the loop)
+_async_clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def get_client() -> EmbeddingClient:
+    """Get or create the global embedding client."""
+    global _client
+    if _client is None:
+        from shared.config import get_config
+        cfg = get_config()
+        _client = EmbeddingClient(
+            host=cfg.OLLAMA_HOST,
+            pool_size=cfg.EMBEDDING_POOL_SIZE,
+            connect_timeout=cfg.EMBEDDING_CONNECT_TIMEOUT,
+            read_timeout=cfg.EMBEDDING_READ_TIMEOUT,
+            batch_size=cfg.EMBEDDING_BATCH_SIZE
+        )
+    return _client
+
+
+def get_async_client() -> AsyncEmbeddingClient:
+    """Get or create the embedding client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        from shared.config import get_config
+        cfg = get_config()
+        client = AsyncEmbeddingClient(
+            host=cfg.OLLAMA_HOST,
+            pool_size=cfg.EMBEDDING_POOL_SIZE,
+            connect_timeout=cfg.EMBEDDING_CONNECT_TIMEOUT,
+            read_timeout=cfg.EMBEDDING_READ_TIMEOUT,
+            batch_size=cfg.EMBEDDING_BATCH_SIZE
+        )
+        _async_clients[loop] = client
+    return client
+
+
+def get_embedding(text: str, model: str = DEFAULT_MODEL) -> Vector:
+    """Generate embedding using Ollama.
+
     Args:
         text: Text to embed
         model: Ollama embedding model
-    
+
     Returns:
-        Embedding vector
+        Embedding vector (packed float32)
+    """
+    return get_embeddings([text], model)[0]
+
+
+def get_embeddings(texts: List[str],
+                   model: str = DEFAULT_MODEL) -> List[Vector]:
+    """Generate embeddings for many texts in batched Ollama calls.
+
+    Args:
+        texts: Texts to embed
+        model: Ollama embedding model
+
+    Returns:
+        Embedding vectors (packed float32), in the same order as texts
     """
-    import requests
-    
-    # Check cache
-    cache_key = hashlib.md5(f"{model}:{text}".encode()).hexdigest()
-    if cache_key in _embedding_cache:
-        return _embedding_cache[cache_key]
-    
     try:
-        response = requests.post(
-            "http://localhost:11434/api/embeddings",
-            json={"model": model, "prompt": text}
-        )
-        response.raise_for_status()
-        embedding = response.json()["embedding"]
-        
-        # Cache result
-        _embedding_cache[cache_key] = embedding
-        return embedding
+        return get_client().embed_batch(texts, model)
+    except Exception as e:
+        print(f"Embedding generation failed: {e}")
+        # Return zero vectors as fallback (cached hits still returned)
+        cached = get_cache().get_many(model, texts)
+        return [
+            cached[text] if text in cached else zero_vector(FALLBACK_DIM)
+            for text in texts
+        ]
+
+
+async def aget_embedding(text: str, model: str = DEFAULT_MODEL) -> Vector:
+    """Async get_embedding()."""
+    return (await aget_embeddings([text], model))[0]
+
+
+async def aget_embeddings(texts: List[str],
+                          model: str = DEFAULT_MODEL) -> List[Vector]:
+    """Async get_embeddings(): same batching, cache and zero-vector fallback."""
+    try:
+        return await get_async_client().embed_batch(texts, model)
     except Exception as e:
         print(f"Embedding generation failed: {e}")
-        # Return zero vector as fallback
-        return [0.0] * 384
+        cached = get_cache().get_many(model, texts)
+        return [
+            cached[text] if text in cached else zero_vector(FALLBACK_DIM)
+            for text in texts
+        ]
 
 
 def hash_text(text: str) -> str:
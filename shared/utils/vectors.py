@@ -0,0 +1,71 @@
+"""Vector utilities
+
+Compact embedding vectors. Embeddings are passed around as packed float32
+``array('f')`` rather than ``List[float]``: a 768-dim nomic vector is ~3 KB
+instead of ~25 KB of boxed Python floats, and it can be viewed as a
+``memoryview`` or NumPy array without copying.
+
+Conversion to plain lists happens only at boundaries that require it
+(e.g. the Qdrant client's point models).
+"""
+
+from array import array
+from typing import List, Sequence, Union
+
+# Packed float32 vector
+Vector = array
+
+# Anything we accept as a vector on the way in
+VectorLike = Union[array, Sequence[float], memoryview]
+
+
+def to_vector(values: VectorLike) -> Vector:
+    """Convert to packed float32 (no copy if already packed)."""
+    if isinstance(values, array) and values.typecode == "f":
+        return values
+    if isinstance(values, memoryview) and values.format == "f":
+        return array("f", values.tobytes())
+    if hasattr(values, "dtype"):
+        # NumPy array - go through its buffer in float32
+        return array("f", values.astype("float32", copy=False).tobytes())
+    return array("f", values)
+
+
+def zero_vector(dim: int) -> Vector:
+    """All-zero vector of the given dimension."""
+    return array("f", bytes(4 * dim))
+
+
+def from_bytes(blob: bytes) -> Vector:
+    """Rebuild a vector from packed float32 bytes."""
+    vector = array("f")
+    vector.frombytes(blob)
+    return vector
+
+
+def to_list(vector: VectorLike) -> List[float]:
+    """Plain float list for APIs that need one (e.g. Qdrant PointStruct).
+
+    Goes through a zero-copy memoryview, so the only allocation is the
+    list itself.
+    """
+    if isinstance(vector, list):
+        return vector
+    if isinstance(vector, (array, memoryview)):
+        return memoryview(vector).tolist()
+    if hasattr(vector, "tolist"):
+        return vector.tolist()
+    return list(vector)
+
+
+def as_numpy(vector: VectorLike):
+    """Zero-copy float32 NumPy view of a packed vector."""
+    import numpy as np
+    if isinstance(vector, (array, memoryview)):
+        return np.frombuffer(vector, dtype=np.float32)
+    return np.asarray(vector, dtype=np.float32)
+
+
+def nbytes(vector: Vector) -> int:
+    """Bytes held by a packed vector's elements."""
+    return vector.itemsize * len(vector)